@@ -0,0 +1,18 @@
+#
+# Copyright (c), 2016-2024, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+Benchmarks of xmlschema on deterministic synthetic XML data. Run from the
+repository directory with `python -m tests.benchmarks --help` for options.
+"""
+from .generators import BenchmarkSample, SAMPLE_GENERATORS, get_samples
+from .runner import OPERATIONS, run_benchmarks, compare_results, main
+
+__all__ = ['BenchmarkSample', 'SAMPLE_GENERATORS', 'get_samples', 'OPERATIONS',
+           'run_benchmarks', 'compare_results', 'main']
@@ -0,0 +1,13 @@
+#
+# Copyright (c), 2016-2024, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+import sys
+from .runner import main
+
+sys.exit(main())
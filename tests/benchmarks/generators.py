@@ -0,0 +1,247 @@
+#
+# Copyright (c), 2016-2024, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+Deterministic generators of synthetic XSD schemas and XML documents for benchmarks.
+Each generator returns the same sample for the same size, so the results of runs
+made with different releases of the package can be compared.
+"""
+from typing import Callable, Dict, List, NamedTuple
+
+XSD_NAMESPACE = 'http://www.w3.org/2001/XMLSchema'
+BENCHMARKS_NAMESPACE = 'http://xmlschema.test/benchmarks'
+
+DEEP_CHAIN_LENGTH = 64
+"""The depth of the nested chains of the elements of the deep sample."""
+
+NAMESPACES_NUMBER = 16
+"""The number of imported namespaces of the many-namespace sample."""
+
+
+class BenchmarkSample(NamedTuple):
+    """
+    A synthetic benchmark sample. The *schemas* mapping contains the
+    schema documents keyed by file name, starting with the main schema.
+    """
+    name: str
+    schemas: Dict[str, str]
+    xml_data: str
+
+
+def _schema(body: str, target_namespace: str = BENCHMARKS_NAMESPACE,
+            imports: str = '') -> str:
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<xs:schema xmlns:xs="{XSD_NAMESPACE}" xmlns:tns="{target_namespace}"\n'
+            f'    targetNamespace="{target_namespace}" elementFormDefault="qualified">\n'
+            f'{imports}{body}</xs:schema>\n')
+
+
+def wide_sample(size: int) -> BenchmarkSample:
+    """A flat document with *size* records of simple typed fields."""
+    body = """
+  <xs:element name="records">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="record" type="tns:recordType" maxOccurs="unbounded"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+  <xs:complexType name="recordType">
+    <xs:sequence>
+      <xs:element name="name" type="xs:string"/>
+      <xs:element name="count" type="xs:int"/>
+      <xs:element name="price" type="xs:decimal"/>
+      <xs:element name="date" type="xs:date"/>
+      <xs:element name="code" type="tns:codeType"/>
+      <xs:element name="status" type="tns:statusType"/>
+      <xs:element name="flag" type="xs:boolean" minOccurs="0"/>
+    </xs:sequence>
+    <xs:attribute name="n" type="xs:nonNegativeInteger" use="required"/>
+  </xs:complexType>
+  <xs:simpleType name="codeType">
+    <xs:restriction base="xs:string">
+      <xs:pattern value="[A-Z]{3}-[0-9]{4}"/>
+    </xs:restriction>
+  </xs:simpleType>
+  <xs:simpleType name="statusType">
+    <xs:restriction base="xs:token">
+      <xs:enumeration value="new"/>
+      <xs:enumeration value="open"/>
+      <xs:enumeration value="closed"/>
+    </xs:restriction>
+  </xs:simpleType>
+"""
+    statuses = ('new', 'open', 'closed')
+    records = []
+    for k in range(size):
+        flag = '<flag>true</flag>' if k % 3 else ''
+        records.append(
+            f'<record n="{k}"><name>item {k}</name><count>{k % 1000}</count>'
+            f'<price>{k % 997}.{k % 100:02}</price>'
+            f'<date>20{k % 100:02}-{k % 12 + 1:02}-{k % 28 + 1:02}</date>'
+            f'<code>{chr(65 + k % 26) * 3}-{k % 10000:04}</code>'
+            f'<status>{statuses[k % 3]}</status>{flag}</record>'
+        )
+
+    xml_data = '<records xmlns="{}">{}</records>\n'.format(
+        BENCHMARKS_NAMESPACE, '\n'.join(records)
+    )
+    return BenchmarkSample('wide', {'wide.xsd': _schema(body)}, xml_data)
+
+
+def deep_sample(size: int) -> BenchmarkSample:
+    """
+    A document with nested chains of recursive elements, each chain is
+    `DEEP_CHAIN_LENGTH` levels deep and has a leaf with a value.
+    """
+    body = """
+  <xs:element name="tree">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element ref="tns:node" maxOccurs="unbounded"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+  <xs:element name="node">
+    <xs:complexType>
+      <xs:choice>
+        <xs:element ref="tns:node" maxOccurs="2"/>
+        <xs:element name="leaf" type="xs:double"/>
+      </xs:choice>
+      <xs:attribute name="level" type="xs:int"/>
+    </xs:complexType>
+  </xs:element>
+"""
+    chains = []
+    for k in range(max(1, size // DEEP_CHAIN_LENGTH)):
+        start_tags = ''.join(f'<node level="{j}">' for j in range(DEEP_CHAIN_LENGTH))
+        chains.append(f'{start_tags}<leaf>{k}.5</leaf>{"</node>" * DEEP_CHAIN_LENGTH}')
+
+    xml_data = '<tree xmlns="{}">{}</tree>\n'.format(
+        BENCHMARKS_NAMESPACE, '\n'.join(chains)
+    )
+    return BenchmarkSample('deep', {'deep.xsd': _schema(body)}, xml_data)
+
+
+def namespaces_sample(size: int) -> BenchmarkSample:
+    """
+    A document whose content elements belong to `NAMESPACES_NUMBER` namespaces,
+    each one defined by a schema imported by the main schema.
+    """
+    schemas = {'namespaces.xsd': ''}
+    imports = []
+    particles = []
+    for k in range(NAMESPACES_NUMBER):
+        namespace = f'{BENCHMARKS_NAMESPACE}/ns{k}'
+        imports.append(f'  <xs:import namespace="{namespace}" schemaLocation="ns{k}.xsd"/>\n')
+        particles.append(f'<xs:element ref="ns{k}:item" minOccurs="0"/>')
+        schemas[f'ns{k}.xsd'] = _schema("""
+  <xs:element name="item">
+    <xs:complexType>
+      <xs:simpleContent>
+        <xs:extension base="xs:string">
+          <xs:attribute name="value" type="xs:int"/>
+        </xs:extension>
+      </xs:simpleContent>
+    </xs:complexType>
+  </xs:element>
+""", namespace)
+
+    xmlns = ' '.join(f'xmlns:ns{k}="{BENCHMARKS_NAMESPACE}/ns{k}"'
+                     for k in range(NAMESPACES_NUMBER))
+    body = """
+  <xs:element name="entries">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="entry" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:sequence>
+              {}
+            </xs:sequence>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+""".format('\n              '.join(particles))
+    schemas['namespaces.xsd'] = _schema(body, imports=''.join(imports)).replace(
+        'xmlns:tns=', f'{xmlns} xmlns:tns=', 1
+    )
+
+    entries = []
+    for k in range(max(1, size // 4)):
+        items = ''.join(f'<ns{j}:item value="{k}">text {k}</ns{j}:item>'
+                        for j in range(NAMESPACES_NUMBER) if (k + j) % 4 == 0)
+        entries.append(f'<entry>{items}</entry>')
+
+    xml_data = '<entries xmlns="{}" {}>{}</entries>\n'.format(
+        BENCHMARKS_NAMESPACE, xmlns, '\n'.join(entries)
+    )
+    return BenchmarkSample('namespaces', schemas, xml_data)
+
+
+def identities_sample(size: int) -> BenchmarkSample:
+    """
+    A document with *size* products identified by keys and by IDs, and
+    with orders that refer to the products with keyrefs and IDREFs.
+    """
+    body = """
+  <xs:element name="catalog">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="product" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:attribute name="id" type="xs:ID" use="required"/>
+            <xs:attribute name="sku" type="xs:string" use="required"/>
+          </xs:complexType>
+        </xs:element>
+        <xs:element name="order" minOccurs="0" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:attribute name="product" type="xs:IDREF" use="required"/>
+            <xs:attribute name="sku" type="xs:string" use="required"/>
+            <xs:attribute name="number" type="xs:int" use="required"/>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+    </xs:complexType>
+    <xs:key name="productKey">
+      <xs:selector xpath="tns:product"/>
+      <xs:field xpath="@sku"/>
+    </xs:key>
+    <xs:keyref name="orderRef" refer="tns:productKey">
+      <xs:selector xpath="tns:order"/>
+      <xs:field xpath="@sku"/>
+    </xs:keyref>
+    <xs:unique name="orderNumber">
+      <xs:selector xpath="tns:order"/>
+      <xs:field xpath="@number"/>
+    </xs:unique>
+  </xs:element>
+"""
+    products = [f'<product id="p{k}" sku="SKU{k:08}"/>' for k in range(size)]
+    orders = [f'<order product="p{k * 7 % size}" sku="SKU{k * 7 % size:08}" number="{k}"/>'
+              for k in range(max(1, size // 2))]
+
+    xml_data = '<catalog xmlns="{}">{}</catalog>\n'.format(
+        BENCHMARKS_NAMESPACE, '\n'.join(products + orders)
+    )
+    return BenchmarkSample('identities', {'identities.xsd': _schema(body)}, xml_data)
+
+
+SAMPLE_GENERATORS: Dict[str, Callable[[int], BenchmarkSample]] = {
+    'wide': wide_sample,
+    'deep': deep_sample,
+    'namespaces': namespaces_sample,
+    'identities': identities_sample,
+}
+
+
+def get_samples(names: List[str], size: int) -> List[BenchmarkSample]:
+    """Returns the samples for a list of generator names."""
+    return [SAMPLE_GENERATORS[name](size) for name in names]
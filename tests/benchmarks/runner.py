@@ -0,0 +1,220 @@
+#
+# Copyright (c), 2016-2024, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+Runner of the benchmarks on synthetic samples, with results in JSON format.
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import elementpath
+import xmlschema
+
+from .generators import SAMPLE_GENERATORS, BenchmarkSample, get_samples
+
+RESULTS_FORMAT_VERSION = 1
+
+OPERATIONS = ('build', 'validate', 'validate_lazy', 'decode', 'encode', 'to_json',
+              'iter_full', 'iter_lazy')
+
+
+class _SampleContext:
+    """Files and objects of a sample that are shared between benchmark operations."""
+
+    def __init__(self, sample: BenchmarkSample, dirname: str) -> None:
+        self.sample = sample
+        for filename, text in sample.schemas.items():
+            with open(os.path.join(dirname, filename), 'w', encoding='utf-8') as fp:
+                fp.write(text)
+
+        self.schema_file = os.path.join(dirname, next(iter(sample.schemas)))
+        self.xml_file = os.path.join(dirname, f'{sample.name}.xml')
+        with open(self.xml_file, 'w', encoding='utf-8') as fp:
+            fp.write(sample.xml_data)
+
+        self.schema = xmlschema.XMLSchema(self.schema_file)
+        self._data: Any = None
+
+    @property
+    def data(self) -> Any:
+        if self._data is None:
+            self._data = self.schema.decode(self.xml_file)
+        return self._data
+
+    def get_operation(self, name: str) -> Callable[[], Any]:
+        if name == 'build':
+            return lambda: xmlschema.XMLSchema(self.schema_file)
+        elif name == 'validate':
+            return lambda: self.schema.validate(self.xml_file)
+        elif name == 'validate_lazy':
+            return lambda: self.schema.validate(
+                xmlschema.XMLResource(self.xml_file, lazy=True)
+            )
+        elif name == 'decode':
+            return lambda: self.schema.decode(self.xml_file)
+        elif name == 'encode':
+            data = self.data
+            return lambda: self.schema.encode(data)
+        elif name == 'to_json':
+            return lambda: xmlschema.to_json(self.xml_file, schema=self.schema)
+        elif name == 'iter_full':
+            return lambda: sum(1 for _ in xmlschema.XMLResource(self.xml_file).iter())
+        elif name == 'iter_lazy':
+            return lambda: sum(
+                1 for _ in xmlschema.XMLResource(self.xml_file, lazy=True).iter()
+            )
+        raise ValueError(f"unknown benchmark operation {name!r}")
+
+
+def time_operation(func: Callable[[], Any], repeat: int = 3) -> List[float]:
+    """Returns the elapsed times of *repeat* calls of a function, in seconds."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def get_environment() -> Dict[str, Any]:
+    """Returns the information about the environment of a benchmark run."""
+    try:
+        import lxml.etree
+    except ImportError:
+        lxml_version = None
+    else:
+        lxml_version = lxml.etree.__version__
+
+    return {
+        'xmlschema': xmlschema.__version__,
+        'elementpath': elementpath.__version__,
+        'lxml': lxml_version,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run_benchmarks(samples: Iterable[BenchmarkSample],
+                   operations: Iterable[str] = OPERATIONS,
+                   repeat: int = 3) -> Dict[str, Any]:
+    """
+    Runs the benchmark operations on a sequence of samples.
+
+    :param samples: the benchmark samples.
+    :param operations: the names of the operations to time.
+    :param repeat: the number of timed runs of each operation.
+    :return: a JSON serializable dictionary with the environment \
+    information and with a list of results.
+    """
+    results: List[Dict[str, Any]] = []
+    operations = list(operations)
+
+    with tempfile.TemporaryDirectory() as dirname:
+        for sample in samples:
+            sample_dir = os.path.join(dirname, sample.name)
+            os.mkdir(sample_dir)
+            context = _SampleContext(sample, sample_dir)
+
+            for name in operations:
+                result: Dict[str, Any] = {
+                    'sample': sample.name,
+                    'operation': name,
+                    'xml_size': len(sample.xml_data),
+                }
+                try:
+                    times = time_operation(context.get_operation(name), repeat)
+                except Exception as err:
+                    result['error'] = repr(err)
+                else:
+                    result['times'] = times
+                    result['min'] = min(times)
+                    result['mean'] = statistics.mean(times)
+                results.append(result)
+
+    return {
+        'format': RESULTS_FORMAT_VERSION,
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'environment': get_environment(),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare_results(baseline: Dict[str, Any], results: Dict[str, Any]) \
+        -> List[Dict[str, Any]]:
+    """
+    Compares the minimum times of two benchmark runs. Returns a list with
+    the operations measured by both runs and the ratio between their times.
+    """
+    baseline_times = {(r['sample'], r['operation']): r['min']
+                      for r in baseline['results'] if 'min' in r}
+
+    comparison = []
+    for r in results['results']:
+        key = r['sample'], r['operation']
+        if 'min' in r and baseline_times.get(key):
+            comparison.append({
+                'sample': r['sample'],
+                'operation': r['operation'],
+                'baseline': baseline_times[key],
+                'current': r['min'],
+                'ratio': r['min'] / baseline_times[key],
+            })
+    return comparison
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m tests.benchmarks',
+        description="Run xmlschema benchmarks on synthetic XML data."
+    )
+    parser.add_argument('--samples', nargs='+', choices=list(SAMPLE_GENERATORS),
+                        default=list(SAMPLE_GENERATORS), help="the samples to generate.")
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS,
+                        default=list(OPERATIONS), help="the operations to time.")
+    parser.add_argument('--size', type=int, default=2000,
+                        help="the size of the samples, in elements (default 2000).")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="the number of runs of each operation (default 3).")
+    parser.add_argument('--output', help="the JSON output file, for default stdout.")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="a JSON file of a previous run to compare with.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(get_samples(args.samples, args.size),
+                             args.operations, args.repeat)
+    results['size'] = args.size
+
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as fp:
+            json.dump(results, fp, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+
+        for item in compare_results(baseline, results):
+            print("{sample:>12} {operation:<14} {baseline:10.4f}s {current:10.4f}s "
+                  "{ratio:6.2f}x".format(**item), file=sys.stderr)
+    return 0
@@ -37,6 +37,7 @@ if __name__ == '__main__':
         tests.addTests(loader.discover(start_dir=tests_dir, pattern="test_codegen.py"))
         tests.addTests(loader.discover(start_dir=tests_dir, pattern="test_translations.py"))
         tests.addTests(loader.discover(start_dir=tests_dir, pattern="test_wsdl.py"))
+        tests.addTests(loader.discover(start_dir=tests_dir, pattern="test_benchmarks.py"))
 
         validation_dir = os.path.join(os.path.dirname(__file__), 'validation')
         tests.addTests(loader.discover(start_dir=validation_dir, pattern='test_*.py'))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+#
+# Copyright (c), 2016-2024, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+import unittest
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+import xmlschema
+from tests.benchmarks import SAMPLE_GENERATORS, OPERATIONS, get_samples, \
+    run_benchmarks, compare_results, main
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_samples(self):
+        for name, generator in SAMPLE_GENERATORS.items():
+            sample = generator(200)
+            self.assertEqual(sample.name, name)
+            self.assertEqual(sample, generator(200))  # deterministic
+            self.assertNotEqual(sample.xml_data, generator(400).xml_data)
+
+            with tempfile.TemporaryDirectory() as dirname:
+                for filename, text in sample.schemas.items():
+                    with open(os.path.join(dirname, filename), 'w') as fp:
+                        fp.write(text)
+
+                schema_file = os.path.join(dirname, next(iter(sample.schemas)))
+                schema = xmlschema.XMLSchema(schema_file)
+                schema.validate(sample.xml_data)
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks(get_samples(['wide', 'identities'], 20), repeat=2)
+        self.assertEqual(results['repeat'], 2)
+        self.assertEqual(results['environment']['xmlschema'], xmlschema.__version__)
+        self.assertEqual(len(results['results']), len(OPERATIONS) * 2)
+
+        for result in results['results']:
+            self.assertNotIn('error', result)
+            self.assertEqual(len(result['times']), 2)
+            self.assertEqual(result['min'], min(result['times']))
+
+        comparison = compare_results(results, results)
+        self.assertEqual(len(comparison), len(OPERATIONS) * 2)
+        self.assertTrue(all(item['ratio'] == 1.0 for item in comparison))
+
+        results = run_benchmarks(get_samples(['deep'], 20), operations=['unknown'])
+        self.assertIn('error', results['results'][0])
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            output = os.path.join(dirname, 'results.json')
+            args = ['--samples', 'deep', '--operations', 'validate', 'decode',
+                    '--size', '64', '--repeat', '1']
+            self.assertEqual(main(args + ['--output', output]), 0)
+
+            with open(output) as fp:
+                results = json.load(fp)
+            self.assertEqual(results['size'], 64)
+            self.assertListEqual([r['operation'] for r in results['results']],
+                                 ['validate', 'decode'])
+
+            stdout, stderr = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                main(args + ['--compare', output])
+            self.assertEqual(len(json.loads(stdout.getvalue())['results']), 2)
+            self.assertEqual(len(stderr.getvalue().splitlines()), 2)
+
+
+if __name__ == '__main__':
+    from xmlschema.testing import run_xmlschema_tests
+    run_xmlschema_tests('benchmarks')
@@ -123,6 +123,29 @@ class TestConsoleScripts(unittest.TestCase):
         self.assertEqual("vehicles.xml is valid\n", mock_out.getvalue())
         self.assertEqual('0', str(self.ctx.exception))
 
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_validate_command_09(self, mock_out, mock_err):
+        self.run_validate('--workers=2', 'vehicles.xml', 'vehicles-2_errors.xml',
+                          'unknown.xml', 'vehicles2.xml')
+        self.assertEqual("vehicles.xml is valid\nvehicles2.xml is valid\n",
+                         mock_out.getvalue())
+        self.assertIn("vehicles-2_errors.xml is not valid\n", mock_err.getvalue())
+        self.assertIn("unknown.xml", mock_err.getvalue())
+        self.assertEqual('3', str(self.ctx.exception))
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_validate_command_10(self, mock_out, mock_err):
+        self.run_validate('--workers=0', 'vehicles.xml')
+        self.assertEqual(mock_out.getvalue(), '')
+        self.assertIn("'0' is not a valid number of workers", mock_err.getvalue())
+        self.assertEqual('2', str(self.ctx.exception))
+
+        self.run_validate('--schema=unknown.xsd', '--workers=1', 'vehicles.xml')
+        self.assertEqual(mock_out.getvalue(), '')
+        self.assertEqual('1', str(self.ctx.exception))
+
     @patch('sys.stderr', new_callable=io.StringIO)
     @patch('sys.stdout', new_callable=io.StringIO)
     def test_xml2json_command_01(self, mock_out, mock_err):
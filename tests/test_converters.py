@@ -9,7 +9,9 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 import unittest
+from decimal import Decimal
 from pathlib import Path
+from textwrap import dedent
 from typing import cast, MutableMapping, Optional, Type
 from xml.etree.ElementTree import Element, parse as etree_parse
 
@@ -18,15 +20,21 @@ try:
 except ImportError:
     lxml_etree = None
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from elementpath.etree import etree_tostring
 
 from xmlschema import XMLSchema, XMLSchemaValidationError, fetch_namespaces
 from xmlschema.dataobjects import DataElement
+from xmlschema.names import XSD_INT, XSD_BOOLEAN, XSD_STRING, XSD_DOUBLE
 from xmlschema.testing import etree_elements_assert_equal
 
 from xmlschema.converters import XMLSchemaConverter, UnorderedConverter, \
     ParkerConverter, BadgerFishConverter, AbderaConverter, JsonMLConverter, \
-    ColumnarConverter, GDataConverter
+    ColumnarConverter, GDataConverter, ColumnBuffer, ColumnBufferConverter
 from xmlschema.dataobjects import DataElementConverter
 
 
@@ -198,6 +206,83 @@ class TestConverters(unittest.TestCase):
         elem = converter.etree_element('A', attrib={})
         self.assertIsNone(etree_elements_assert_equal(elem, Element('A')))
 
+    def test_element_decode_result_dict(self):
+        schema = XMLSchema(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+                xmlns:tns="http://xmlschema.test/ns"
+                targetNamespace="http://xmlschema.test/ns"
+                elementFormDefault="qualified">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="a" type="xs:string" minOccurs="0"/>
+                    <xs:element name="b" minOccurs="0">
+                      <xs:complexType>
+                        <xs:simpleContent>
+                          <xs:extension base="xs:int">
+                            <xs:attribute name="c" type="xs:string"/>
+                          </xs:extension>
+                        </xs:simpleContent>
+                      </xs:complexType>
+                    </xs:element>
+                    <xs:element name="q" type="xs:QName" minOccurs="0" maxOccurs="2"/>
+                    <xs:element name="e" minOccurs="0">
+                      <xs:complexType>
+                        <xs:attribute name="c" type="xs:string"/>
+                      </xs:complexType>
+                    </xs:element>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+              <xs:element name="simple" type="xs:int"/>
+            </xs:schema>"""))
+
+        xmlns = {'@xmlns:tns': 'http://xmlschema.test/ns'}
+        root_template = '<tns:root xmlns:tns="http://xmlschema.test/ns">{}</tns:root>'
+
+        # Simple content, with and without attributes
+        xml_data = root_template.format('<tns:a>foo</tns:a><tns:b>1</tns:b>')
+        self.assertEqual(schema.decode(xml_data), {**xmlns, 'tns:a': 'foo', 'tns:b': 1})
+        self.assertEqual(schema.decode(xml_data, converter=XMLSchemaConverter(force_dict=True)),
+                         {**xmlns, 'tns:a': 'foo', 'tns:b': {'$': 1}})
+
+        xml_data = root_template.format('<tns:b c="x">1</tns:b>')
+        self.assertEqual(schema.decode(xml_data), {**xmlns, 'tns:b': {'@c': 'x', '$': 1}})
+
+        # Empty content, with and without attributes
+        xml_data = root_template.format('<tns:e c="x"/>')
+        self.assertEqual(schema.decode(xml_data), {**xmlns, 'tns:e': {'@c': 'x'}})
+        xml_data = root_template.format('<tns:e/>')
+        self.assertEqual(schema.decode(xml_data), {**xmlns, 'tns:e': None})
+        self.assertEqual(schema.decode(xml_data, converter=XMLSchemaConverter(force_dict=True)),
+                         {**xmlns, 'tns:e': None})
+
+        # Local namespace declarations for the tag or for the prefix of a QName value
+        xml_data = root_template.format(
+            '<a xmlns="http://xmlschema.test/ns">foo</a>'
+            '<tns:q xmlns:x="http://xmlschema.test/other">x:a</tns:q><tns:q>tns:a</tns:q>'
+        )
+        self.assertEqual(schema.decode(xml_data), {
+            **xmlns,
+            'a': {'@xmlns': 'http://xmlschema.test/ns', '$': 'foo'},
+            'tns:q': [{'@xmlns:x': 'http://xmlschema.test/other', '$': 'x:a'}, 'tns:a']
+        })
+        self.assertEqual(schema.decode(xml_data, strip_namespaces=True),
+                         {'a': 'foo', 'q': ['x:a', 'tns:a']})
+
+        # The root element
+        xml_data = '<tns:simple xmlns:tns="http://xmlschema.test/ns">10</tns:simple>'
+        self.assertEqual(schema.decode(xml_data), {**xmlns, '$': 10})
+        self.assertEqual(schema.decode(xml_data, preserve_root=True),
+                         {'tns:simple': {**xmlns, '$': 10}})
+        self.assertEqual(schema.decode(xml_data, strip_namespaces=True), 10)
+        self.assertEqual(schema.decode(xml_data, strip_namespaces=True, preserve_root=True),
+                         {'simple': 10})
+
+        xml_data = root_template.format('<tns:b c="x">1</tns:b>')
+        self.assertEqual(schema.decode(xml_data, strip_namespaces=True, preserve_root=True),
+                         {'root': {'b': {'@c': 'x', '$': 1}}})
+
     def test_columnar_converter(self):
         col_schema = XMLSchema(self.col_xsd_filename, converter=ColumnarConverter)
 
@@ -224,6 +309,81 @@ class TestConverters(unittest.TestCase):
         self.assertNotIn("'author_id'", str(obj))
         self.assertIn("'author__id'", str(obj))
 
+    def test_column_buffer(self):
+        schema = XMLSchema(self.col_xsd_filename)
+
+        column = ColumnBuffer('position', schema.maps.types[XSD_INT])
+        self.assertEqual(column.typecode, 'q')
+        self.assertEqual(repr(column), "ColumnBuffer(name='position', "
+                                       "xsd_type=XsdAtomicBuiltin(name='xs:int'), "
+                                       "typecode='q', size=0)")
+        column.append(1)
+        column.append(None)
+        column.append(3)
+        self.assertEqual(len(column), 3)
+        self.assertEqual(column.to_list(), [1, None, 3])
+        self.assertEqual(list(column.mask), [0, 1, 0])
+
+        column.append(2 ** 70)  # doesn't fit in the array, degrades to a list
+        self.assertIsNone(column.typecode)
+        self.assertEqual(column.to_list(), [1, None, 3, 2 ** 70])
+
+        column = ColumnBuffer('flag', schema.maps.types[XSD_BOOLEAN])
+        self.assertEqual(column.typecode, 'b')
+        column.append(True)
+        column.append(None)
+        column.append(False)
+        self.assertEqual(column.to_list(), [True, None, False])
+
+        column = ColumnBuffer('title', schema.maps.types[XSD_STRING])
+        self.assertIsNone(column.typecode)
+        self.assertIsInstance(column.values, list)
+
+    @unittest.skipIf(numpy is None, "NumPy library is not installed")
+    def test_column_buffer_to_numpy(self):
+        schema = XMLSchema(self.col_xsd_filename)
+
+        column = ColumnBuffer('year', schema.maps.types[XSD_DOUBLE])
+        for value in (1.5, None, 2.5):
+            column.append(value)
+
+        array = column.to_numpy()
+        self.assertEqual(array.dtype, numpy.float64)
+        self.assertEqual(list(array.mask), [False, True, False])
+        self.assertEqual(array.sum(), 4.0)
+
+        column = ColumnBuffer('flag', schema.maps.types[XSD_BOOLEAN])
+        column.append(True)
+        self.assertEqual(column.to_numpy().dtype, numpy.bool_)
+
+        column = ColumnBuffer('title', schema.maps.types[XSD_STRING])
+        column.append('foo')
+        self.assertEqual(column.to_numpy().dtype, object)
+
+    def test_column_buffer_converter(self):
+        col_schema = XMLSchema(self.col_xsd_filename)
+        columns = {}
+
+        obj = col_schema.decode(self.col_xml_filename, path='object',
+                                converter=ColumnBufferConverter, columns=columns)
+        self.assertListEqual(obj, [None, None])
+        self.assertListEqual(list(columns),
+                             ['@id', '@available', 'position', 'title', 'year', 'estimation'])
+        self.assertEqual(columns['@id'].to_list(), ['b0836217462', 'b0836217463'])
+        self.assertEqual(columns['@available'].to_list(), [True, True])
+        self.assertEqual(columns['position'].typecode, 'q')
+        self.assertEqual(columns['position'].to_list(), [1, 2])
+        self.assertEqual(columns['title'].to_list(), ['The Umbrellas', None])
+        self.assertEqual(columns['estimation'].to_list(), [Decimal('10000.00'), None])
+
+        columns = {}
+        converter = ColumnBufferConverter(columns=columns, attr_prefix=None)
+        col_schema.decode(self.col_xml_filename, path='object/author/name',
+                          converter=converter)
+        self.assertListEqual(list(columns), ['$'])
+        self.assertEqual(columns['$'].to_list(),
+                         ['Pierre-Auguste Renoir', 'Joan Miró'])
+
     def test_data_element_converter(self):
         col_schema = XMLSchema(self.col_xsd_filename, converter=DataElementConverter)
         obj = col_schema.decode(self.col_xml_filename)
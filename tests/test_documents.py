@@ -27,7 +27,7 @@ except ImportError:
 from xmlschema import XMLSchema10, XMLSchema11, XmlDocument, \
     XMLResourceError, XMLSchemaValidationError, XMLSchemaDecodeError, \
     to_json, from_json, validate, XMLSchemaParseError, is_valid, to_dict, \
-    to_etree, JsonMLConverter
+    to_columns, to_etree, JsonMLConverter
 
 from xmlschema.names import XSD_NAMESPACE, XSI_NAMESPACE, XSD_SCHEMA
 from xmlschema.helpers import is_etree_element, is_etree_document
@@ -76,6 +76,25 @@ class TestXmlDocuments(unittest.TestCase):
         self.assertEqual(len(errors), 0)
         self.assertIn('"object": [null, null]', json_data)
 
+    def test_to_columns_api(self):
+        columns = to_columns(self.col_xml_file, path='object')
+        self.assertListEqual(list(columns),
+                             ['@id', '@available', 'position', 'title', 'year', 'estimation'])
+        self.assertEqual(columns['position'].to_list(), [1, 2])
+        self.assertEqual(columns['estimation'].to_list(), [Decimal('10000.00'), None])
+
+        columns = to_columns(self.col_xml_file, path='object', lazy=True, attr_prefix='_')
+        self.assertEqual(columns['_id'].to_list(), ['b0836217462', 'b0836217463'])
+        self.assertEqual(columns['position'].to_list(), [1, 2])
+
+        col_1_error_xml_file = casepath('examples/collection/collection-1_error.xml')
+        with self.assertRaises(XMLSchemaValidationError):
+            to_columns(col_1_error_xml_file, path='object')
+
+        columns, errors = to_columns(col_1_error_xml_file, path='object', validation='lax')
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(columns['position'].to_list(), [1, None])  # invalid value is null
+
     def test_to_etree_api(self):
         data = to_dict(self.col_xml_file)
         root_tag = '{http://example.com/ns/collection}collection'
@@ -496,6 +515,26 @@ class TestXmlDocuments(unittest.TestCase):
         self.assertTrue(hasattr(etree_document, 'xpath'))
         self.assertTrue(hasattr(etree_document, 'xslt'))
 
+    @unittest.skipIf(lxml_etree is None, "Skip: lxml is not available.")
+    def test_xml_parser_argument(self):
+        json_data = to_json(self.col_xml_file, lazy=True)
+        self.assertEqual(to_json(self.col_xml_file, lazy=True, xml_parser='lxml'), json_data)
+        self.assertEqual(to_json(self.col_xml_file, xml_parser='lxml'), json_data)
+
+        col_1_error_xml_file = casepath('examples/collection/collection-1_error.xml')
+        self.assertTrue(is_valid(self.col_xml_file, xml_parser='lxml'))
+        with self.assertRaises(XMLSchemaValidationError):
+            validate(col_1_error_xml_file, xml_parser='lxml')
+
+        resource, schema = get_context(self.col_xml_file, xml_parser='lxml')
+        self.assertEqual(resource.xml_parser, 'lxml')
+        self.assertEqual(schema.xml_parser, 'lxml')
+
+        xml_document = XmlDocument(self.vh_xml_file, xml_parser='lxml')
+        self.assertTrue(hasattr(xml_document.getroot(), 'xpath'))
+        self.assertEqual(xml_document.schema.xml_parser, 'lxml')
+        self.assertEqual(xml_document.decode(), XmlDocument(self.vh_xml_file).decode())
+
     def test_xml_document_tostring(self):
         xml_document = XmlDocument(self.vh_xml_file)
         self.assertTrue(xml_document.tostring().startswith('<vh:vehicles'))
@@ -11,9 +11,11 @@
 """Tests concerning XML resources"""
 
 import unittest
+import unittest.mock
 import os
 import contextlib
 import pathlib
+import pickle
 import platform
 import warnings
 from io import StringIO, BytesIO
@@ -30,11 +32,13 @@ except ImportError:
 
 from elementpath.etree import PyElementTree, is_etree_element
 
+import xmlschema
 from xmlschema import fetch_namespaces, fetch_resource, fetch_schema, \
     fetch_schema_locations, XMLResource, XMLResourceError, XMLSchema
 from xmlschema.names import XSD_NAMESPACE
 from xmlschema.testing import SKIP_REMOTE_TESTS
 from xmlschema.locations import normalize_url
+from xmlschema.resources import get_stream_steps
 
 
 TEST_CASES_DIR = str(pathlib.Path(__file__).absolute().parent.joinpath('test_cases'))
@@ -865,6 +869,57 @@ class TestResources(unittest.TestCase):
         ]
         self.assertListEqual(tags, lazy_tags)
 
+    def test_get_stream_steps(self):
+        namespaces = {'': 'http://example.com/ns', 'xs': XSD_NAMESPACE}
+        self.assertListEqual(get_stream_steps('/a/b/c'), ['a', 'b', 'c'])
+        self.assertListEqual(get_stream_steps(' b/* '), ['*', 'b', '*'])
+        self.assertListEqual(get_stream_steps('./b'), ['*', 'b'])
+        self.assertListEqual(get_stream_steps('/a/b', namespaces),
+                             ['{http://example.com/ns}a', '{http://example.com/ns}b'])
+        self.assertListEqual(get_stream_steps('xs:element/{http://a.test}b', namespaces),
+                             ['*', f'{{{XSD_NAMESPACE}}}element', '{http://a.test}b'])
+        self.assertListEqual(get_stream_steps('{}a'), ['*', 'a'])
+
+        for path in ('.', '..', '/', '//a', 'a//b', 'a[1]', 'a/@b', 'a/text()',
+                     'xs:*', 'tns:a', 'a/child::b', '1a'):
+            self.assertIsNone(get_stream_steps(path, namespaces), msg=path)
+
+    def test_xml_resource_iter_stream(self):
+        xml_data = '<a xmlns:tns="http://example.com/ns"><b1><c1 x="1"><d1/></c1><c2/></b1>' \
+                   '<b2><tns:c1/><c1 x="2"/></b2><b1><c1 x="3"/></b1></a>'
+
+        resource = XMLResource(xml_data)
+        self.assertListEqual([e.get('x') for e in resource.iter_stream('*/c1')],
+                             ['1', '2', '3'])
+
+        resource = XMLResource(StringIO(xml_data), lazy=True)
+        ancestors = []
+        for k, elem in enumerate(resource.iter_stream('/a/*/c1', ancestors=ancestors)):
+            self.assertEqual(elem.get('x'), str(k + 1))
+            self.assertListEqual([e.tag for e in ancestors], ['a', 'b2' if k == 1 else 'b1'])
+            self.assertIn(elem, ancestors[-1])
+            self.assertIs(ancestors[-1][0], elem)  # preceding elements are removed
+            self.assertIsNotNone(resource.get_nsmap(elem))
+            if not k:
+                self.assertEqual(len(elem), 1)
+
+        # Yielded and not matching subtrees are removed from the tree
+        self.assertEqual(len(resource.root), 0)
+        self.assertListEqual(list(resource._nsmaps), [resource.root])
+
+        resource = XMLResource(StringIO(xml_data), lazy=True)
+        self.assertListEqual([e.tag for e in resource.iter_stream(
+            'b2/tns:c1', namespaces={'tns': 'http://example.com/ns'}
+        )], ['{http://example.com/ns}c1'])
+        self.assertListEqual([e.tag for e in resource.iter_stream('b3/c1')], [])
+
+        # Falls back to iterfind() for other paths
+        resource = XMLResource(StringIO(xml_data), lazy=True)
+        self.assertListEqual([e.get('x') for e in resource.iter_stream('*/c1[@x > 1]')],
+                             ['2', '3'])
+        with self.assertRaises(XMLResourceError):
+            list(resource.iter_stream('.'))
+
     def test_xml_resource_find(self):
         root = ElementTree.XML('<a><b1><c1/><c2 x="2"/></b1><b2/></a>')
         resource = XMLResource(root)
@@ -978,11 +1033,12 @@ class TestResources(unittest.TestCase):
         resource._nsmaps[resource._root] = {}
 
         for elem in resource.iter():
-            nsmap = resource.get_nsmap(elem)
-            if elem is resource.root:
-                self.assertEqual(nsmap, {})
-            else:
-                self.assertIsNone(nsmap)
+            # Elements without a map inherit the nsmap of the nearest ancestor
+            self.assertEqual(resource.get_nsmap(elem), {})
+
+        resource._nsmaps.clear()
+        for elem in resource.iter():
+            self.assertIsNone(resource.get_nsmap(elem))
 
         if lxml_etree is not None:
             tree = lxml_etree.parse(xsd_file)
@@ -1064,6 +1120,21 @@ class TestResources(unittest.TestCase):
             resource.get_namespaces(namespaces={'xml': "http://example.com/ne"})
         self.assertIn("reserved prefix 'xml'", str(ctx.exception))
 
+    def test_lazy_resource_single_pass(self):
+        resource = XMLResource(self.vh_xml_file, lazy=True)
+        with unittest.mock.patch.object(resource, 'open', side_effect=resource.open) as mo:
+            self.assertEqual(set(resource.get_namespaces().keys()), {'vh', 'xsi'})
+            self.assertEqual(len(resource.get_locations()), 1)
+            mo.assert_not_called()
+
+            vh_schema = XMLSchema(self.vh_xsd_file)
+            self.assertTrue(vh_schema.is_valid(resource))
+            self.assertEqual(mo.call_count, 1)
+
+            mo.reset_mock()
+            self.assertIsNone(xmlschema.validate(resource))
+            self.assertEqual(mo.call_count, 1)
+
     def test_xml_resource_get_locations(self):
         resource = XMLResource(self.col_xml_file)
         self.check_url(resource.url, normalize_url(self.col_xml_file))
@@ -1335,6 +1406,251 @@ class TestResources(unittest.TestCase):
         resource = XMLResource(urn, uri_mapper=uri_mapper)
         self.assertEqual(resource.url[-30:], 'examples/vehicles/vehicles.xsd')
 
+    def test_memory_map(self):
+        with self.assertRaises(TypeError):
+            XMLResource(self.vh_xml_file, memory_map=1)
+
+        resource = XMLResource(self.vh_xml_file, memory_map=True)
+        self.assertIsNotNone(resource._mmap)
+        self.assertEqual(resource.root.tag, '{http://example.com/vehicles}vehicles')
+
+        lazy_resource = XMLResource(self.vh_xml_file, lazy=True, memory_map=True)
+        mapping = lazy_resource._mmap
+        tags = [e.tag for e in XMLResource(self.vh_xml_file, lazy=True).iter()]
+        self.assertListEqual([e.tag for e in lazy_resource.iter()], tags)
+        self.assertListEqual([e.tag for e in lazy_resource.iter()], tags)
+        self.assertEqual(len(list(lazy_resource.iter_depth())), 2)
+        self.assertIs(lazy_resource._mmap, mapping)  # shared by all the passes
+
+        for elem in lazy_resource.iter():
+            lazy_resource.close()  # the mapping is released at the end of the pass
+            self.assertIsNone(lazy_resource._mmap)
+        self.assertListEqual([e.tag for e in lazy_resource.iter()], tags)
+
+        resource.load()
+        with open(self.vh_xml_file) as fp:
+            self.assertEqual(resource.text, fp.read())
+
+        resource = pickle.loads(pickle.dumps(resource))
+        self.assertIsNone(resource._mmap)
+        self.assertEqual(resource.root.tag, '{http://example.com/vehicles}vehicles')
+
+        with self.assertRaises(URLError):
+            XMLResource(casepath('resources/unknown.xml'), memory_map=True)
+
+        vh_schema = XMLSchema(self.vh_xsd_file)
+        self.assertTrue(vh_schema.is_valid(lazy_resource))
+        lazy_resource.close()
+
+    def test_xml_resource_index(self):
+        resource = XMLResource(self.vh_xml_file)
+        with self.assertRaises(XMLResourceError):
+            resource.build_index()
+
+        resource = XMLResource(self.vh_xml_file, lazy=True)
+        self.assertIsNone(resource.index)
+        index = resource.build_index()
+        self.assertIs(resource.index, index)
+        self.assertEqual(repr(index), 'XMLResourceIndex(depth=1, size=2)')
+        self.assertEqual(index.encoding, 'utf-8')
+        self.assertEqual(index[0], (233, 5, '/{http://example.com/vehicles}vehicles/'
+                                            '{http://example.com/vehicles}cars'))
+        self.assertEqual(index[1][1:], (10, '/{http://example.com/vehicles}vehicles/'
+                                            '{http://example.com/vehicles}bikes'))
+        self.assertListEqual(index.get_xmlns(1), [
+            ('vh', 'http://example.com/vehicles'),
+            ('xsi', 'http://www.w3.org/2001/XMLSchema-instance')
+        ])
+        self.assertEqual(pickle.loads(pickle.dumps(index))[1], index[1])
+
+        with open(self.vh_xml_file, 'rb') as fp:
+            fp.seek(index[1][0])
+            self.assertEqual(fp.read(9), b'<vh:bikes')
+
+        subresource = resource.get_subresource(1)
+        self.assertFalse(subresource.is_lazy())
+        self.assertEqual(subresource.root.tag, '{http://example.com/vehicles}bikes')
+        self.assertEqual(len(subresource.root), 2)
+        self.assertEqual(subresource.get_namespaces(), {
+            'vh': 'http://example.com/vehicles',
+            'xsi': 'http://www.w3.org/2001/XMLSchema-instance'
+        })
+        vh_schema = XMLSchema(self.vh_xsd_file)
+        self.assertTrue(vh_schema.is_valid(subresource, schema_path=index[1][2]))
+
+        resource = XMLResource(self.vh_xml_file, lazy=2, defuse='always')
+        self.assertEqual(resource.get_subresource(-1).root.attrib,
+                         {'make': 'Yamaha', 'model': 'XS650'})
+        self.assertEqual(len(resource.index), 4)
+        self.assertEqual(len(resource.index._paths), 2)  # paths and scopes are shared
+        self.assertEqual(len(resource.index._scopes), 1)
+
+        with open(self.vh_xml_file, 'rb') as fp:
+            resource = XMLResource(BytesIO(fp.read()), lazy=True)
+        self.assertEqual(resource.get_subresource(0).root.tag,
+                         '{http://example.com/vehicles}cars')
+        with self.assertRaises(IndexError):
+            resource.get_subresource(2)
+
+        with open(self.vh_xml_file) as fp:
+            resource = XMLResource(StringIO(fp.read()), lazy=True)
+        with self.assertRaises(XMLResourceError):
+            resource.build_index()
+
+        resource = XMLResource(BytesIO(
+            '<?xml version="1.0" encoding="ISO-8859-1"?>\n'
+            '<root xmlns="http://xmlschema.test/ns"><a>à</a><b xmlns:p="ns2"/></root>'
+            .encode('iso-8859-1')
+        ), lazy=True)
+        self.assertEqual(resource.get_subresource(0).root.text, 'à')
+        subresource = resource.get_subresource(1)
+        self.assertEqual(subresource.root.tag, '{http://xmlschema.test/ns}b')
+        self.assertEqual(subresource.get_nsmap(subresource.root),
+                         {'': 'http://xmlschema.test/ns', 'p': 'ns2'})
+
+        resource = XMLResource(BytesIO(b'<root><a/><b>'), lazy=True)
+        with self.assertRaises(ElementTree.ParseError):
+            resource.build_index()
+
+        # Entities and default attributes of the DOCTYPE internal subset
+        xml_data = b'<?xml version="1.0"?>\n' \
+                   b'<!DOCTYPE root [\n' \
+                   b'  <!ENTITY e "entity">\n' \
+                   b'  <!ATTLIST g d CDATA "dflt">\n' \
+                   b']>\n' \
+                   b'<root><f>&e;</f><g/><g d="value"/></root>'
+        resource = XMLResource(BytesIO(xml_data), lazy=True)
+        self.assertTrue(resource.build_index().doctype.startswith(b'<!DOCTYPE root ['))
+        self.assertEqual(resource.get_subresource(0).root.text, 'entity')
+        self.assertEqual(resource.get_subresource(1).root.attrib, {'d': 'dflt'})
+        self.assertEqual(resource.get_subresource(2).root.attrib, {'d': 'value'})
+        self.assertEqual([e.attrib for e in resource.iter()][-2:],
+                         [{'d': 'dflt'}, {'d': 'value'}])
+
+        with self.assertRaises(ElementTree.ParseError):
+            XMLResource(BytesIO(xml_data), lazy=True, defuse='always')
+
+        xml_data = b'<!DOCTYPE root [<!ATTLIST g d CDATA "dflt">]><root><f/><g/></root>'
+        resource = XMLResource(BytesIO(xml_data), lazy=True, defuse='always')
+        self.assertEqual(resource.get_subresource(1).root.attrib, {'d': 'dflt'})
+
+        resource = XMLResource(BytesIO(b'<root><f/></root>'), lazy=True)
+        self.assertEqual(resource.build_index().doctype, b'')
+
+    @unittest.skipIf(lxml_etree is None, "Skip: lxml is not available.")
+    def test_xml_parser_lxml(self):
+        with self.assertRaises(TypeError):
+            XMLResource(self.vh_xml_file, xml_parser=None)
+        with self.assertRaises(ValueError):
+            XMLResource(self.vh_xml_file, xml_parser='expat')
+
+        resource = XMLResource(self.vh_xml_file)
+        self.assertEqual(resource.xml_parser, 'etree')
+        namespaces = resource.get_namespaces()
+        nsmaps = [resource.get_nsmap(e) for e in resource.iter()]
+
+        for lazy in (False, True, 2):
+            for memory_map in (False, True):
+                lxml_resource = XMLResource(self.vh_xml_file, lazy=lazy,
+                                            memory_map=memory_map, xml_parser='lxml')
+                self.assertEqual(lxml_resource.xml_parser, 'lxml')
+                self.assertTrue(hasattr(lxml_resource.root, 'nsmap'))
+                self.assertDictEqual(lxml_resource.get_namespaces(), namespaces)
+                self.assertDictEqual(lxml_resource.get_namespaces(root_only=False),
+                                     resource.get_namespaces(root_only=False))
+                self.assertListEqual(
+                    [lxml_resource.get_nsmap(e) for e in lxml_resource.iter()
+                     if not callable(e.tag)], nsmaps
+                )
+                self.assertEqual(len(list(lxml_resource.iter_depth())), 1 if not lazy else
+                                 2 if lazy == 1 else 4)
+                self.assertEqual(lxml_resource._nsmaps, {})
+
+        # Text with an XML declaration is fed to lxml as UTF-8
+        with open(self.vh_xml_file) as fp:
+            xml_data = fp.read()
+        lxml_resource = XMLResource(xml_data, xml_parser='lxml')
+        self.assertTrue(xml_data.startswith('<?xml version="1.0" encoding="utf-8"?>'))
+        self.assertDictEqual(lxml_resource.get_namespaces(), namespaces)
+        lxml_resource = XMLResource(StringIO(xml_data), lazy=True, xml_parser='lxml')
+        self.assertEqual(len(list(lxml_resource.iter_depth())), 2)
+
+        lxml_resource = XMLResource(BytesIO(
+            '<?xml version="1.0" encoding="ISO-8859-1"?>\n'
+            '<root xmlns="http://xmlschema.test/ns"><a>à</a><b xmlns:p="ns2"/></root>'
+            .encode('iso-8859-1')
+        ), xml_parser='lxml')
+        root = lxml_resource.root
+        self.assertEqual(root[0].text, 'à')
+        self.assertDictEqual(lxml_resource.get_nsmap(root[1]),
+                             {'': 'http://xmlschema.test/ns', 'p': 'ns2'})
+        self.assertListEqual(lxml_resource.get_xmlns(root), [('', 'http://xmlschema.test/ns')])
+        self.assertIsNone(lxml_resource.get_xmlns(root[0]))
+        self.assertListEqual(lxml_resource.get_xmlns(root[1]), [('p', 'ns2')])
+
+        # Lazy defused data are parsed with the safe ElementTree parser
+        lxml_resource = XMLResource(self.vh_xml_file, lazy=True,
+                                    defuse='always', xml_parser='lxml')
+        self.assertFalse(hasattr(lxml_resource.root, 'nsmap'))
+        self.assertDictEqual(lxml_resource.get_namespaces(), namespaces)
+
+        xml_data = '<!DOCTYPE a [<!ENTITY e "entity">]><a>&e;</a>'
+        self.assertEqual(XMLResource(xml_data, xml_parser='lxml').root.text, 'entity')
+        with self.assertRaises(ElementTree.ParseError):
+            XMLResource(xml_data, defuse='always', xml_parser='lxml')
+
+        with self.assertRaises(ElementTree.ParseError):
+            XMLResource(BytesIO(b'<root><a/>'), xml_parser='lxml')
+        lxml_resource = XMLResource(BytesIO(b'<root><a/>'), lazy=True, xml_parser='lxml')
+        with self.assertRaises(ElementTree.ParseError):
+            list(lxml_resource.iter())
+
+        vh_schema = XMLSchema(self.vh_xsd_file)
+        self.assertTrue(vh_schema.is_valid(
+            XMLResource(self.vh_xml_file, lazy=True, xml_parser='lxml'), workers=2
+        ))
+
+    @unittest.skipIf(lxml_etree is None, "Skip: lxml is not available.")
+    def test_xml_parser_lxml_with_comments_and_pis(self):
+        schema = XMLSchema(
+            '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+            '  <xs:element name="a" type="xs:int"/>'
+            '  <xs:element name="m">'
+            '    <xs:complexType mixed="true">'
+            '      <xs:sequence>'
+            '        <xs:element name="b" type="xs:int" maxOccurs="unbounded"/>'
+            '      </xs:sequence>'
+            '    </xs:complexType>'
+            '  </xs:element>'
+            '</xs:schema>'
+        )
+
+        xml_data = '<a>2<!-- c -->3<?pi data?></a>'
+        self.assertEqual(XMLResource(xml_data, xml_parser='lxml').root.text, '23')
+        for lazy in (False, True):
+            resource = XMLResource(xml_data, lazy=lazy, xml_parser='lxml')
+            self.assertTrue(schema.is_valid(resource))
+            self.assertEqual(schema.decode(resource), 23)
+
+        xml_data = '<m>x<!-- c -->y<b>1<?pi?>0</b><!-- c --><?pi?>z<b>2</b></m>'
+        root = XMLResource(xml_data, xml_parser='lxml').root
+        self.assertEqual(root.text, 'xy')
+        self.assertEqual(len(root), 2)
+        self.assertEqual(root[0].tail, 'z')
+
+        expected = schema.decode(xml_data, cdata_prefix='#')
+        self.assertEqual(expected, {'#1': 'xy', 'b': [10, 2], '#2': 'z'})
+        for lazy in (False, True):
+            resource = XMLResource(xml_data, lazy=lazy, xml_parser='lxml')
+            self.assertTrue(schema.is_valid(resource))
+            self.assertEqual(schema.decode(resource, cdata_prefix='#'), expected)
+
+    def test_xml_parser_fallback(self):
+        with unittest.mock.patch('xmlschema.resources.lxml_etree', None):
+            resource = XMLResource(self.vh_xml_file, xml_parser='lxml')
+        self.assertEqual(resource.xml_parser, 'etree')
+        self.assertFalse(hasattr(resource.root, 'nsmap'))
+
 
 if __name__ == '__main__':
     header_template = "Test xmlschema's XML resources with Python {} on platform {}"
@@ -790,6 +790,23 @@ class TestDecoding(XsdValidatorTestCase):
             validation='skip', path='/col:collection/object/author', lazy=True, **kwargs
         ))
 
+    def test_lazy_decoding_stream(self):
+        path = '/vh:vehicles/vh:cars/vh:car'
+        cars = self.vh_schema.decode(self.vh_xml_file, path, namespaces=self.vh_namespaces)
+        self.assertEqual(cars, VEHICLES_DICT['vh:cars']['vh:car'])
+
+        resource = xmlschema.XMLResource(self.vh_xml_file, lazy=True)
+        self.assertListEqual(
+            list(self.vh_schema.iter_decode(resource, path, namespaces=self.vh_namespaces)),
+            cars
+        )
+        self.assertEqual(len(resource.root), 0)
+
+        resource = xmlschema.XMLResource(self.vh_xml_file, lazy=True)
+        self.assertEqual(self.vh_schema.decode(resource, 'vh:bikes/vh:bike',
+                                               namespaces=self.vh_namespaces),
+                         VEHICLES_DICT['vh:bikes']['vh:bike'])
+
     def test_path(self):
         xt = ElementTree.parse(self.vh_xml_file)
         xd = self.vh_schema.to_dict(xt, '/vh:vehicles/vh:cars', namespaces=self.vh_namespaces)
@@ -182,6 +182,79 @@ class TestValidation(XsdValidatorTestCase):
 
         self.assertIsNone(self.col_schema.validate(resource, validation_hook=skip_validation))
 
+    def test_fail_fast_argument(self):
+        schema = self.schema_class(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="item" type="xs:int" maxOccurs="unbounded"/>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+            </xs:schema>"""))
+
+        xml_data = '<root><item>1</item><unknown/>{}<item>x</item></root>'.format(
+            '<item>2</item>' * 10
+        )
+        visited = []
+
+        def extra_validator(elem, _xsd_element):
+            visited.append(elem.tag)
+
+        errors = list(schema.iter_errors(xml_data, extra_validator=extra_validator))
+        self.assertEqual(len(errors), 2)
+        self.assertEqual(errors[0].reason, "invalid literal for int() with base 10: 'x'")
+        self.assertIsInstance(errors[1], XMLSchemaChildrenValidationError)
+        self.assertEqual(len(visited), 13)
+
+        # The content model error is reported before validating the children
+        visited.clear()
+        errors = list(schema.iter_errors(xml_data, extra_validator=extra_validator,
+                                         fail_fast=True))
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], XMLSchemaChildrenValidationError)
+        self.assertListEqual(visited, ['item'])
+
+        with self.assertRaises(XMLSchemaChildrenValidationError):
+            schema.validate(xml_data, fail_fast=True)
+        with self.assertRaises(XMLSchemaValidationError) as ctx:
+            schema.validate(xml_data)
+        self.assertNotIsInstance(ctx.exception, XMLSchemaChildrenValidationError)
+
+        visited.clear()
+        self.assertFalse(schema.is_valid(xml_data, extra_validator=extra_validator))
+        self.assertEqual(len(visited), 11)  # stops at the first error
+        visited.clear()
+        self.assertFalse(schema.is_valid(xml_data, extra_validator=extra_validator,
+                                         fail_fast=True))
+        self.assertListEqual(visited, ['item'])
+        self.assertTrue(schema.is_valid('<root><item>1</item></root>'))
+        self.assertTrue(schema.is_valid('<root><item>1</item></root>', fail_fast=True))
+
+        xml_data = '<root>{}<item>x</item><item>y</item></root>'.format('<item>2</item>' * 5)
+        self.assertEqual(len(list(schema.iter_errors(xml_data, fail_fast=True))), 1)
+
+    def test_is_valid_with_fail_fast(self):
+        cases = [
+            ('examples/vehicles/vehicles.xsd', 'examples/vehicles/vehicles.xml'),
+            ('examples/vehicles/vehicles.xsd', 'examples/vehicles/vehicles-1_error.xml'),
+            ('examples/vehicles/vehicles.xsd', 'examples/vehicles/vehicles-2_errors.xml'),
+            ('examples/vehicles/vehicles.xsd', 'examples/vehicles/vehicles-3_errors.xml'),
+            ('examples/collection/collection.xsd', 'examples/collection/collection.xml'),
+            ('examples/collection/collection.xsd',
+             'examples/collection/collection-1_error.xml'),
+        ]
+        for xsd_file, xml_file in cases:
+            schema = self.schema_class(self.casepath(xsd_file))
+            xml_file = self.casepath(xml_file)
+            is_valid = not any(True for _ in schema.iter_errors(xml_file))
+            self.assertIs(schema.is_valid(xml_file), is_valid, msg=xml_file)
+            self.assertIs(schema.is_valid(xml_file, fail_fast=True), is_valid, msg=xml_file)
+
+            resource = xmlschema.XMLResource(xml_file, lazy=True)
+            self.assertIs(schema.is_valid(resource, fail_fast=True), is_valid, msg=xml_file)
+
     def test_path_argument(self):
         schema = self.schema_class(self.casepath('examples/vehicles/vehicles.xsd'))
 
@@ -0,0 +1,463 @@
+#!/usr/bin/env python
+#
+# Copyright (c), 2016-2024, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+import unittest
+import os
+import pathlib
+import pickle
+import shutil
+import tempfile
+
+from xmlschema import XMLSchema10, XMLSchema11, SchemaCache, TrustedSources, \
+    ValidationCache
+from xmlschema.exceptions import XMLSchemaTypeError, XMLSchemaValueError
+from xmlschema.validators import XMLSchemaParseError
+from xmlschema.names import XSD_STRING
+from xmlschema.resources import XMLResource
+
+CASES_DIR = pathlib.Path(__file__).parent.joinpath('../test_cases').resolve()
+
+
+class TestSchemaCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.schemas_dir = os.path.join(self.tmp_dir, 'vehicles')
+        shutil.copytree(str(CASES_DIR.joinpath('examples/vehicles')), self.schemas_dir)
+        self.schema_file = os.path.join(self.schemas_dir, 'vehicles.xsd')
+        self.xml_file = os.path.join(self.schemas_dir, 'vehicles.xml')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_cache_init(self):
+        cache = SchemaCache(self.cache_dir)
+        self.assertTrue(os.path.isdir(self.cache_dir))
+        self.assertEqual(repr(cache), 'SchemaCache(path=%r)' % self.cache_dir)
+        self.assertEqual(len(cache), 0)
+
+        cache = SchemaCache(pathlib.Path(self.cache_dir))
+        self.assertEqual(cache.path, self.cache_dir)
+
+        with self.assertRaises(XMLSchemaTypeError):
+            SchemaCache(None)
+
+    def test_store_and_load(self):
+        schema = XMLSchema10(self.schema_file, cache=self.cache_dir)
+        cache = SchemaCache(self.cache_dir)
+        self.assertEqual(len(cache), 1)
+
+        cached_schema = XMLSchema10(self.schema_file, cache=cache)
+        self.assertEqual(len(cache), 1)
+        self.assertTrue(cached_schema.built)
+        self.assertIs(cached_schema.maps.validator, cached_schema)
+        self.assertEqual(cached_schema.url, schema.url)
+        self.assertListEqual(list(cached_schema.elements), list(schema.elements))
+        self.assertListEqual(list(cached_schema.maps.types), list(schema.maps.types))
+        self.assertIs(cached_schema.maps.types[XSD_STRING],
+                      XMLSchema10.meta_schema.maps.types[XSD_STRING])
+
+        self.assertTrue(cached_schema.is_valid(self.xml_file))
+        self.assertEqual(cached_schema.to_dict(self.xml_file), schema.to_dict(self.xml_file))
+
+    def test_cache_keys(self):
+        XMLSchema10(self.schema_file, cache=self.cache_dir)
+        XMLSchema10(self.schema_file, cache=self.cache_dir, validation='lax')
+        XMLSchema11(self.schema_file, cache=self.cache_dir)
+
+        cache = SchemaCache(self.cache_dir)
+        self.assertEqual(len(cache), 3)
+
+        XMLSchema11(self.schema_file, cache=self.cache_dir)
+        self.assertEqual(len(cache), 3)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_cache_keys_with_base_url(self):
+        schema_template = '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">' \
+                          '<xs:include schemaLocation="types.xsd"/>' \
+                          '<xs:element name="root" type="rootType"/></xs:schema>'
+        types_template = '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">' \
+                         '<xs:simpleType name="rootType">' \
+                         '<xs:restriction base="xs:{}"/></xs:simpleType></xs:schema>'
+
+        for name in ('string', 'integer'):
+            os.mkdir(os.path.join(self.tmp_dir, name))
+            with open(os.path.join(self.tmp_dir, name, 'types.xsd'), 'w') as fp:
+                fp.write(types_template.format(name))
+
+        schema = XMLSchema10(schema_template, cache=self.cache_dir,
+                             base_url=os.path.join(self.tmp_dir, 'string'))
+        self.assertTrue(schema.is_valid('<root>foo</root>'))
+
+        schema = XMLSchema10(schema_template, cache=self.cache_dir,
+                             base_url=os.path.join(self.tmp_dir, 'integer'))
+        self.assertFalse(schema.is_valid('<root>foo</root>'))
+        self.assertTrue(schema.is_valid('<root>10</root>'))
+        self.assertEqual(len(SchemaCache(self.cache_dir)), 2)
+
+        schema = XMLSchema10(schema_template, cache=self.cache_dir,
+                             base_url=os.path.join(self.tmp_dir, 'string'))
+        self.assertTrue(schema.is_valid('<root>foo</root>'))
+        self.assertEqual(len(SchemaCache(self.cache_dir)), 2)
+
+    def test_cache_not_used(self):
+        schema = XMLSchema10(self.schema_file, build=False, cache=self.cache_dir)
+        self.assertFalse(schema.built)
+        self.assertEqual(len(SchemaCache(self.cache_dir)), 0)
+
+        schema.build()
+        XMLSchema10(self.schema_file, global_maps=schema.maps, cache=self.cache_dir)
+        self.assertEqual(len(SchemaCache(self.cache_dir)), 0)
+
+    def test_changed_dependency(self):
+        cache = SchemaCache(self.cache_dir)
+        schema = XMLSchema10(self.schema_file, cache=cache)
+        self.assertIn('{http://example.com/vehicles}cars', schema.maps.elements)
+        path = next(iter(cache.iter_paths()))
+        key = os.path.basename(path)[:-len(cache.suffix)]
+
+        # Change an included schema: the entry key is the same but the manifest differs
+        cars_file = os.path.join(self.schemas_dir, 'cars.xsd')
+        with open(cars_file) as fp:
+            text = fp.read()
+        with open(cars_file, 'w') as fp:
+            fp.write(text.replace('</xs:schema>', '<xs:element name="autos"/>\n</xs:schema>'))
+
+        self.assertFalse(cache.load(XMLSchema10(self.schema_file, build=False), key))
+
+        schema = XMLSchema10(self.schema_file, cache=cache)
+        self.assertIn('{http://example.com/vehicles}autos', schema.maps.elements)
+        self.assertListEqual(list(cache.iter_paths()), [path])
+
+        schema = XMLSchema10(self.schema_file, cache=cache)
+        self.assertIn('{http://example.com/vehicles}autos', schema.maps.elements)
+
+    def test_invalid_entries(self):
+        cache = SchemaCache(self.cache_dir)
+        XMLSchema10(self.schema_file, cache=cache)
+        path = next(iter(cache.iter_paths()))
+        key = os.path.basename(path)[:-len(cache.suffix)]
+        self.assertEqual(cache.get_path(key), path)
+
+        schema = XMLSchema10(self.schema_file, build=False)
+        self.assertTrue(cache.load(schema, key))
+
+        with open(path, 'rb') as fp:
+            data = fp.read()
+
+        with open(path, 'wb') as fp:
+            fp.write(data[:-10])
+        self.assertFalse(cache.load(XMLSchema10(self.schema_file, build=False), key))
+
+        with open(path, 'wb') as fp:
+            fp.write(data.replace(b'"format": 1', b'"format": 0', 1))
+        self.assertFalse(cache.load(XMLSchema10(self.schema_file, build=False), key))
+
+        with open(path, 'wb') as fp:
+            fp.write(b'not a cache entry')
+        self.assertFalse(cache.load(XMLSchema10(self.schema_file, build=False), key))
+
+        cache.remove(key)
+        self.assertEqual(len(cache), 0)
+        cache.remove(key)
+        self.assertFalse(cache.load(XMLSchema10(self.schema_file, build=False), key))
+
+
+class TestTrustedSources(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.schemas_dir = os.path.join(self.tmp_dir, 'vehicles')
+        shutil.copytree(str(CASES_DIR.joinpath('examples/vehicles')), self.schemas_dir)
+        self.schema_file = os.path.join(self.schemas_dir, 'vehicles.xsd')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_registry_init(self):
+        trusted_sources = TrustedSources()
+        self.assertEqual(repr(trusted_sources), 'TrustedSources(path=None)')
+        self.assertEqual(len(trusted_sources), 0)
+
+        with self.assertRaises(XMLSchemaTypeError):
+            TrustedSources(10)
+
+        with self.assertRaises(XMLSchemaTypeError):
+            XMLSchema10(self.schema_file, trusted_sources=set())
+
+    def test_registered_sources(self):
+        trusted_sources = TrustedSources()
+        schema = XMLSchema10(self.schema_file, trusted_sources=trusted_sources)
+        self.assertIs(schema.trusted_sources, trusted_sources)
+        self.assertEqual(len(trusted_sources), 4)  # vehicles, cars, bikes and types
+
+        XMLSchema10(self.schema_file, trusted_sources=trusted_sources)
+        self.assertEqual(len(trusted_sources), 4)
+
+        # Different meta-schema, different digests
+        XMLSchema11(self.schema_file, trusted_sources=trusted_sources)
+        self.assertEqual(len(trusted_sources), 8)
+
+        digest = trusted_sources.get_digest(schema.source, schema.meta_schema, schema.namespaces)
+        self.assertIn(digest, trusted_sources)
+        trusted_sources.discard(digest)
+        self.assertNotIn(digest, trusted_sources)
+
+        trusted_sources.clear()
+        self.assertEqual(len(trusted_sources), 0)
+
+    def test_meta_validation_skip(self):
+        trusted_sources = TrustedSources()
+        schema = XMLSchema10(self.schema_file, trusted_sources=trusted_sources)
+        digest = trusted_sources.get_digest(schema.source, schema.meta_schema, schema.namespaces)
+
+        # An invalid schema is not registered and the digest of the changed source differs
+        with open(self.schema_file) as fp:
+            text = fp.read()
+        with open(self.schema_file, 'w') as fp:
+            fp.write(text.replace('<xs:element name="vehicles">',
+                                  '<xs:element name="vehicles" unknown="true">'))
+
+        with self.assertRaises(XMLSchemaParseError):
+            XMLSchema10(self.schema_file, trusted_sources=trusted_sources)
+
+        schema = XMLSchema10(self.schema_file, validation='lax',
+                             trusted_sources=trusted_sources)
+        self.assertEqual(len(schema.all_errors), 1)
+        self.assertNotIn(
+            trusted_sources.get_digest(schema.source, schema.meta_schema, schema.namespaces),
+            trusted_sources
+        )
+
+        # A registered digest skips the meta-schema validation of the source
+        trusted_sources.add(
+            trusted_sources.get_digest(schema.source, schema.meta_schema, schema.namespaces)
+        )
+        schema = XMLSchema10(self.schema_file, trusted_sources=trusted_sources)
+        self.assertEqual(schema.all_errors, [])
+        self.assertIn(digest, trusted_sources)
+
+    def test_persistent_registry(self):
+        path = os.path.join(self.tmp_dir, 'trusted.txt')
+        trusted_sources = TrustedSources(path)
+        XMLSchema10(self.schema_file, trusted_sources=trusted_sources)
+        self.assertTrue(os.path.isfile(path))
+
+        other = TrustedSources(pathlib.Path(path))
+        self.assertListEqual(list(other), list(trusted_sources))
+        self.assertEqual(len(other), 4)
+
+        other.discard(next(iter(other)))
+        self.assertEqual(len(TrustedSources(path)), 3)
+
+        other.clear()
+        self.assertFalse(os.path.isfile(path))
+        self.assertEqual(len(TrustedSources(path)), 0)
+
+
+class TestValidationCache(unittest.TestCase):
+
+    schema_class = XMLSchema10
+
+    @classmethod
+    def setUpClass(cls):
+        cls.schema = cls.schema_class("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="record" maxOccurs="unbounded">
+                      <xs:complexType>
+                        <xs:sequence>
+                          <xs:element name="address" type="addressType"/>
+                          <xs:element name="note" minOccurs="0">
+                            <xs:complexType>
+                              <xs:attribute name="ref" type="xs:IDREF"/>
+                            </xs:complexType>
+                          </xs:element>
+                          <xs:element name="item" type="itemType" minOccurs="0"/>
+                          <xs:element name="extra" minOccurs="0">
+                            <xs:complexType>
+                              <xs:sequence>
+                                <xs:any processContents="lax"/>
+                              </xs:sequence>
+                            </xs:complexType>
+                          </xs:element>
+                        </xs:sequence>
+                        <xs:attribute name="n" type="xs:int"/>
+                      </xs:complexType>
+                    </xs:element>
+                  </xs:sequence>
+                </xs:complexType>
+                <xs:unique name="itemCode">
+                  <xs:selector xpath="record/item"/>
+                  <xs:field xpath="@code"/>
+                </xs:unique>
+              </xs:element>
+              <xs:complexType name="addressType">
+                <xs:sequence>
+                  <xs:element name="city" type="xs:string"/>
+                  <xs:element name="zip">
+                    <xs:simpleType>
+                      <xs:restriction base="xs:string">
+                        <xs:pattern value="[0-9]{5}"/>
+                      </xs:restriction>
+                    </xs:simpleType>
+                  </xs:element>
+                </xs:sequence>
+              </xs:complexType>
+              <xs:complexType name="itemType">
+                <xs:attribute name="code" type="xs:int"/>
+              </xs:complexType>
+            </xs:schema>""")
+
+    @staticmethod
+    def get_xml_data(*zips, note=''):
+        records = ''.join(
+            f'<record n="{k}"><address><city>Rome</city><zip>{zip_code}</zip>'
+            f'</address>{note}</record>' for k, zip_code in enumerate(zips)
+        )
+        return f'<root>{records}</root>'
+
+    def test_cache_init(self):
+        validation_cache = ValidationCache()
+        self.assertEqual(repr(validation_cache), 'ValidationCache(maxsize=1024)')
+        self.assertEqual(len(validation_cache), 0)
+
+        with self.assertRaises(XMLSchemaTypeError):
+            ValidationCache(maxsize='10')
+        with self.assertRaises(XMLSchemaValueError):
+            ValidationCache(maxsize=0)
+        with self.assertRaises(XMLSchemaTypeError):
+            self.schema.validate(self.get_xml_data(), validation_cache={})
+
+        validation_cache = pickle.loads(pickle.dumps(ValidationCache(10)))
+        self.assertEqual(validation_cache.maxsize, 10)
+        self.assertTrue(validation_cache.lock.acquire(blocking=False))
+
+    def test_cacheable_declarations(self):
+        validation_cache = ValidationCache()
+        root = self.schema.elements['root']
+        record = root.type.content[0]
+        address, note, item, extra = record.type.content
+
+        self.assertFalse(validation_cache.is_cacheable(root))  # has an identity
+        self.assertFalse(validation_cache.is_cacheable(record))  # contains item
+        self.assertFalse(validation_cache.is_cacheable(note))  # has an IDREF attribute
+        self.assertFalse(validation_cache.is_cacheable(item))  # selected by an identity
+        self.assertFalse(validation_cache.is_cacheable(extra))  # not skipped wildcard
+        self.assertTrue(validation_cache.is_cacheable(address))
+        self.assertTrue(validation_cache.is_cacheable(address.type.content[1]))
+
+    def test_validation_with_cache(self):
+        validation_cache = ValidationCache()
+        xml_data = self.get_xml_data(*['00100'] * 5, '00200', '00100')
+        self.assertTrue(self.schema.is_valid(xml_data, validation_cache=validation_cache))
+
+        # Two distinct addresses with their zip codes and a single city
+        self.assertEqual(len(validation_cache), 5)
+        self.assertEqual(validation_cache.hits, 6)
+        self.assertEqual(validation_cache.misses, 5)
+
+        self.assertTrue(self.schema.is_valid(xml_data, validation_cache=validation_cache))
+        self.assertEqual(validation_cache.hits, 13)
+        self.assertEqual(validation_cache.misses, 5)
+
+        # Invalid subtrees are not cached
+        xml_data = self.get_xml_data('0010', '00100', '0010')
+        errors = list(self.schema.iter_errors(xml_data, validation_cache=validation_cache))
+        self.assertEqual(len(errors), 2)
+        self.assertEqual([e.path for e in errors], ['/root/record[1]/address/zip',
+                                                    '/root/record[3]/address/zip'])
+
+        # The IDREF attribute makes the note subtrees not cacheable
+        validation_cache.clear()
+        self.assertEqual(len(validation_cache), 0)
+        self.assertEqual(validation_cache.hits, 0)
+        xml_data = self.get_xml_data('00100', '00100', note='<note ref="unknown"/>')
+        errors = list(self.schema.iter_errors(xml_data, validation_cache=validation_cache))
+        self.assertEqual([e.reason for e in errors],
+                         [e.reason for e in self.schema.iter_errors(xml_data)])
+        self.assertEqual(validation_cache.hits, 1)
+
+        # Not used with options that change the validation
+        validation_cache.clear()
+        xml_data = self.get_xml_data('00100', '00100')
+        self.assertTrue(self.schema.is_valid(xml_data, max_depth=5,
+                                             validation_cache=validation_cache))
+        self.assertEqual(len(validation_cache), 0)
+
+    def test_lru_eviction(self):
+        validation_cache = ValidationCache(maxsize=2)
+        xml_data = self.get_xml_data('00100', '00200', '00300', '00100')
+        self.assertTrue(self.schema.is_valid(xml_data, validation_cache=validation_cache))
+        self.assertEqual(len(validation_cache), 2)
+        self.assertEqual(validation_cache.hits, 0)
+
+    def test_fingerprints(self):
+        validation_cache = ValidationCache()
+        resource = XMLResource(
+            '<root xmlns:tns="http://example.com/ns"><a x="1">A<!-- c --></a>'
+            '<a x="1">A<!-- c --></a><a x="2">A</a><b xmlns="http://example.com/ns"/>'
+            '<c xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:type="t"/></root>'
+        )
+        fingerprints = [validation_cache.get_fingerprint(e, resource) for e in resource.root]
+        self.assertEqual(fingerprints[0], fingerprints[1])
+        self.assertEqual(hash(fingerprints[0]), hash(fingerprints[1]))
+        self.assertNotEqual(fingerprints[0], fingerprints[2])
+        self.assertIsNotNone(fingerprints[3])
+        self.assertIsNone(fingerprints[4])
+        self.assertIsNone(validation_cache.get_fingerprint(resource.root, resource))
+
+
+class TestValidationCache11(TestValidationCache):
+
+    schema_class = XMLSchema11
+
+    def test_assertions(self):
+        schema = self.schema_class("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="a" type="aType" maxOccurs="unbounded"/>
+                    <xs:element name="b" maxOccurs="unbounded">
+                      <xs:simpleType>
+                        <xs:restriction base="xs:int">
+                          <xs:assertion test="$value mod 2 = 0"/>
+                        </xs:restriction>
+                      </xs:simpleType>
+                    </xs:element>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+              <xs:complexType name="aType">
+                <xs:attribute name="min" type="xs:int"/>
+                <xs:attribute name="max" type="xs:int"/>
+                <xs:assert test="@min le @max"/>
+              </xs:complexType>
+            </xs:schema>""")
+
+        validation_cache = ValidationCache()
+        xsd_elements = schema.elements['root'].type.content
+        self.assertFalse(validation_cache.is_cacheable(xsd_elements[0]))
+        self.assertFalse(validation_cache.is_cacheable(xsd_elements[1]))
+
+        xml_data = '<root><a min="1" max="2"/><a min="1" max="2"/><b>2</b><b>2</b></root>'
+        self.assertTrue(schema.is_valid(xml_data, validation_cache=validation_cache))
+        self.assertEqual(len(validation_cache), 0)
+
+
+if __name__ == '__main__':
+    from xmlschema.testing import run_xmlschema_tests
+    run_xmlschema_tests('schema caching')
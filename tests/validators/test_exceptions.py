@@ -221,6 +221,46 @@ class TestValidatorExceptions(unittest.TestCase):
         self.assertEqual(ctx.exception.source, resource)
         self.assertEqual(ctx.exception.path, '/root')
 
+    def test_deferred_formatting(self):
+        schema = XMLSchema("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="a" type="xs:int" maxOccurs="unbounded"/>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+            </xs:schema>""")
+
+        resource = XMLResource('<root><a>1</a><a>x</a><b/></root>')
+        errors = list(schema.iter_errors(resource))
+        self.assertEqual(len(errors), 2)
+
+        # Message, path and children reason are built only when accessed
+        for error in errors:
+            self.assertIsNone(error._path)
+            self.assertIsNone(error._message)
+        self.assertIsNone(errors[1]._reason)
+
+        self.assertEqual(errors[0].message, "failed validating 'x' with "
+                                            "XsdAtomicBuiltin(name='xs:int')")
+        self.assertIs(errors[0].message, errors[0]._message)
+        self.assertEqual(errors[0].path, '/root/a[2]')
+        self.assertEqual(errors[1].reason, "Unexpected child with tag 'b' at position 3.")
+        self.assertEqual(errors[1].path, '/root')
+
+        error = errors[1]
+        error.message = 'custom message'
+        error.reason = 'custom reason'
+        self.assertTrue(str(error).startswith('custom message:\n\nReason: custom reason\n'))
+
+        # The paths of the errors of a lazy resource are computed immediately
+        resource = XMLResource(io.StringIO('<root><a>1</a><a>x</a></root>'), lazy=True)
+        error = next(schema.iter_errors(resource))
+        self.assertEqual(error._path, '/root/a[2]')
+        self.assertIsNone(error.elem)
+
     @unittest.skipIf(lxml_etree is None, 'lxml is not installed ...')
     def test_sourceline_property(self):
         schema = XMLSchema("""
@@ -1002,6 +1002,59 @@ class TestXsdFacets(unittest.TestCase):
         facet.append(ElementTree.Element(XSD_ENUMERATION, value='NaN'))
         self.assertIsNone(facet(float('nan')))
 
+    def test_enumeration_facet_with_mixed_value_types(self):
+        schema = self.schema_class(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+                <xs:simpleType name="enum1">
+                    <xs:restriction base="xs:decimal">
+                        <xs:enumeration value="1.0"/>
+                        <xs:enumeration value="2.5"/>
+                    </xs:restriction>
+                </xs:simpleType>
+                <xs:simpleType name="enum2">
+                    <xs:restriction base="xs:date">
+                        <xs:enumeration value="2024-01-01"/>
+                    </xs:restriction>
+                </xs:simpleType>
+                <xs:simpleType name="enum3">
+                    <xs:restriction>
+                        <xs:simpleType>
+                            <xs:list itemType="xs:int"/>
+                        </xs:simpleType>
+                        <xs:enumeration value="1 2"/>
+                    </xs:restriction>
+                </xs:simpleType>
+            </xs:schema>"""))
+
+        facet = schema.types['enum1'].get_facet(XSD_ENUMERATION)
+        self.assertIsNone(facet(decimal.Decimal('1')))
+        self.assertIsNone(facet(decimal.Decimal('2.50')))
+        self.assertIsNone(facet(1))
+        self.assertIsNone(facet(2.5))
+        self.assertRaises(XMLSchemaValidationError, facet, decimal.Decimal('NaN'))
+        self.assertRaises(XMLSchemaValidationError, facet, '1.0')
+        self.assertRaises(XMLSchemaValidationError, facet, [1])
+
+        self.assertTrue(schema.types['enum2'].is_valid('2024-01-01'))
+        self.assertFalse(schema.types['enum2'].is_valid('2024-01-02'))
+
+        self.assertTrue(schema.types['enum3'].is_valid('1 2'))
+        self.assertFalse(schema.types['enum3'].is_valid('2 1'))
+
+        codes = ''.join(f'<xs:enumeration value="C{k:04}"/>' for k in range(2000))
+        schema = self.schema_class(dedent(f"""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+                <xs:simpleType name="codes">
+                    <xs:restriction base="xs:token">{codes}</xs:restriction>
+                </xs:simpleType>
+            </xs:schema>"""))
+
+        facet = schema.types['codes'].get_facet(XSD_ENUMERATION)
+        self.assertEqual(len(facet.enumeration), 2000)
+        self.assertEqual(facet.enumeration[:2], ['C0000', 'C0001'])
+        self.assertIsNone(facet('C1999'))
+        self.assertRaises(XMLSchemaValidationError, facet, 'C2000')
+
     def test_enumeration_facet_derivation(self):
         with self.assertRaises(XMLSchemaParseError) as ec:
             self.schema_class(dedent("""\
@@ -1050,10 +1103,14 @@ class TestXsdFacets(unittest.TestCase):
         facet.append(ElementTree.Element(XSD_PATTERN, value=r'\s+'))
         self.assertEqual(len(facet), 2)
         self.assertEqual(facet.patterns[1].pattern, r'^(?:\s+)$(?!\n\Z)')
+        self.assertIsNone(facet('  '))
         facet[1] = (ElementTree.Element(XSD_PATTERN, value=r'\S+'))
         self.assertEqual(facet.patterns[1].pattern, r'^(?:\S+)$(?!\n\Z)')
+        self.assertRaises(XMLSchemaValidationError, facet, '  ')
+        self.assertIsNone(facet('a;'))
         del facet[1]
         self.assertEqual(len(facet), 1)
+        self.assertRaises(XMLSchemaValidationError, facet, 'a;')
 
         schema = self.schema_class(dedent("""\
                 <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
@@ -1073,6 +1130,39 @@ class TestXsdFacets(unittest.TestCase):
         self.assertIn("missing required attribute 'value'", str(schema.all_errors[0]))
         self.assertIn("unexpected meta character ']' at position 0", str(schema.all_errors[1]))
 
+    def test_multiple_pattern_facets(self):
+        schema = self.schema_class(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+                <xs:simpleType name="pattern1">
+                    <xs:restriction base="xs:string">
+                        <xs:pattern value="[A-Z]{3}"/>
+                        <xs:pattern value="\\d+|x"/>
+                    </xs:restriction>
+                </xs:simpleType>
+                <xs:simpleType name="pattern2">
+                    <xs:restriction base="pattern1">
+                        <xs:pattern value="\\d+|x"/>
+                    </xs:restriction>
+                </xs:simpleType>
+            </xs:schema>"""))
+
+        facet = schema.types['pattern1'].get_facet(XSD_PATTERN)
+        self.assertIsInstance(facet, XsdPatternFacets)
+        for value in ('ABC', '123', 'x'):
+            self.assertIsNone(facet(value))
+        for value in ('AB', 'ABC1', '12x', 'xx', 'ABC\n'):
+            self.assertRaises(XMLSchemaValidationError, facet, value)
+
+        # Identical patterns share the same compiled regular expression
+        other = schema.types['pattern2'].get_facet(XSD_PATTERN)
+        self.assertIsInstance(other, XsdPatternFacets)
+        self.assertIs(other.patterns[0], facet.patterns[1])
+        self.assertIsNone(other('123'))
+        self.assertRaises(XMLSchemaValidationError, other, 'ABC')
+
+        self.assertTrue(schema.types['pattern2'].is_valid('x'))
+        self.assertFalse(schema.types['pattern2'].is_valid('ABC'))
+
     def test_get_annotation__issue_255(self):
         schema = self.schema_class(dedent("""\
             <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
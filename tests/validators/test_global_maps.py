@@ -9,10 +9,17 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 import unittest
+import os
+import pathlib
+import shutil
+import tempfile
 
-from xmlschema import XMLSchema10, XMLSchema11
+from xmlschema import XMLSchema10, XMLSchema11, XMLSchemaParseError
+from xmlschema.exceptions import XMLSchemaValueError
 from xmlschema.names import XSD_ELEMENT, XSD_STRING, XSD_SIMPLE_TYPE
 
+CASES_DIR = pathlib.Path(__file__).parent.joinpath('../test_cases').resolve()
+
 
 class TestXsdGlobalsMaps(unittest.TestCase):
 
@@ -128,6 +135,86 @@ class TestXsdGlobalsMaps(unittest.TestCase):
         )
 
 
+class TestXsdGlobalsReload(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        shutil.copytree(str(CASES_DIR.joinpath('examples/vehicles')), self.tmp_dir,
+                        dirs_exist_ok=True)
+        self.schema = XMLSchema10(os.path.join(self.tmp_dir, 'vehicles.xsd'))
+        self.xml_file = os.path.join(self.tmp_dir, 'vehicles.xml')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def replace_text(self, filename, old, new):
+        path = pathlib.Path(self.tmp_dir).joinpath(filename)
+        path.write_text(path.read_text().replace(old, new))
+        return str(path)
+
+    def test_reload_rebuilds_dependents(self):
+        schema = self.schema
+        cars, bikes, step = (schema.elements['cars'], schema.elements['bikes'],
+                             schema.attributes['step'])
+        self.assertTrue(schema.is_valid(self.xml_file))
+
+        filepath = self.replace_text(
+            'types.xsd', 'name="model" type="xs:string"', 'name="model" type="xs:int"'
+        )
+        self.assertIs(schema.maps.reload_schema(filepath), schema.includes['cars.xsd']
+                      .includes['types.xsd'])
+        self.assertTrue(schema.maps.built)
+
+        self.assertIsNot(schema.elements['cars'], cars)
+        self.assertIsNot(schema.elements['bikes'], bikes)
+        self.assertIs(schema.attributes['step'], step)
+        self.assertFalse(schema.is_valid(self.xml_file))
+
+    def test_reload_skips_independent_components(self):
+        schema = self.schema
+        cars = schema.elements['cars']
+        vehicle_type = schema.types['vehicleType']
+
+        bikes_schema = schema.includes['bikes.xsd']
+        self.replace_text('bikes.xsd', 'minOccurs="0"', 'minOccurs="3"')
+        schema.maps.reload_schema(bikes_schema)
+
+        self.assertIs(schema.elements['cars'], cars)
+        self.assertIs(schema.types['vehicleType'], vehicle_type)
+        self.assertIs(schema.elements['vehicles'].type.content[1].ref,
+                      schema.elements['bikes'])
+        self.assertFalse(schema.is_valid(self.xml_file))
+
+    def test_reload_with_new_globals(self):
+        schema = self.schema
+        filepath = self.replace_text('bikes.xsd', '</xs:schema>', """
+          <xs:simpleType name="wheelsType">
+            <xs:restriction base="xs:positiveInteger"/>
+          </xs:simpleType>
+        </xs:schema>""")
+
+        schema.maps.reload_schema(filepath)
+        self.assertIn('{http://example.com/vehicles}wheelsType', schema.maps.types)
+        self.assertTrue(schema.is_valid(self.xml_file))
+
+        filepath = self.replace_text('types.xsd', 'name="vehicleType"', 'name="vehicleType2"')
+        with self.assertRaises(XMLSchemaParseError):
+            schema.maps.reload_schema(filepath)
+        self.assertFalse(schema.maps.built)
+
+        # After a failed reload the global maps are fully rebuilt
+        filepath = self.replace_text('types.xsd', 'name="vehicleType2"', 'name="vehicleType"')
+        schema.maps.reload_schema(filepath)
+        self.assertTrue(schema.maps.built)
+        self.assertTrue(schema.is_valid(self.xml_file))
+
+    def test_reload_errors(self):
+        with self.assertRaises(XMLSchemaValueError):
+            self.schema.maps.reload_schema(os.path.join(self.tmp_dir, 'vehicles-max.xsd'))
+        with self.assertRaises(XMLSchemaValueError):
+            self.schema.maps.reload_schema(XMLSchema10.meta_schema)
+
+
 if __name__ == '__main__':
     import platform
     header_template = "Test xmlschema's global maps with Python {} on {}"
@@ -390,6 +390,83 @@ class TestXsdGroups(unittest.TestCase):
             '<root><elem1>a</elem1><elem3>c</elem3><elem2>b</elem2></root>'
         ))
 
+    def test_match_element(self):
+        schema = XMLSchema(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+                targetNamespace="http://xmlschema.test/ns" xmlns:tns="http://xmlschema.test/ns">
+                <xs:element name="root">
+                    <xs:complexType>
+                        <xs:choice maxOccurs="unbounded">
+                            <xs:element name="a" type="xs:string"/>
+                            <xs:element ref="tns:head"/>
+                            <xs:any namespace="##other" processContents="skip"/>
+                            <xs:sequence>
+                              <xs:element name="b" type="xs:string"/>
+                              <xs:element name="a" type="xs:string"/>
+                            </xs:sequence>
+                            <xs:element ref="tns:member"/>
+                            <xs:any namespace="##targetNamespace" processContents="skip"/>
+                        </xs:choice>
+                    </xs:complexType>
+                </xs:element>
+                <xs:element name="head" type="xs:string"/>
+                <xs:element name="member" type="xs:string" substitutionGroup="tns:head"/>
+            </xs:schema>"""), validation='lax')  # the model violates UPA
+
+        group = schema.elements['root'].type.content
+        self.assertIsInstance(group, XsdGroup)
+        self.assertIs(group.match_element('a'), group[0])
+        self.assertIs(group.match_element('{http://xmlschema.test/ns}head'), group[1])
+        self.assertIs(group.match_element('{http://xmlschema.test/ns}member'), group[1])
+        self.assertIs(group.match_element('{http://xmlschema.test/other}a'), group[2])
+        self.assertIs(group.match_element('b'), group[3][0])
+        self.assertIs(group.match_element('{http://xmlschema.test/ns}b'), group[5])
+        self.assertIs(group.match_element('{http://xmlschema.test/ns}a'), group[5])
+        self.assertIsNone(group.match_element('c'))
+
+        for name in ('a', 'b', 'c', '{http://xmlschema.test/ns}member',
+                     '{http://xmlschema.test/ns}b', '{http://xmlschema.test/other}a'):
+            self.assertIs(
+                group.match_element(name),
+                next((e for e in group.iter_elements() if e.is_matching(name, group=group)),
+                     None)
+            )
+
+    def test_match_element_after_rebuild(self):
+        schema = XMLSchema(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+                <xs:element name="root">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element ref="a" minOccurs="0"/>
+                            <xs:element ref="b" minOccurs="0"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+                <xs:element name="a" type="xs:string"/>
+                <xs:element name="b" type="xs:string"/>
+            </xs:schema>"""))
+
+        member_source = dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+                <xs:element name="m" type="xs:string" substitutionGroup="{}"/>
+            </xs:schema>""")
+        other_schema = schema.add_schema(member_source.format('a'), build=True)
+
+        group = schema.elements['root'].type.content
+        self.assertIsInstance(group, XsdGroup)
+        self.assertIs(group.match_element('m'), group[0])
+        self.assertEqual(len(schema.maps.substitution_groups), 1)
+
+        # The member is moved to another head, with the same number of groups
+        schema.maps.reload_schema(other_schema, member_source.format('b'))
+        self.assertEqual(len(schema.maps.substitution_groups), 1)
+        self.assertIs(schema.elements['root'].type.content, group)
+        self.assertIs(group.match_element('m'), group[1])
+
+        schema.maps.clear()
+        self.assertIsNone(group._match_index)
+
 
 if __name__ == '__main__':
     import platform
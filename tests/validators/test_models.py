@@ -13,13 +13,14 @@ import unittest
 import os.path
 from textwrap import dedent
 from typing import Any, Union, List, Optional
+from xml.etree import ElementTree
 
 from xmlschema import XMLSchema10, XMLSchema11
 from xmlschema.exceptions import XMLSchemaValueError
 from xmlschema.validators.exceptions import XMLSchemaValidationError
 from xmlschema.validators.particles import ParticleMixin
 from xmlschema.validators.models import distinguishable_paths, ModelVisitor, \
-    sort_content, iter_collapsed_content
+    ModelAutomaton, sort_content, iter_collapsed_content
 from xmlschema.validators.groups import XsdGroup
 from xmlschema.validators.elements import XsdElement
 from xmlschema.testing import XsdValidatorTestCase
@@ -1198,6 +1199,126 @@ class TestModelBasedSorting(XsdValidatorTestCase):
         self.assertListEqual(list(iter_collapsed_content(content, group)), content)
 
 
+class TestModelAutomaton(XsdValidatorTestCase):
+
+    schema_class = XMLSchema10
+
+    def test_compiled_models(self):
+        schema = self.get_schema("""
+            <xs:element name="A" type="A_type" />
+            <xs:complexType name="A_type">
+                <xs:sequence>
+                    <xs:element name="B1" type="xs:string"/>
+                    <xs:element name="B2" type="xs:integer" minOccurs="0"/>
+                    <xs:choice maxOccurs="2">
+                        <xs:element name="B3" type="xs:boolean"/>
+                        <xs:element name="B4" type="xs:boolean"/>
+                    </xs:choice>
+                </xs:sequence>
+            </xs:complexType>
+            <xs:complexType name="C_type">
+                <xs:all>
+                    <xs:element name="C1" type="xs:string"/>
+                    <xs:element name="C2" type="xs:string"/>
+                </xs:all>
+            </xs:complexType>
+            <xs:complexType name="D_type">
+                <xs:sequence>
+                    <xs:element name="D1" type="xs:string" maxOccurs="1000"/>
+                </xs:sequence>
+            </xs:complexType>
+            """)
+
+        group = schema.types['A_type'].content
+        self.assertIsInstance(group.automaton, ModelAutomaton)
+        self.assertEqual(len(group.automaton.transitions), 7)
+        self.assertIsNone(schema.types['C_type'].content.automaton)
+        self.assertIsNone(schema.types['D_type'].content.automaton)
+
+        automaton = group.automaton
+        self.assertEqual(automaton.match(0, 'B1'), (group[0], group[0], 1))
+        self.assertIsNone(automaton.match(0, 'B2'))
+        self.assertFalse(automaton.final[0])
+
+        elem = ElementTree.XML('<A><B1/><B3/><B4/></A>')
+        self.assertListEqual(automaton.match_content(elem),
+                             [(group[0], group[0]), (group[2][0], group[2][0]),
+                              (group[2][1], group[2][1])])
+        self.assertIsNone(automaton.match_content(ElementTree.XML('<A><B1/><B2/></A>')))
+        self.assertIsNone(automaton.match_content(ElementTree.XML('<A><B3/></A>')))
+        self.assertIsNone(automaton.match_content(
+            ElementTree.XML('<A><B1/><B3/><B3/><B3/></A>')
+        ))
+
+    def test_validation_with_compiled_models(self):
+        schema = self.get_schema("""
+            <xs:element name="A">
+                <xs:complexType>
+                    <xs:sequence>
+                        <xs:element name="B1" type="xs:string" maxOccurs="unbounded"/>
+                        <xs:element ref="head" minOccurs="0"/>
+                        <xs:any namespace="##other" processContents="skip" minOccurs="0"/>
+                    </xs:sequence>
+                </xs:complexType>
+            </xs:element>
+            <xs:element name="head" type="xs:string"/>
+            <xs:element name="member" type="xs:string" substitutionGroup="head"/>
+            """)
+
+        if self.schema_class.XSD_VERSION == '1.0':
+            self.assertIsNotNone(schema.elements['A'].type.content.automaton)
+        else:
+            self.assertIsNone(schema.elements['A'].type.content.automaton)  # XSD 1.1 wildcard
+        self.assertTrue(schema.is_valid('<A><B1/><B1/><member/></A>'))
+        self.assertTrue(schema.is_valid('<A><B1/><head/><foo xmlns="tns"/></A>'))
+        self.assertFalse(schema.is_valid('<A><head/></A>'))
+        self.assertFalse(schema.is_valid('<A><B1/><foo/></A>'))
+
+        # Rejected contents are validated by the model visitor for reporting errors
+        errors = list(schema.iter_errors('<A><B1/><head/><B1/></A>'))
+        self.assertEqual(len(errors), 1)
+        self.assertIn("Unexpected child with tag 'B1' at position 3", str(errors[0]))
+
+    def test_models_not_compiled(self):
+        # The model visitor doesn't accept all the sequences of these
+        # models, so the validity can't depend on the automaton.
+        xsd_template = """
+            <xs:element name="r">
+                <xs:complexType>
+                    <xs:sequence>
+                        <xs:element name="elem1" minOccurs="0"/>
+                        <xs:choice maxOccurs="5">
+                            <xs:element name="elem2" maxOccurs="2"/>
+                            <xs:element name="elem3" maxOccurs="2"/>
+                        </xs:choice>{}
+                    </xs:sequence>
+                </xs:complexType>
+            </xs:element>"""
+        xml_data = '<r><elem2/><elem2/><elem2/><elem3/><elem2/><elem3/></r>'
+
+        for extra in ('', '<xs:element name="z" minOccurs="0" maxOccurs="200"/>'):
+            schema = self.get_schema(xsd_template.format(extra))
+            self.assertIsNone(schema.elements['r'].type.content.automaton)
+            self.assertFalse(schema.is_valid(xml_data))
+            self.assertTrue(schema.is_valid('<r><elem1/><elem2/><elem3/><elem3/></r>'))
+
+        schema = self.get_schema("""
+            <xs:element name="r">
+                <xs:complexType>
+                    <xs:choice minOccurs="2" maxOccurs="3">
+                        <xs:element name="c" minOccurs="0"/>
+                    </xs:choice>
+                </xs:complexType>
+            </xs:element>""")
+        self.assertIsNone(schema.elements['r'].type.content.automaton)
+        self.assertFalse(schema.is_valid('<r><c/></r>'))
+
+
+class TestModelAutomaton11(TestModelAutomaton):
+
+    schema_class = XMLSchema11
+
+
 class TestModelPaths(unittest.TestCase):
 
     def test_distinguishable_paths_one_level(self):
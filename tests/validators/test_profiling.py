@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+#
+# Copyright (c), 2016-2024, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+import unittest
+
+from xmlschema import XMLSchema10, XMLSchema11, ValidationProfiler, \
+    XMLSchemaValidationError
+from xmlschema.exceptions import XMLSchemaValueError
+from xmlschema.validators import XsdElement, XsdGroup, XsdAttributeGroup, \
+    XsdAtomicRestriction, XsdAtomicBuiltin, XsdList, XsdUnion
+
+
+class TestValidationProfiler(unittest.TestCase):
+
+    schema_class = XMLSchema10
+
+    @classmethod
+    def setUpClass(cls):
+        cls.schema = cls.schema_class("""
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="item" maxOccurs="unbounded">
+                      <xs:complexType>
+                        <xs:sequence>
+                          <xs:element name="code" type="codeType"/>
+                          <xs:element name="values" type="valuesType"/>
+                          <xs:element name="size" type="sizeType"/>
+                        </xs:sequence>
+                        <xs:attribute name="n" type="xs:int"/>
+                      </xs:complexType>
+                    </xs:element>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+              <xs:simpleType name="codeType">
+                <xs:restriction base="xs:string">
+                  <xs:pattern value="[A-Z]{3}"/>
+                </xs:restriction>
+              </xs:simpleType>
+              <xs:simpleType name="valuesType">
+                <xs:list itemType="xs:int"/>
+              </xs:simpleType>
+              <xs:simpleType name="sizeType">
+                <xs:union memberTypes="xs:int xs:token"/>
+              </xs:simpleType>
+            </xs:schema>""")
+
+    @staticmethod
+    def get_xml_data(*codes):
+        items = ''.join(f'<item n="{k}"><code>{code}</code><values>1 2</values>'
+                        f'<size>L</size></item>' for k, code in enumerate(codes))
+        return f'<root>{items}</root>'
+
+    def test_profiler_init(self):
+        profiler = ValidationProfiler()
+        self.assertEqual(repr(profiler), 'ValidationProfiler(callback=None)')
+        self.assertEqual(profiler.stats, {})
+        self.assertEqual(profiler.get_stats(), [])
+
+        with self.assertRaises(XMLSchemaValueError):
+            profiler.get_stats(sort_key='name')
+
+    def test_validation_profiling(self):
+        profiler = ValidationProfiler()
+        xml_data = self.get_xml_data('ABC', 'abc', 'DEF', '123')
+        errors = list(self.schema.iter_errors(xml_data, profiler=profiler))
+        self.assertEqual(len(errors), 2)
+        self.assertListEqual([e.path for e in errors],
+                             [e.path for e in self.schema.iter_errors(xml_data)])
+
+        stats = {x.name: x for x in profiler.get_stats()}
+        self.assertEqual(stats['root'].calls, 1)
+        self.assertEqual(stats['item'].calls, 4)
+        self.assertEqual(stats['codeType'].calls, 4)
+        self.assertEqual(stats['valuesType'].calls, 4)
+        self.assertEqual(stats['sizeType'].calls, 4)
+        self.assertEqual(stats['xs:int'].calls, 16)  # 4 attributes + 8 list items + 4 union
+
+        self.assertIsInstance(stats['root'].component, XsdElement)
+        item = self.schema.elements['root'].type.content[0]
+        group_name = 'item/%s' % item.type.content.__class__.__name__
+        self.assertIsInstance(stats[group_name].component, XsdGroup)
+        self.assertIs(stats[group_name].component, item.type.content)
+        self.assertIsInstance(stats['item/XsdAttributeGroup'].component, XsdAttributeGroup)
+        self.assertIsInstance(stats['codeType'].component, XsdAtomicRestriction)
+        self.assertIsInstance(stats['valuesType'].component, XsdList)
+        self.assertIsInstance(stats['sizeType'].component, XsdUnion)
+        self.assertIsInstance(stats['xs:token'].component, XsdAtomicBuiltin)
+
+        # Errors are counted only by the components that generate them, also
+        # if discarded by a parent, like the errors of the members of a union.
+        self.assertEqual(stats['codeType'].errors, 2)
+        self.assertEqual(stats['xs:int'].errors, 4)  # the union tries xs:int before xs:token
+        self.assertEqual(sum(x.errors for x in stats.values()), 6)
+
+        for item in stats.values():
+            self.assertGreaterEqual(item.time, item.own_time)
+            self.assertGreaterEqual(item.own_time, 0.0)
+
+        self.assertGreaterEqual(
+            stats['root'].time, sum(x.own_time for x in stats.values()) * 0.99
+        )
+        self.assertEqual(stats['root'].as_dict()['url'], self.schema.url)
+
+        report = profiler.report(sort_key='calls', limit=3)
+        self.assertEqual(len(report.splitlines()), 4)
+        self.assertIn('xs:int (XsdAtomicBuiltin, ', report.splitlines()[1])
+
+        profiler.clear()
+        self.assertEqual(profiler.stats, {})
+
+    def test_strict_and_decoding_profiling(self):
+        profiler = ValidationProfiler()
+        with self.assertRaises(XMLSchemaValidationError):
+            self.schema.validate(self.get_xml_data('ABC', 'abc'), profiler=profiler)
+
+        stats = {x.name: x for x in profiler.get_stats()}
+        self.assertEqual(stats['item'].calls, 2)
+        self.assertEqual(stats['codeType'].errors, 1)
+        self.assertEqual(stats['xs:int'].errors, 1)
+        self.assertEqual(sum(x.errors for x in stats.values()), 2)
+
+        profiler = ValidationProfiler()
+        data = self.schema.decode(self.get_xml_data('ABC'), profiler=profiler)
+        self.assertEqual(data, {'item': [{'@n': 0, 'code': 'ABC',
+                                          'values': [1, 2], 'size': 'L'}]})
+        self.assertEqual({x.name: x for x in profiler.get_stats()}['item'].calls, 1)
+
+    def test_profiler_callback(self):
+        calls = []
+        profiler = ValidationProfiler(
+            callback=lambda *args: calls.append(args)
+        )
+        self.assertFalse(self.schema.is_valid(self.get_xml_data('ABC', 'abc', 'DEF'),
+                                              profiler=profiler))
+
+        # The validation stops at the second item, the interrupted calls are reported too
+        components = [x[0] for x in calls]
+        self.assertEqual(len([x for x in components if x.name == 'item']), 2)
+        self.assertEqual([x[2] for x in calls if x[2] and x[0].name == 'codeType'], [1])
+        self.assertTrue(all(x[1] >= 0.0 for x in calls))
+
+
+class TestValidationProfiler11(TestValidationProfiler):
+
+    schema_class = XMLSchema11
+
+
+if __name__ == '__main__':
+    from xmlschema.testing import run_xmlschema_tests
+    run_xmlschema_tests('validation profiler')
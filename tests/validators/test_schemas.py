@@ -9,7 +9,9 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 import unittest
+import unittest.mock
 import filecmp
+import io
 import logging
 import tempfile
 import warnings
@@ -24,11 +26,13 @@ from xml.etree.ElementTree import Element
 
 import xmlschema
 from xmlschema import XMLSchemaParseError, XMLSchemaIncludeWarning, XMLSchemaImportWarning
-from xmlschema.names import XML_NAMESPACE, LOCATION_HINTS, SCHEMAS_DIR, XSD_ELEMENT, XSI_TYPE
+from xmlschema.names import XML_NAMESPACE, LOCATION_HINTS, SCHEMAS_DIR, XSD_ELEMENT, \
+    XSD_ENUMERATION, XSI_TYPE
 from xmlschema.validators import XMLSchemaBase, XMLSchema10, XMLSchema11, \
     XsdGlobals, XsdComponent
 from xmlschema.testing import SKIP_REMOTE_TESTS, XsdValidatorTestCase
 from xmlschema.validators.schemas import logger
+from xmlschema.validators.parallel import FragmentsValidator
 
 
 class CustomXMLSchema(XMLSchema10):
@@ -317,6 +321,108 @@ class TestXMLSchema10(XsdValidatorTestCase):
         self.assertEqual(set(schema.root_elements),
                          {schema.elements['root1'], schema.elements['root2']})
 
+    def test_get_element_chain(self):
+        schema = self.schema_class(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="a" type="aType"/>
+                    <xs:element ref="b"/>
+                    <xs:element name="a2" type="aType"/>
+                    <xs:any namespace="##other" processContents="lax" minOccurs="0"/>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+              <xs:element name="b" type="aType"/>
+              <xs:element name="c" substitutionGroup="b" type="aType"/>
+              <xs:complexType name="aType">
+                <xs:sequence>
+                  <xs:element name="leaf" minOccurs="0"/>
+                </xs:sequence>
+              </xs:complexType>
+            </xs:schema>"""))
+
+        root = schema.elements['root']
+        self.assertIsNone(schema._element_chains)
+        self.assertListEqual(schema.get_element_chain(['root']), [root])
+        self.assertListEqual(schema.get_element_chain(['root', 'a', 'leaf']),
+                             [root, root.type.content[0], root.type.content[0].type.content[0]])
+        self.assertListEqual(schema.get_element_chain(['root', 'b']),
+                             [root, root.type.content[1]])
+        self.assertListEqual(schema.get_element_chain(['root', 'c']),
+                             [root, schema.elements['c']])
+        self.assertListEqual(schema.get_element_chain(['root', 'unknown', 'leaf']), [])
+        self.assertListEqual(schema.get_element_chain(['unknown']), [])
+
+        # Wildcards and ambiguous matches are resolved with XPath
+        for tags in (['root', '{tns}x'], ['root', '{tns}x', 'y'], ['c']):
+            path = f"{'/'.join(tags)}/ancestor-or-self::node()"
+            self.assertListEqual(schema.get_element_chain(tags), schema.findall(path)[1:])
+
+        self.assertIs(schema.get_element_chain(['root', 'c']),
+                      schema.get_element_chain(('root', 'c')))
+        self.assertEqual(len(schema._element_chains), 9)
+        self.assertEqual(len(schema.get_element_chain(['root', '{tns}x'])), 2)
+
+        self.assertIs(schema.get_element('root'), root)
+        self.assertIs(schema.get_element('a', '/root/*'), root.type.content[0])
+        self.assertIs(schema.get_element('c', '/root/*'), root.type.content[1])
+        self.assertIsNone(schema.get_element('{tns}x', '/root/*'))
+        self.assertIsNone(schema.get_element('leaf'))
+        self.assertIs(schema.get_element('leaf', '/root/a/leaf'),
+                      root.type.content[0].type.content[0])
+        self.assertEqual(len(schema._selected_elements), 6)
+
+        # Indexes are reset when the global maps are built again
+        self.assertListEqual(schema.get_element_chain(['root', 'd']), [])
+        schema.add_schema(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="d" substitutionGroup="b" type="aType"/>
+            </xs:schema>"""), build=True)
+        self.assertListEqual(schema.get_element_chain(['root', 'd']),
+                             [root, schema.maps.elements['d']])
+
+        schema.clear()
+        self.assertIsNone(schema._element_chains)
+        self.assertIsNone(schema._selected_elements)
+
+    def test_lazy_validation_with_substitutes(self):
+        schema = self.schema_class(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element ref="head" maxOccurs="unbounded"/>
+                  </xs:sequence>
+                </xs:complexType>
+              </xs:element>
+              <xs:complexType name="listType">
+                <xs:sequence>
+                  <xs:element name="item" maxOccurs="unbounded">
+                    <xs:complexType>
+                      <xs:attribute name="code" type="xs:string"/>
+                    </xs:complexType>
+                  </xs:element>
+                </xs:sequence>
+              </xs:complexType>
+              <xs:element name="head" type="listType"/>
+              <xs:element name="member" type="listType" substitutionGroup="head">
+                <xs:unique name="code_unique">
+                  <xs:selector xpath="item"/><xs:field xpath="@code"/>
+                </xs:unique>
+              </xs:element>
+            </xs:schema>"""))
+
+        xml_data = '<root><member><item code="a"/><item code="a"/></member>' \
+                   '<member><item code="a"/></member></root>'
+        errors = [e.reason for e in schema.iter_errors(xml_data)]
+        self.assertEqual(len(errors), 1)
+
+        # The identity counters of the member's constraints are reset, not the head's ones
+        resource = xmlschema.XMLResource(io.StringIO(xml_data), lazy=2)
+        self.assertListEqual([e.reason for e in schema.iter_errors(resource)], errors)
+
     def test_simple_types(self):
         self.assertListEqual(self.vh_schema.simple_types, [])
         self.assertGreater(len(self.st_schema.simple_types), 20)
@@ -940,6 +1046,142 @@ class TestXMLSchema10(XsdValidatorTestCase):
             pickle.dumps(schema)
         self.assertIn("Can't pickle", str(ec.exception))
 
+    def test_validate_many(self):
+        sources = [self.vh_xml_file,
+                   self.casepath('examples/vehicles/vehicles-2_errors.xml'),
+                   self.casepath('examples/vehicles/unknown.xml'),
+                   self.casepath('examples/vehicles/vehicles2.xml')]
+
+        with self.assertRaises(ValueError):
+            list(self.vh_schema.validate_many(sources, workers=0))
+        with self.assertRaises(TypeError):
+            list(self.vh_schema.validate_many(sources, workers='2'))
+
+        for workers in (1, 2):
+            summaries = list(self.vh_schema.validate_many(sources, workers=workers))
+            self.assertListEqual([x.source for x in summaries], sources)
+            self.assertListEqual([x.valid for x in summaries], [True, False, False, True])
+            self.assertEqual(len(summaries[1].errors), 2)
+            self.assertIsNone(summaries[1].exception)
+            self.assertListEqual(summaries[2].errors, [])
+            self.assertIn('unknown.xml', summaries[2].exception)
+
+        summaries = list(self.vh_schema.validate_many(sources, workers=3, ordered=False))
+        self.assertListEqual(sorted(x.source for x in summaries), sorted(sources))
+        self.assertEqual(list(self.vh_schema.validate_many([], workers=2)), [])
+
+    def test_fragments_parallel_validation(self):
+        schema = self.schema_class(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+              <xs:element name="root">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="group" maxOccurs="unbounded">
+                      <xs:complexType>
+                        <xs:sequence>
+                          <xs:element name="item" maxOccurs="unbounded">
+                            <xs:complexType>
+                              <xs:simpleContent>
+                                <xs:extension base="xs:int">
+                                  <xs:attribute name="id" type="xs:ID"/>
+                                  <xs:attribute name="ref" type="xs:IDREF"/>
+                                  <xs:attribute name="code" type="xs:string"/>
+                                </xs:extension>
+                              </xs:simpleContent>
+                            </xs:complexType>
+                          </xs:element>
+                        </xs:sequence>
+                      </xs:complexType>
+                      <xs:unique name="code_unique">
+                        <xs:selector xpath="item"/><xs:field xpath="@code"/>
+                      </xs:unique>
+                    </xs:element>
+                  </xs:sequence>
+                </xs:complexType>
+                <xs:key name="code_key">
+                  <xs:selector xpath="group/item"/><xs:field xpath="@code"/>
+                </xs:key>
+                <xs:keyref name="code_ref" refer="code_key">
+                  <xs:selector xpath="group/item"/><xs:field xpath="@ref"/>
+                </xs:keyref>
+              </xs:element>
+            </xs:schema>"""))
+
+        chunks = ['<root>']
+        for k in range(40):
+            if not k % 4:
+                chunks.append('<group>' if not k else '</group><group>')
+            chunks.append('<item id="{}" code="{}"{}>{}</item>'.format(
+                'x1' if k in (7, 30) else f'x{k}',
+                'dup' if k in (13, 14, 33) else f'c{k}',
+                ' ref="c2"' if k == 2 else ' ref="c99"' if k == 21 else '',
+                'bad' if k in (9, 38) else k
+            ))
+        chunks.append('</group></root>')
+        xml_data = ''.join(chunks)
+
+        with self.assertRaises(ValueError):
+            schema.validate(xml_data, workers=0)
+        with self.assertRaises(TypeError):
+            schema.validate(xml_data, workers='2')
+
+        with unittest.mock.patch.object(FragmentsValidator, 'chunk_size', 6):
+            for lazy in (1, 2):
+                resource = xmlschema.XMLResource(io.StringIO(xml_data), lazy=lazy)
+                errors = sorted((e.path or '', e.reason)
+                                for e in schema.iter_errors(resource))
+                self.assertEqual(len(errors), 9)
+
+                resource = xmlschema.XMLResource(io.StringIO(xml_data), lazy=lazy)
+                parallel_errors = sorted((e.path or '', e.reason)
+                                         for e in schema.iter_errors(resource, workers=2))
+
+                # Duplicated IDs of different chunks are reported like in a sequential
+                # validation, validating again the subtree in the validation process.
+                self.assertListEqual(parallel_errors, errors)
+                self.assertEqual(sum("attribute id='x1': duplicated xs:ID value" in x[1]
+                                     for x in errors), 2)
+
+                resource = xmlschema.XMLResource(io.StringIO(xml_data), lazy=lazy)
+                self.assertListEqual(
+                    [(type(e), e.validator, e.path, e.reason, e.obj)
+                     for e in schema.iter_errors(resource, workers=2)
+                     if 'xs:ID' in e.reason],
+                    [(type(e), e.validator, e.path, e.reason, e.obj)
+                     for e in schema.iter_errors(
+                        xmlschema.XMLResource(io.StringIO(xml_data), lazy=lazy)
+                    ) if 'xs:ID' in e.reason]
+                )
+
+            # The pool of worker processes is shut down also when the validation
+            # is stopped early or the generator of errors is abandoned
+            validators = []
+
+            def fragments_validator(*args, **kwargs):
+                validators.append(FragmentsValidator(*args, **kwargs))
+                return validators[-1]
+
+            with unittest.mock.patch('xmlschema.validators.schemas.FragmentsValidator',
+                                     side_effect=fragments_validator):
+                resource = xmlschema.XMLResource(io.StringIO(xml_data), lazy=True)
+                errors = schema.iter_errors(resource, workers=2)
+                self.assertIsInstance(next(errors), xmlschema.XMLSchemaValidationError)
+                self.assertIsNotNone(validators[-1].executor)
+                errors.close()
+                self.assertIsNone(validators[-1].executor)
+
+                resource = xmlschema.XMLResource(io.StringIO(xml_data), lazy=True)
+                errors = list(schema.iter_errors(resource, workers=2, fail_fast=True))
+                self.assertEqual(len(errors), 1)
+                self.assertIsNone(validators[-1].executor)
+                self.assertTrue(validators[-1].options['fail_fast'])
+
+        # Not lazy resources are validated serially
+        self.assertFalse(schema.is_valid(xml_data, workers=2))
+        self.assertTrue(self.vh_schema.is_valid(
+            xmlschema.XMLResource(self.vh_xml_file, lazy=True), workers=2
+        ))
+
     def test_deprecated_check_schema_method(self):
 
         with warnings.catch_warnings(record=True) as ctx:
@@ -998,6 +1240,68 @@ class TestXMLSchema10(XsdValidatorTestCase):
         self.assertIn("global element with name='elem1' is already defined",
                       str(ctx.exception))
 
+    def test_warm_up(self):
+        schema = self.schema_class(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+                <xs:element name="root">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="code" type="codeType"/>
+                            <xs:element name="color" type="colorType"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+                <xs:simpleType name="codeType">
+                    <xs:restriction base="xs:string">
+                        <xs:pattern value="[A-Z]{2}"/>
+                        <xs:pattern value="[0-9]{3}"/>
+                    </xs:restriction>
+                </xs:simpleType>
+                <xs:simpleType name="colorType">
+                    <xs:restriction base="xs:string">
+                        <xs:enumeration value="red"/>
+                        <xs:enumeration value="blue"/>
+                    </xs:restriction>
+                </xs:simpleType>
+            </xs:schema>"""))
+
+        patterns = schema.types['codeType'].patterns
+        enumeration = schema.types['colorType'].get_facet(XSD_ENUMERATION)
+        group = schema.elements['root'].type.content
+        self.assertIsNone(patterns._regex)
+        self.assertIsNone(enumeration._index)
+        self.assertIsNone(group._match_index)
+        self.assertIsNone(schema._xpath_node)
+
+        self.assertIsNone(schema.warm_up())
+        self.assertIsNotNone(patterns._regex)
+        self.assertIsNotNone(enumeration._index)
+        self.assertIsNotNone(group._match_index)
+        self.assertIsNotNone(schema._xpath_node)
+        self.assertIsNotNone(schema.meta_schema._xpath_node)
+
+        xml_data = '<root><code>AB</code><color>red</color></root>'
+        self.assertTrue(schema.is_valid(xml_data))
+        xml_data = '<root><code>12</code><color>green</color></root>'
+        self.assertEqual(len(list(schema.iter_errors(xml_data))), 2)
+
+    def test_xml_parser(self):
+        with self.assertRaises(TypeError):
+            self.schema_class(self.vh_xsd_file, xml_parser=None)
+        with self.assertRaises(ValueError):
+            self.schema_class(self.vh_xsd_file, xml_parser='expat')
+
+        schema = self.schema_class(self.vh_xsd_file, xml_parser='lxml')
+        self.assertEqual(self.vh_schema.xml_parser, 'etree')
+        self.assertEqual(schema.xml_parser, 'lxml')
+        self.assertEqual(schema.source.xml_parser, 'etree')
+        self.assertTrue(all(s.xml_parser == 'lxml' for s in schema.includes.values()))
+
+        self.assertTrue(schema.is_valid(self.vh_xml_file))
+        self.assertEqual(schema.to_dict(self.vh_xml_file),
+                         self.vh_schema.to_dict(self.vh_xml_file))
+        self.assertEqual(pickle.loads(pickle.dumps(schema)).xml_parser, 'lxml')
+
     def test_use_xpath3(self):
         schema = self.schema_class(dedent("""\
             <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
@@ -1041,6 +1345,28 @@ class TestXMLSchema11(TestXMLSchema10):
                 </xs:schema>"""))
         self.assertEqual("prefix 'x' not found in namespace map", ctx.exception.message)
 
+    def test_warm_up_assertions(self):
+        schema = self.schema_class(dedent("""\
+            <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+                <xs:element name="root" type="rootType"/>
+                <xs:complexType name="rootType">
+                    <xs:attribute name="min" type="xs:int"/>
+                    <xs:attribute name="max" type="xs:int"/>
+                    <xs:assert test="@min le @max"/>
+                </xs:complexType>
+            </xs:schema>"""))
+
+        schema = pickle.loads(pickle.dumps(schema))
+        assertion = schema.types['rootType'].assertions[0]
+        self.assertFalse(assertion.parser.is_schema_bound())
+        self.assertIsNone(schema.xpath_tokens)
+
+        schema.warm_up()
+        self.assertTrue(assertion.parser.is_schema_bound())
+        self.assertIsNotNone(schema.xpath_tokens)
+        self.assertTrue(schema.is_valid('<root min="1" max="2"/>'))
+        self.assertFalse(schema.is_valid('<root min="3" max="2"/>'))
+
     def test_use_xpath3(self):
         schema = self.schema_class(dedent("""\
             <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
@@ -9,9 +9,13 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 import unittest
+import copy
+import pickle
+from collections import Counter
 
 from xmlschema import XMLSchemaParseError, XMLSchemaValidationError
-from xmlschema.names import XSD_LIST, XSD_UNION
+from xmlschema.names import XSD_LIST, XSD_UNION, XSD_STRING, XSD_INT, \
+    XSD_QNAME, XSD_ID, XSD_IDREF
 from xmlschema.validators import XMLSchema11
 from xmlschema.testing import XsdValidatorTestCase
 
@@ -174,6 +178,43 @@ class TestXsdSimpleTypes(XsdValidatorTestCase):
         self.assertTrue(schema.types['emptyType3'].is_empty())
         self.assertFalse(schema.types['notEmptyType1'].is_empty())
 
+    def test_atomic_builtin_decoding(self):
+        schema = self.schema_class.meta_schema
+        schema.build()
+        xsd_types = schema.maps.types
+
+        for name in (XSD_STRING, XSD_QNAME, XSD_ID, XSD_IDREF):
+            xsd_type = xsd_types[name]
+            self.assertIs(copy.copy(xsd_type)._iter_decode_value, xsd_type._iter_decode_value)
+            self.assertIs(pickle.loads(pickle.dumps(xsd_type))._iter_decode_value,
+                          xsd_type._iter_decode_value)
+
+        self.assertIsNone(xsd_types[XSD_STRING]._iter_decode_value)
+        self.assertEqual(xsd_types[XSD_INT].decode(' 10 '), 10)
+
+        xsd_type = xsd_types[XSD_QNAME]
+        self.assertEqual(xsd_type.decode('tns:foo', namespaces={'tns': 'http://a.test'}),
+                         '{http://a.test}foo')
+        self.assertEqual(xsd_type.decode('foo', namespaces={'': 'http://a.test'}),
+                         '{http://a.test}foo')
+        self.assertEqual(xsd_type.decode('foo', namespaces={}), 'foo')
+        self.assertEqual(xsd_type.decode('a:b', validation='skip', namespaces={}), 'a:b')
+
+        id_map = Counter()
+        self.assertEqual(xsd_types[XSD_IDREF].decode('a1', id_map=id_map), 'a1')
+        self.assertEqual(id_map, {'a1': 0})
+        self.assertEqual(xsd_types[XSD_ID].decode(' a1 ', id_map=id_map), 'a1')
+        self.assertEqual(id_map, {'a1': 1})
+
+        with self.assertRaises(XMLSchemaValidationError) as ctx:
+            xsd_types[XSD_ID].decode('a1', id_map=id_map)
+        self.assertEqual(ctx.exception.reason, "duplicated xs:ID value 'a1'")
+        self.assertEqual(xsd_types[XSD_ID].decode('a1', id_map=id_map, level=0), 'a1')
+
+        _, errors = xsd_types[XSD_ID].decode('1a', validation='lax', id_map=id_map)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(id_map['1a'], 1)
+
 
 class TestXsd11SimpleTypes(TestXsdSimpleTypes):
 
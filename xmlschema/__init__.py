@@ -14,14 +14,15 @@ from . import translation
 from .exceptions import XMLSchemaException, XMLResourceError, XMLSchemaNamespaceError
 from .locations import normalize_url, normalize_locations
 from .resources import fetch_resource, fetch_namespaces, fetch_schema_locations, \
-    fetch_schema, XMLResource
+    fetch_schema, XMLResource, XMLResourceIndex
 from .xpath import ElementPathMixin
 from .converters import ElementData, XMLSchemaConverter, \
     UnorderedConverter, ParkerConverter, BadgerFishConverter, \
-    AbderaConverter, JsonMLConverter, ColumnarConverter, GDataConverter
+    AbderaConverter, JsonMLConverter, ColumnarConverter, GDataConverter, \
+    ColumnBuffer, ColumnBufferConverter
 from .dataobjects import DataElement, DataElementConverter, DataBindingConverter
 from .documents import validate, is_valid, iter_errors, iter_decode, \
-    to_dict, to_json, to_etree, from_json, XmlDocument
+    to_dict, to_json, to_columns, to_etree, from_json, XmlDocument
 
 from .validators import (
     XMLSchemaValidatorError, XMLSchemaParseError, XMLSchemaNotBuiltError,
@@ -29,7 +30,8 @@ from .validators import (
     XMLSchemaDecodeError, XMLSchemaEncodeError, XMLSchemaChildrenValidationError,
     XMLSchemaStopValidation, XMLSchemaIncludeWarning, XMLSchemaImportWarning,
     XMLSchemaTypeTableWarning, XMLSchemaAssertPathWarning, XsdGlobals, XMLSchemaBase,
-    XMLSchema, XMLSchema10, XMLSchema11, XsdComponent, XsdType, XsdElement, XsdAttribute
+    XMLSchema, XMLSchema10, XMLSchema11, XsdComponent, XsdType, XsdElement, XsdAttribute,
+    SchemaCache, TrustedSources, ValidationCache, ValidationProfiler
 )
 
 __version__ = '3.1.0'
@@ -43,16 +45,18 @@ __all__ = [
     'limits', 'translation', 'XMLSchemaException', 'XMLResourceError',
     'XMLSchemaNamespaceError', 'etree_tostring', 'normalize_url', 'normalize_locations',
     'fetch_resource', 'fetch_namespaces', 'fetch_schema_locations', 'fetch_schema',
-    'XMLResource', 'ElementPathMixin', 'ElementData', 'XMLSchemaConverter',
+    'XMLResource', 'XMLResourceIndex', 'ElementPathMixin', 'ElementData', 'XMLSchemaConverter',
     'UnorderedConverter', 'ParkerConverter', 'BadgerFishConverter', 'GDataConverter',
-    'AbderaConverter', 'JsonMLConverter', 'ColumnarConverter', 'DataElement',
-    'DataElementConverter', 'DataBindingConverter', 'validate', 'is_valid', 'iter_errors',
-    'iter_decode', 'to_dict', 'to_json', 'to_etree', 'from_json', 'XmlDocument',
+    'AbderaConverter', 'JsonMLConverter', 'ColumnarConverter', 'ColumnBuffer',
+    'ColumnBufferConverter', 'DataElement', 'DataElementConverter', 'DataBindingConverter',
+    'validate', 'is_valid', 'iter_errors', 'iter_decode', 'to_dict', 'to_json',
+    'to_columns', 'to_etree', 'from_json', 'XmlDocument',
     'XMLSchemaValidatorError', 'XMLSchemaParseError', 'XMLSchemaNotBuiltError',
     'XMLSchemaModelError', 'XMLSchemaModelDepthError', 'XMLSchemaValidationError',
     'XMLSchemaDecodeError', 'XMLSchemaEncodeError', 'XMLSchemaChildrenValidationError',
     'XMLSchemaStopValidation', 'XMLSchemaIncludeWarning', 'XMLSchemaImportWarning',
     'XMLSchemaTypeTableWarning', 'XMLSchemaAssertPathWarning',
     'XsdGlobals', 'XMLSchemaBase', 'XMLSchema', 'XMLSchema10', 'XMLSchema11',
-    'XsdComponent', 'XsdType', 'XsdElement', 'XsdAttribute',
+    'XsdComponent', 'XsdType', 'XsdElement', 'XsdAttribute', 'SchemaCache',
+    'TrustedSources', 'ValidationCache', 'ValidationProfiler',
 ]
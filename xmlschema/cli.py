@@ -16,7 +16,8 @@ import pathlib
 from urllib.error import URLError
 
 import xmlschema
-from xmlschema import XMLSchema, XMLSchema11, iter_errors, to_json, from_json, etree_tostring
+from xmlschema import XMLSchema, XMLSchema11, iter_errors, to_json, from_json, \
+    etree_tostring, fetch_schema
 from xmlschema.exceptions import XMLSchemaValueError
 
 
@@ -45,6 +46,17 @@ def defuse_data(value):
     return value
 
 
+def number_of_workers(value):
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+
+    if workers < 1:
+        raise argparse.ArgumentTypeError("%r is not a valid number of workers" % value)
+    return workers
+
+
 def get_loglevel(verbosity):
     if verbosity <= 0:
         return logging.ERROR
@@ -248,6 +260,10 @@ def validate():
     parser.add_argument('--defuse', metavar='(always, remote, never)',
                         type=defuse_data, default='remote',
                         help="when to defuse XML data, on remote resources for default.")
+    parser.add_argument('--workers', type=number_of_workers, metavar='N', default=None,
+                        help="validate files in parallel with N processes, using the "
+                             "same schema for all files (the schema provided with "
+                             "--schema or the schema of the first file).")
     parser.add_argument('files', metavar='[XML_FILE ...]', nargs='+',
                         help="XML files to be validated.")
 
@@ -256,6 +272,30 @@ def validate():
     schema_class = XMLSchema if args.version == '1.0' else XMLSchema11
 
     tot_errors = 0
+    if args.workers is not None:
+        try:
+            schema = schema_class(args.schema or fetch_schema(args.files[0]),
+                                  locations=args.locations, defuse=args.defuse)
+        except (xmlschema.XMLSchemaException, URLError, ValueError) as err:
+            sys.stderr.write(f"{err}\n")
+            sys.exit(1)
+
+        for summary in schema.validate_many(args.files, workers=args.workers,
+                                            lazy=args.lazy, use_location_hints=True):
+            if summary.exception is not None:
+                tot_errors += 1
+                sys.stderr.write(f"{summary.exception}\n")
+            elif not summary.errors:
+                sys.stdout.write(f"{summary.source} is valid\n")
+            else:
+                tot_errors += len(summary.errors)
+                sys.stderr.write(f"{summary.source} is not valid\n")
+                if args.verbosity > 0:
+                    for error in summary.errors:
+                        sys.stderr.write(f"{error}\n")
+
+        sys.exit(tot_errors)
+
     for filepath in args.files:
         try:
             errors = list(iter_errors(filepath, schema=args.schema, cls=schema_class,
@@ -14,8 +14,9 @@ from .badgerfish import BadgerFishConverter
 from .gdata import GDataConverter
 from .abdera import AbderaConverter
 from .jsonml import JsonMLConverter
-from .columnar import ColumnarConverter
+from .columnar import ColumnarConverter, ColumnBuffer, ColumnBufferConverter
 
 __all__ = ['XMLSchemaConverter', 'UnorderedConverter', 'ParkerConverter',
            'BadgerFishConverter', 'AbderaConverter', 'JsonMLConverter',
-           'ColumnarConverter', 'ElementData', 'GDataConverter']
+           'ColumnarConverter', 'ElementData', 'GDataConverter',
+           'ColumnBuffer', 'ColumnBufferConverter']
@@ -7,10 +7,13 @@
 #
 # @author Davide Brunato <brunato@sissa.it>
 #
+from array import array
 from collections.abc import MutableMapping, MutableSequence
-from typing import TYPE_CHECKING, Any, Optional, List, Dict, Type, Tuple
+from typing import TYPE_CHECKING, cast, Any, Optional, List, Dict, Type, Tuple, Union
 
 from ..exceptions import XMLSchemaTypeError, XMLSchemaValueError
+from ..names import XSD_BOOLEAN, XSD_FLOAT, XSD_DOUBLE, XSD_LONG, XSD_UNSIGNED_LONG, \
+    XSD_INTEGER
 from ..aliases import NamespacesType, BaseXsdType
 from ..resources import XMLResource
 from .default import ElementData, XMLSchemaConverter
@@ -178,3 +181,223 @@ class ColumnarConverter(XMLSchemaConverter):
                     content.append((ns_name, value))
 
         return ElementData(xsd_element.name, text, content, attributes, None)
+
+
+# Array typecodes of XSD builtin types, ordered from the most derived types
+ARRAY_TYPECODES = (
+    (XSD_BOOLEAN, 'b'),
+    (XSD_FLOAT, 'd'),
+    (XSD_DOUBLE, 'd'),
+    (XSD_LONG, 'q'),
+    (XSD_UNSIGNED_LONG, 'Q'),
+    (XSD_INTEGER, 'q'),
+)
+
+
+def get_array_typecode(xsd_type: BaseXsdType) -> Optional[str]:
+    """
+    Returns the typecode of the array that can store the decoded values of a
+    type with simple content, or `None` if the values have to be stored in a list.
+    """
+    simple_type = xsd_type.simple_type
+    if simple_type is None or not simple_type.is_atomic():
+        return None
+
+    for type_name, typecode in ARRAY_TYPECODES:
+        try:
+            base_type = simple_type.maps.types[type_name]
+        except KeyError:
+            continue
+        if simple_type.is_derived(base_type):
+            return typecode
+    return None
+
+
+class ColumnBuffer:
+    """
+    A column of decoded values. The values of numeric and boolean types are stored
+    in an `array.array`, the values of the other types are stored in a list. If a
+    value doesn't fit in the array (e.g. an integer too big) the array is replaced
+    by a list. Missing values are stored as zeros or `None` and are marked in
+    the null mask.
+
+    :param name: the name of the column.
+    :param xsd_type: the XSD type of the values.
+
+    :ivar values: an `array.array` or a list with the values.
+    :ivar mask: an `array.array` of unsigned chars, with 1 for missing values.
+    """
+    values: Union['array[Any]', List[Any]]
+
+    __slots__ = ('name', 'xsd_type', 'values', 'mask')
+
+    def __init__(self, name: str, xsd_type: BaseXsdType) -> None:
+        self.name = name
+        self.xsd_type = xsd_type
+        typecode = get_array_typecode(xsd_type)
+        self.values = array(typecode) if typecode is not None else []
+        self.mask = array('B')
+
+    def __repr__(self) -> str:
+        return '%s(name=%r, xsd_type=%r, typecode=%r, size=%d)' % (
+            self.__class__.__name__, self.name, self.xsd_type, self.typecode, len(self)
+        )
+
+    def __len__(self) -> int:
+        return len(self.mask)
+
+    @property
+    def typecode(self) -> Optional[str]:
+        """The typecode of the values array, `None` if the values are stored in a list."""
+        return self.values.typecode if isinstance(self.values, array) else None
+
+    def append(self, value: Any) -> None:
+        """Appends a value to the column, `None` is appended as a missing value."""
+        if value is None:
+            self.values.append(None if isinstance(self.values, list) else 0)
+            self.mask.append(1)
+            return
+
+        try:
+            self.values.append(value)
+        except (TypeError, OverflowError):
+            self.values = [None if m else v for v, m in zip(self.values, self.mask)]
+            self.values.append(value)
+        self.mask.append(0)
+
+    def to_list(self) -> List[Any]:
+        """Returns the values of the column as a list, with `None` for missing values."""
+        if self.typecode == 'b':
+            return [None if m else bool(v) for v, m in zip(self.values, self.mask)]
+        return [None if m else v for v, m in zip(self.values, self.mask)]
+
+    def to_numpy(self) -> Any:
+        """
+        Returns the values of the column as a NumPy masked array. Raises an
+        `ImportError` if NumPy is not installed.
+        """
+        import numpy
+
+        if isinstance(self.values, list):
+            values = numpy.array(self.values, dtype=object)
+        elif self.values.typecode == 'b':
+            values = numpy.array(self.values, dtype=numpy.bool_)
+        else:
+            values = numpy.array(self.values, dtype=self.values.typecode)
+        return numpy.ma.MaskedArray(values, mask=numpy.array(self.mask, dtype=numpy.bool_))
+
+
+class ColumnBufferConverter(XMLSchemaConverter):
+    """
+    A converter that stores the values of the selected elements into column
+    buffers, without building a data structure for each element. Each decoded
+    element at level 0 fills a row of the columns, with the values of its
+    attributes and of its single child elements that have simple content,
+    or with its value if the element has simple content. Decoded elements
+    are converted to `None`. Used by :meth:`xmlschema.to_columns`.
+
+    :param namespaces: map from namespace prefixes to URI.
+    :param columns: the dictionary of column buffers to fill, keyed by name. \
+    Missing columns are added at the first decoded element. If not provided \
+    a new dictionary is created.
+    :param text_key: the name of the column for the values of elements with \
+    simple content.
+    :param attr_prefix: the prefix of the names of the columns of attributes. \
+    If `None` the attributes are ignored.
+    """
+    columns: Dict[str, ColumnBuffer]
+
+    __slots__ = ('columns', '_element_columns', '_attribute_columns', '_text_column')
+
+    def __init__(self, namespaces: Optional[NamespacesType] = None,
+                 columns: Optional[Dict[str, ColumnBuffer]] = None,
+                 text_key: Optional[str] = '$',
+                 attr_prefix: Optional[str] = '@',
+                 **kwargs: Any) -> None:
+        kwargs.update(cdata_prefix=None)
+        super().__init__(namespaces, text_key=text_key, attr_prefix=attr_prefix, **kwargs)
+        self.columns = columns if columns is not None else {}
+        self._element_columns: Optional[Dict[str, ColumnBuffer]] = None
+        self._attribute_columns: Dict[str, ColumnBuffer] = {}
+        self._text_column: Optional[ColumnBuffer] = None
+
+    @property
+    def lossy(self) -> bool:
+        return True
+
+    @property
+    def loss_xmlns(self) -> bool:
+        return True
+
+    def copy(self, keep_namespaces: bool = True, **kwargs: Any) -> 'ColumnBufferConverter':
+        kwargs.setdefault('columns', self.columns)
+        converter = cast(ColumnBufferConverter, super().copy(keep_namespaces, **kwargs))
+        converter.columns = kwargs['columns']
+        return converter
+
+    def _add_column(self, name: str, xsd_type: BaseXsdType) -> ColumnBuffer:
+        try:
+            return self.columns[name]
+        except KeyError:
+            column = self.columns[name] = ColumnBuffer(name, xsd_type)
+            return column
+
+    def _build_columns(self, xsd_element: 'XsdElement') -> Dict[str, ColumnBuffer]:
+        element_columns: Dict[str, ColumnBuffer] = {}
+        if self.attr_prefix is not None:
+            for name, xsd_attribute in xsd_element.attributes.items():
+                if name is not None and xsd_attribute.type is not None:
+                    column_name = self.attr_prefix + self.map_qname(name)
+                    column = self._add_column(column_name, xsd_attribute.type)
+                    self._attribute_columns[name] = column
+
+        xsd_type = xsd_element.type
+        if xsd_type.simple_type is not None:
+            if self.text_key is not None:
+                self._text_column = self._add_column(self.text_key, xsd_type)
+        elif xsd_type.model_group is not None:
+            for xsd_child in xsd_type.model_group.iter_elements():
+                if xsd_child.name is None:
+                    continue
+
+                # Content is decoded with names already mapped by the converter
+                name = self.map_qname(xsd_child.name)
+                child_type = xsd_child.type
+                if name not in element_columns and child_type is not None \
+                        and child_type.simple_type is not None and xsd_child.is_single():
+                    element_columns[name] = self._add_column(name, child_type)
+
+        self._element_columns = element_columns
+        return element_columns
+
+    def element_decode(self, data: ElementData, xsd_element: 'XsdElement',
+                       xsd_type: Optional[BaseXsdType] = None, level: int = 0) -> Any:
+        if level:
+            return data.text  # the value of a child, collected by its parent
+
+        element_columns = self._element_columns
+        if element_columns is None:
+            element_columns = self._build_columns(xsd_element)
+        if not self.columns:
+            return None
+
+        size = max(len(column) for column in self.columns.values()) + 1
+
+        if data.attributes and self._attribute_columns:
+            for name, value in data.attributes:
+                column = self._attribute_columns.get(name)
+                if column is not None and len(column) < size:
+                    column.append(value)
+
+        if data.content:
+            for name, value, _xsd_child in data.content:
+                column = element_columns.get(name)
+                if column is not None and len(column) < size:
+                    column.append(value)
+        elif self._text_column is not None and len(self._text_column) < size:
+            self._text_column.append(data.text)
+
+        for column in self.columns.values():
+            if len(column) < size:
+                column.append(None)
+        return None
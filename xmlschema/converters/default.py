@@ -358,6 +358,31 @@ class XMLSchemaConverter(NamespaceMapper):
 
         return xmlns
 
+    def _keep_result_dict(self, data: ElementData, xsd_type: BaseXsdType,
+                          xmlns: XmlnsType) -> bool:
+        """
+        Decide when to keep a result dict in case of an element with simple content.
+        """
+        if data.attributes or self.force_dict and xsd_type.is_complex():
+            return True
+        elif not xmlns or not self._use_namespaces:
+            return False
+
+        namespace = get_namespace(data.tag)
+        if any(x[1] == namespace for x in xmlns):
+            return True
+
+        if xsd_type.is_qname() and isinstance(data.text, str):
+            try:
+                prefix = data.text.split(':')[0]
+            except IndexError:
+                prefix = ''
+
+            if any(x[0] == prefix for x in xmlns):
+                return True
+
+        return False
+
     @stackable
     def element_decode(self, data: ElementData, xsd_element: 'XsdElement',
                        xsd_type: Optional[BaseXsdType] = None, level: int = 0) -> Any:
@@ -372,33 +397,16 @@ class XMLSchemaConverter(NamespaceMapper):
         :return: a data structure containing the decoded data.
         """
         xsd_type = xsd_type or xsd_element.type
-        result_dict = self.dict()
         xmlns = self.get_effective_xmlns(data.xmlns, level, xsd_element)
+        xsd_group = xsd_type.model_group
 
-        def keep_result_dict() -> bool:
-            """
-            Decide when to keep a result dict in case of an element with simple content.
-            """
-            if data.attributes or self.force_dict and xsd_type.is_complex():
-                return True
-            elif not xmlns or not self._use_namespaces:
-                return False
-
-            namespace = get_namespace(data.tag)
-            if any(x[1] == namespace for x in xmlns):
-                return True
-
-            if xsd_type.is_qname() and isinstance(data.text, str):
-                try:
-                    prefix = data.text.split(':')[0]
-                except IndexError:
-                    prefix = ''
-
-                if any(x[0] == prefix for x in xmlns):
-                    return True
-
-            return False
+        if (xsd_group is None or not data.content) and \
+                not self._keep_result_dict(data, xsd_type, xmlns):
+            if not level and self.preserve_root:
+                return self.dict([(self.map_qname(data.tag), data.text)])
+            return data.text
 
+        result_dict = self.dict()
         if self._use_namespaces and xmlns:
             result_dict.update(
                 (f'{self.ns_prefix}:{k}' if k else self.ns_prefix, v) for k, v in xmlns
@@ -407,20 +415,10 @@ class XMLSchemaConverter(NamespaceMapper):
         if data.attributes:
             result_dict.update(self.map_attributes(data.attributes))
 
-        xsd_group = xsd_type.model_group
         if xsd_group is None or not data.content:
-            if keep_result_dict():
-                result_dict.update(self.map_attributes(data.attributes))
-                if data.text is not None and self.text_key is not None:
-                    result_dict[self.text_key] = data.text
-            elif not level and self.preserve_root:
-                return self.dict([(self.map_qname(data.tag), data.text)])
-            else:
-                return data.text
+            if data.text is not None and self.text_key is not None:
+                result_dict[self.text_key] = data.text
         else:
-            if data.attributes:
-                result_dict.update(self.map_attributes(data.attributes))
-
             has_single_group = xsd_group.is_single()
             for name, value, xsd_child in self.map_content(data.content):
                 try:
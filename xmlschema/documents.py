@@ -22,6 +22,7 @@ from .aliases import ElementType, XMLSourceType, NamespacesType, LocationsType,
 from .helpers import get_extended_qname, update_namespaces, get_namespace_map, \
     is_etree_document
 from .resources import fetch_schema_locations, XMLResource
+from .converters import ColumnBuffer, ColumnBufferConverter
 from .validators import XMLSchema10, XMLSchemaBase, XMLSchemaValidationError
 
 
@@ -36,7 +37,8 @@ def get_context(xml_document: Union[XMLSourceType, XMLResource],
                 thin_lazy: bool = True,
                 uri_mapper: Optional[UriMapperType] = None,
                 use_location_hints: bool = True,
-                dummy_schema: bool = False) -> Tuple[XMLResource, XMLSchemaBase]:
+                dummy_schema: bool = False,
+                xml_parser: str = 'etree') -> Tuple[XMLResource, XMLSchemaBase]:
     """
     Get the XML document validation/decode context.
 
@@ -54,7 +56,7 @@ def get_context(xml_document: Union[XMLSourceType, XMLResource],
         resource = xml_document
     else:
         resource = XMLResource(xml_document, base_url, defuse=defuse, timeout=timeout,
-                               lazy=lazy, thin_lazy=thin_lazy)
+                               lazy=lazy, thin_lazy=thin_lazy, xml_parser=xml_parser)
 
     if isinstance(schema, XMLSchemaBase) and resource.namespace in schema.maps.namespaces:
         return resource, schema
@@ -73,7 +75,8 @@ def get_context(xml_document: Union[XMLSourceType, XMLResource],
                 'locations': locations,
                 'defuse': defuse,
                 'timeout': timeout,
-                'uri_mapper': uri_mapper
+                'uri_mapper': uri_mapper,
+                'xml_parser': xml_parser,
             }
             if schema is None or isinstance(schema, XMLSchemaBase):
                 return resource, cls(schema_location, **kwargs)
@@ -94,7 +97,8 @@ def get_context(xml_document: Union[XMLSourceType, XMLResource],
         return resource, schema
     else:
         return resource, cls(schema, locations=locations, base_url=base_url,
-                             defuse=defuse, timeout=timeout, uri_mapper=uri_mapper)
+                             defuse=defuse, timeout=timeout, uri_mapper=uri_mapper,
+                             xml_parser=xml_parser)
 
 
 def get_dummy_schema(tag: str, cls: Type[XMLSchemaBase]) -> XMLSchemaBase:
@@ -147,7 +151,8 @@ def validate(xml_document: Union[XMLSourceType, XMLResource],
              lazy: LazyType = False,
              thin_lazy: bool = True,
              uri_mapper: Optional[UriMapperType] = None,
-             use_location_hints: bool = True) -> None:
+             use_location_hints: bool = True,
+             xml_parser: str = 'etree') -> None:
     """
     Validates an XML document against a schema instance. This function builds an
     :class:`XMLSchema` object for validating the XML document. Raises an
@@ -183,10 +188,11 @@ def validate(xml_document: Union[XMLSourceType, XMLResource],
     :param use_location_hints: for default, in case a schema instance has \
     to be built, uses also schema locations hints provided within XML data. \
     Set this option to `False` to ignore these schema location hints.
+    :param xml_parser: an optional argument for building the :class:`XMLResource` instance.
     """
     source, schema = get_context(xml_document, schema, cls, locations, base_url,
                                  defuse, timeout, lazy, thin_lazy, uri_mapper,
-                                 use_location_hints)
+                                 use_location_hints, xml_parser=xml_parser)
     schema.validate(source, path, schema_path, use_defaults, namespaces,
                     use_location_hints=use_location_hints)
 
@@ -205,14 +211,15 @@ def is_valid(xml_document: Union[XMLSourceType, XMLResource],
              lazy: LazyType = False,
              thin_lazy: bool = True,
              uri_mapper: Optional[UriMapperType] = None,
-             use_location_hints: bool = True) -> bool:
+             use_location_hints: bool = True,
+             xml_parser: str = 'etree') -> bool:
     """
     Like :meth:`validate` except that do not raise an exception but returns ``True`` if
     the XML document is valid, ``False`` if it's invalid.
     """
     source, schema = get_context(xml_document, schema, cls, locations, base_url,
                                  defuse, timeout, lazy, thin_lazy, uri_mapper,
-                                 use_location_hints)
+                                 use_location_hints, xml_parser=xml_parser)
     return schema.is_valid(source, path, schema_path, use_defaults, namespaces,
                            use_location_hints=use_location_hints)
 
@@ -231,14 +238,15 @@ def iter_errors(xml_document: Union[XMLSourceType, XMLResource],
                 lazy: LazyType = False,
                 thin_lazy: bool = True,
                 uri_mapper: Optional[UriMapperType] = None,
-                use_location_hints: bool = True) -> Iterator[XMLSchemaValidationError]:
+                use_location_hints: bool = True,
+                xml_parser: str = 'etree') -> Iterator[XMLSchemaValidationError]:
     """
     Creates an iterator for the errors generated by the validation of an XML document.
     Takes the same arguments of the function :meth:`validate`.
     """
     source, schema = get_context(xml_document, schema, cls, locations, base_url,
                                  defuse, timeout, lazy, thin_lazy, uri_mapper,
-                                 use_location_hints)
+                                 use_location_hints, xml_parser=xml_parser)
     return schema.iter_errors(source, path, schema_path, use_defaults, namespaces,
                               use_location_hints=use_location_hints)
 
@@ -256,6 +264,7 @@ def iter_decode(xml_document: Union[XMLSourceType, XMLResource],
                 thin_lazy: bool = True,
                 uri_mapper: Optional[UriMapperType] = None,
                 use_location_hints: bool = True,
+                xml_parser: str = 'etree',
                 **kwargs: Any) -> Iterator[Union[Any, XMLSchemaValidationError]]:
     """
     Creates an iterator for decoding an XML source to a data structure. For default
@@ -288,6 +297,7 @@ def iter_decode(xml_document: Union[XMLSourceType, XMLResource],
     :param use_location_hints: for default, in case a schema instance has \
     to be built, uses also schema locations hints provided within XML data. \
     Set this option to `False` to ignore these schema location hints.
+    :param xml_parser: an optional argument for building the :class:`XMLResource` instance.
     :param kwargs: other optional arguments of :meth:`XMLSchemaBase.iter_decode` \
     as keyword arguments.
     :raises: :exc:`XMLSchemaValidationError` if the XML document is invalid and \
@@ -295,7 +305,7 @@ def iter_decode(xml_document: Union[XMLSourceType, XMLResource],
     """
     source, _schema = get_context(xml_document, schema, cls, locations, base_url,
                                   defuse, timeout, lazy, thin_lazy, uri_mapper,
-                                  use_location_hints)
+                                  use_location_hints, xml_parser=xml_parser)
     yield from _schema.iter_decode(source, path=path, validation=validation,
                                    use_location_hints=use_location_hints, **kwargs)
 
@@ -313,6 +323,7 @@ def to_dict(xml_document: Union[XMLSourceType, XMLResource],
             thin_lazy: bool = True,
             uri_mapper: Optional[UriMapperType] = None,
             use_location_hints: bool = True,
+            xml_parser: str = 'etree',
             **kwargs: Any) -> DecodeType[Any]:
     """
     Decodes an XML document to a Python's nested dictionary. Takes the same arguments
@@ -325,7 +336,7 @@ def to_dict(xml_document: Union[XMLSourceType, XMLResource],
     """
     source, _schema = get_context(xml_document, schema, cls, locations, base_url,
                                   defuse, timeout, lazy, thin_lazy, uri_mapper,
-                                  use_location_hints)
+                                  use_location_hints, xml_parser=xml_parser)
     return _schema.decode(source, path=path, validation=validation,
                           use_location_hints=use_location_hints, **kwargs)
 
@@ -344,6 +355,7 @@ def to_json(xml_document: Union[XMLSourceType, XMLResource],
             thin_lazy: bool = True,
             uri_mapper: Optional[UriMapperType] = None,
             use_location_hints: bool = True,
+            xml_parser: str = 'etree',
             json_options: Optional[Dict[str, Any]] = None,
             **kwargs: Any) -> JsonDecodeType:
     """
@@ -378,6 +390,7 @@ def to_json(xml_document: Union[XMLSourceType, XMLResource],
     :param use_location_hints: for default, in case a schema instance has \
     to be built, uses also schema locations hints provided within XML data. \
     Set this option to `False` to ignore these schema location hints.
+    :param xml_parser: an optional argument for building the :class:`XMLResource` instance.
     :param json_options: a dictionary with options for the JSON serializer.
     :param kwargs: optional arguments of :meth:`XMLSchemaBase.iter_decode` as keyword arguments \
     to variate the decoding process.
@@ -390,7 +403,7 @@ def to_json(xml_document: Union[XMLSourceType, XMLResource],
     dummy_schema = validation == 'skip'
     source, _schema = get_context(xml_document, schema, cls, locations, base_url,
                                   defuse, timeout, lazy, thin_lazy, uri_mapper,
-                                  use_location_hints, dummy_schema)
+                                  use_location_hints, dummy_schema, xml_parser)
     if json_options is None:
         json_options = {}
     if 'decimal_type' not in kwargs:
@@ -420,6 +433,63 @@ def to_json(xml_document: Union[XMLSourceType, XMLResource],
         return result if not errors else (result, tuple(errors))
 
 
+def to_columns(xml_document: Union[XMLSourceType, XMLResource],
+               path: str,
+               schema: Optional[XMLSchemaBase] = None,
+               cls: Optional[Type[XMLSchemaBase]] = None,
+               validation: str = 'strict',
+               locations: Optional[LocationsType] = None,
+               base_url: Optional[str] = None,
+               defuse: str = 'remote',
+               timeout: int = 300,
+               lazy: LazyType = False,
+               thin_lazy: bool = True,
+               uri_mapper: Optional[UriMapperType] = None,
+               use_location_hints: bool = True,
+               xml_parser: str = 'etree',
+               **kwargs: Any) -> Union[Dict[str, ColumnBuffer],
+                                       Tuple[Dict[str, ColumnBuffer],
+                                             List[XMLSchemaValidationError]]]:
+    """
+    Decodes the repeated elements of an XML document into typed columns. Each element
+    selected by *path* fills a row of the columns, with the values of its attributes
+    and of its single child elements that have simple content. The values of numeric
+    and boolean types are stored in arrays, missing and nilled values are marked in
+    the null masks of the columns. Takes the same arguments of the function
+    :meth:`to_dict`, with *path* that is mandatory.
+
+    :param xml_document: the XML document, see :meth:`to_dict` for the admitted types.
+    :param path: an XPath expression that selects the repeated elements. Using \
+    a lazy resource and a path composed by names and wildcards the selected \
+    elements are decoded in streaming.
+    :param kwargs: optional arguments of :meth:`XMLSchemaBase.iter_decode` and of \
+    :class:`ColumnBufferConverter` as keyword arguments.
+    :return: a dictionary of :class:`ColumnBuffer` instances, keyed by column name. \
+    If ``validation='lax'`` keyword argument is provided the validation errors \
+    are collected and returned in a tuple with the columns.
+    :raises: :exc:`XMLSchemaValidationError` if the XML document is invalid and \
+    ``validation='strict'`` is provided.
+    """
+    source, _schema = get_context(xml_document, schema, cls, locations, base_url,
+                                  defuse, timeout, lazy, thin_lazy, uri_mapper,
+                                  use_location_hints, xml_parser=xml_parser)
+
+    columns: Dict[str, ColumnBuffer] = kwargs.pop('columns', {})
+    errors: List[XMLSchemaValidationError] = []
+    for result in _schema.iter_decode(source, path=path, validation=validation,
+                                      use_location_hints=use_location_hints,
+                                      converter=ColumnBufferConverter,
+                                      columns=columns, **kwargs):
+        if not isinstance(result, XMLSchemaValidationError):
+            continue
+        elif validation == 'strict':
+            raise result
+        elif validation == 'lax':
+            errors.append(result)
+
+    return (columns, errors) if validation == 'lax' else columns
+
+
 def to_etree(obj: Any,
              schema: Optional[Union[XMLSchemaBase, SchemaSourceType]] = None,
              cls: Optional[Type[XMLSchemaBase]] = None,
@@ -588,6 +658,8 @@ class XmlDocument(XMLResource):
     :param use_location_hints: for default, in case a schema instance has \
     to be built, uses also schema locations hints provided within XML data. \
     Set this option to `False` to ignore these schema location hints.
+    :param xml_parser: the XML parser for base :class:`xmlschema.XMLResource` \
+    initialization.
     """
     schema: Optional[XMLSchemaBase] = None
     _fallback_schema: Optional[XMLSchemaBase] = None
@@ -608,14 +680,15 @@ class XmlDocument(XMLResource):
                  lazy: LazyType = False,
                  thin_lazy: bool = True,
                  uri_mapper: Optional[UriMapperType] = None,
-                 use_location_hints: bool = True) -> None:
+                 use_location_hints: bool = True,
+                 xml_parser: str = 'etree') -> None:
 
         if cls is None:
             cls = XMLSchema10
         self.validation = validation
         self._namespaces = get_namespace_map(namespaces)
-        super(XmlDocument, self).__init__(source, base_url, allow, defuse,
-                                          timeout, lazy, thin_lazy)
+        super(XmlDocument, self).__init__(source, base_url, allow, defuse, timeout,
+                                          lazy, thin_lazy, xml_parser=xml_parser)
 
         if isinstance(schema, XMLSchemaBase) and self.namespace in schema.maps.namespaces:
             self.schema = schema
@@ -627,7 +700,8 @@ class XmlDocument(XMLResource):
                 allow=allow,
                 defuse=defuse,
                 timeout=timeout,
-                uri_mapper=uri_mapper
+                uri_mapper=uri_mapper,
+                xml_parser=xml_parser
             )
         else:
             if use_location_hints:
@@ -648,7 +722,8 @@ class XmlDocument(XMLResource):
                         allow=allow,
                         defuse=defuse,
                         timeout=timeout,
-                        uri_mapper=uri_mapper
+                        uri_mapper=uri_mapper,
+                        xml_parser=xml_parser
                     )
 
             if self.schema is None:
@@ -8,16 +8,23 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 import sys
+import codecs
+import mmap
 import os.path
+import re
+from array import array
 from collections import deque
 from io import StringIO, BytesIO
 from itertools import zip_longest
 from pathlib import Path
+from types import ModuleType
 from typing import cast, Any, AnyStr, Dict, Optional, IO, Iterator, \
     List, MutableMapping, Union, Tuple
 from urllib.request import urlopen
 from urllib.parse import urlsplit
 from urllib.error import URLError
+from xml.parsers import expat
+from xml.sax.saxutils import quoteattr
 
 from elementpath import XPathToken, XPathContext, XPath2Parser, ElementNode, \
     LazyElementNode, DocumentNode, build_lxml_node_tree, build_node_tree
@@ -33,6 +40,12 @@ from .helpers import get_namespace, update_namespaces, get_namespace_map, \
 from .locations import LocationPath, is_url, is_remote_url, is_local_url, \
     normalize_url, normalize_locations
 
+lxml_etree: Optional[ModuleType]
+try:
+    import lxml.etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
 if sys.version_info < (3, 9):
     from typing import Deque
 else:
@@ -40,9 +53,165 @@ else:
 
 DEFUSE_MODES = frozenset(('never', 'remote', 'nonlocal', 'always'))
 SECURITY_MODES = frozenset(('all', 'remote', 'local', 'sandbox', 'none'))
+XML_PARSERS = frozenset(('etree', 'lxml'))
 
 ResourceNodeType = Union[ElementNode, LazyElementNode, DocumentNode]
 
+_NAME_PATTERN = r'[^\s/\[\](){}@:*.\-\d][^\s/\[\](){}@:*]*'
+_STEP_PATTERN = r'\*|(?:\{[^}]*\})?%s(?::%s)?' % (_NAME_PATTERN, _NAME_PATTERN)
+_STREAM_PATH_REGEX = re.compile(r'(?:\./|/)?(?:%s)(?:/(?:%s))*' % (_STEP_PATTERN, _STEP_PATTERN))
+_STEP_REGEX = re.compile(_STEP_PATTERN)
+
+
+class _MemoryMapReader:
+    """
+    A binary reader on a memory-mapped file. Each reader has its own position, so
+    many readers can share the same mapping. Reads return memoryview slices of the
+    mapping, so the data is fed to the XML parser without intermediate copies.
+    """
+    def __init__(self, mapping: mmap.mmap) -> None:
+        self._view = memoryview(mapping)
+        self._position = 0
+
+    def __enter__(self) -> '_MemoryMapReader':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._view is None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, position: int, whence: int = 0) -> int:
+        if whence == 1:
+            position += self._position
+        elif whence == 2:
+            position += len(self._view)
+        self._position = max(0, position)
+        return self._position
+
+    def read(self, size: Optional[int] = -1) -> memoryview:
+        start = self._position
+        if size is None or size < 0:
+            self._position = len(self._view)
+        else:
+            self._position = min(start + size, len(self._view))
+        return self._view[start:self._position]
+
+    def close(self) -> None:
+        if self._view is not None:
+            self._view.release()
+            self._view = None  # type: ignore[assignment]
+
+
+class XMLResourceIndex:
+    """
+    An index of the elements at *lazy_depth* level of a lazy XML resource, built
+    with :meth:`XMLResource.build_index`. For each element the index records the
+    byte offset of the start tag, the line number and the path of the element,
+    together with the namespace declarations of its ancestors, so the element
+    can be parsed alone. The DOCTYPE declaration of the XML data is recorded
+    too, for expanding the entities and the attribute defaults declared in its
+    internal subset. The index can be pickled for saving it aside the data.
+
+    :param depth: the depth level of the indexed elements.
+    :param encoding: the encoding of the XML data.
+    """
+    def __init__(self, depth: int, encoding: str = 'utf-8') -> None:
+        self.depth = depth
+        self.encoding = encoding
+        self.doctype = b''
+        self.offsets = array('q')
+        self.lines = array('q')
+        self._path_ids = array('I')
+        self._paths: List[str] = []
+        self._path_map: Dict[str, int] = {}
+        self._scope_ids = array('I')
+        self._scopes: List[Tuple[Tuple[str, str], ...]] = []
+        self._scope_map: Dict[Tuple[Tuple[str, str], ...], int] = {}
+
+    def __repr__(self) -> str:
+        return '%s(depth=%r, size=%r)' % (self.__class__.__name__, self.depth, len(self))
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, k: int) -> Tuple[int, int, str]:
+        """Returns a tuple with the byte offset, the line and the path of an element."""
+        return self.offsets[k], self.lines[k], self._paths[self._path_ids[k]]
+
+    def get_xmlns(self, k: int) -> List[Tuple[str, str]]:
+        """Returns the namespace declarations in the scope of an element's parent."""
+        return list(self._scopes[self._scope_ids[k]])
+
+    def append(self, offset: int, line: int, path: str,
+               scope: Tuple[Tuple[str, str], ...]) -> None:
+        try:
+            self._path_ids.append(self._path_map[path])
+        except KeyError:
+            self._path_ids.append(len(self._paths))
+            self._path_map[path] = len(self._paths)
+            self._paths.append(path)
+
+        try:
+            self._scope_ids.append(self._scope_map[scope])
+        except KeyError:
+            self._scope_ids.append(len(self._scopes))
+            self._scope_map[scope] = len(self._scopes)
+            self._scopes.append(scope)
+
+        self.offsets.append(offset)
+        self.lines.append(line)
+
+
+def get_stream_steps(path: str, namespaces: Optional[NamespacesType] = None) \
+        -> Optional[List[str]]:
+    """
+    Returns the list of the expanded names of a path that can be used for streaming
+    a lazy XML resource, one for each level starting from the root. A `'*'` item
+    matches any element. Returns `None` if the path is not a sequence of name tests
+    or wildcards on the child axis, or if it contains an unmapped prefix.
+
+    :param path: an absolute path or a path relative to the root element.
+    :param namespaces: an optional mapping from namespace prefixes to URIs.
+    """
+    path = path.strip()
+    if _STREAM_PATH_REGEX.fullmatch(path) is None:
+        return None
+
+    steps = [] if path.startswith('/') else ['*']
+    if path.startswith('./'):
+        path = path[2:]
+
+    namespaces = namespaces or {}
+    for name in _STEP_REGEX.findall(path):
+        if name == '*':
+            steps.append(name)
+            continue
+        elif name.startswith('{'):
+            uri, local_name = name[1:].split('}')
+        elif ':' in name:
+            prefix, local_name = name.split(':')
+            if prefix not in namespaces:
+                return None
+            uri = namespaces[prefix]
+        else:
+            uri, local_name = namespaces.get('', ''), name
+
+        steps.append(f'{{{uri}}}{local_name}' if uri else local_name)
+
+    return steps
+
 
 def fetch_resource(location: str, base_url: Optional[str] = None, timeout: int = 30) -> str:
     """
@@ -185,18 +354,37 @@ class XMLResource:
     :param uri_mapper: an optional URI mapper for using relocated or URN-addressed \
     resources. Can be a dictionary or a function that takes the URI string and returns \
     a URL, or the argument if there is no mapping for it.
+    :param memory_map: if `True` a local file resource is read from a read-only memory \
+    mapping of the file, that is shared by all the parsing passes on the resource, \
+    like the iterations of a lazy resource. The file must not be truncated while \
+    the resource is in use.
+    :param xml_parser: the parser used for building the XML tree, that can be 'etree' \
+    (default) for using *xml.etree.ElementTree* or 'lxml' for building a tree of \
+    lxml elements, that has native namespace maps. Falls back to 'etree' if lxml \
+    is not installed. Lazy resources with defused XML data are always parsed with \
+    the safe *ElementTree* parser.
     """
     # Protected attributes for data and resource location
     _source: XMLSourceType
     _root: ElementType
     _xpath_root: Union[None, ElementNode, DocumentNode] = None
+
+    # Namespace maps are stored only for the root, for the elements that declare
+    # namespaces and, on lazy resources, for the elements at lazy depth or above.
+    # The other elements share the namespace map of their parent.
     _nsmaps: Dict[ElementType, Dict[str, str]]
     _xmlns: Dict[ElementType, List[Tuple[str, str]]]
+    _lazy_scopes: List[Tuple[int, ElementType]]  # deeper elements that declare namespaces
+    _lazy_started: Optional[Tuple[ElementType, Dict[str, str]]] = None
+    _lazy_ended: Optional[Tuple[ElementType, Dict[str, str]]] = None
     _text: Optional[str] = None
     _url: Optional[str] = None
     _base_url: Optional[str] = None
     _parent_map: Optional[ParentMapType] = None
     _lazy: Union[bool, int] = False
+    _xml_parser: str = 'etree'
+    _mmap: Optional[mmap.mmap] = None
+    _index: Optional[XMLResourceIndex] = None
 
     def __init__(self, source: XMLSourceType,
                  base_url: Union[None, str, Path, bytes] = None,
@@ -205,7 +393,9 @@ class XMLResource:
                  timeout: int = 300,
                  lazy: Union[bool, int] = False,
                  thin_lazy: bool = True,
-                 uri_mapper: Optional[UriMapperType] = None) -> None:
+                 uri_mapper: Optional[UriMapperType] = None,
+                 memory_map: bool = False,
+                 xml_parser: str = 'etree') -> None:
 
         if isinstance(base_url, (str, bytes)):
             if not is_url(base_url):
@@ -255,11 +445,30 @@ class XMLResource:
             raise XMLSchemaTypeError(msg % type(uri_mapper))
         self._uri_mapper = uri_mapper
 
+        if not isinstance(memory_map, bool):
+            msg = "invalid type %r for argument 'memory_map'"
+            raise XMLSchemaTypeError(msg % type(memory_map))
+        self._memory_map = memory_map
+
+        if not isinstance(xml_parser, str):
+            msg = "invalid type %r for argument 'xml_parser'"
+            raise XMLSchemaTypeError(msg % type(xml_parser))
+        elif xml_parser not in XML_PARSERS:
+            msg = "'xml_parser' argument: %r is not an XML parser"
+            raise XMLSchemaValueError(msg % xml_parser)
+        elif lxml_etree is not None:
+            self._xml_parser = xml_parser
+
         self.parse(source, lazy)
 
     def __repr__(self) -> str:
         return '%s(root=%r)' % (self.__class__.__name__, self._root)
 
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop('_mmap', None)
+        return state
+
     @property
     def source(self) -> XMLSourceType:
         """The XML data source."""
@@ -325,6 +534,11 @@ class XMLResource:
         """The optional URI mapper argument for relocating addressed resources."""
         return self._uri_mapper
 
+    @property
+    def xml_parser(self) -> str:
+        """The parser used for building the XML tree, can be 'etree' or 'lxml'."""
+        return self._xml_parser
+
     @property
     def lazy_depth(self) -> int:
         """
@@ -333,6 +547,11 @@ class XMLResource:
         """
         return int(self._lazy)
 
+    @property
+    def index(self) -> Optional[XMLResourceIndex]:
+        """The index of the elements at *lazy_depth*, `None` if it's not built."""
+        return self._index
+
     @property
     def namespace(self) -> str:
         """The namespace of the XML resource."""
@@ -362,11 +581,20 @@ class XMLResource:
                 else:
                     node_tree = build_node_tree(self._root, _nsmap)
 
-                    # Update namespace maps
+                    # Update namespace maps, the elements without namespace
+                    # declarations share the namespace map of the parent.
                     for node in node_tree.iter_descendants(with_self=False):
-                        if isinstance(node, ElementNode):
-                            nsmap = self._nsmaps[cast(ElementType, node.elem)]
-                            node.nsmap = {k or '': v for k, v in nsmap.items()}
+                        if not isinstance(node, ElementNode):
+                            continue
+
+                        node_elem = cast(ElementType, node.elem)
+                        if node_elem is not self._root:
+                            try:
+                                nsmap = self._nsmaps[node_elem]
+                            except KeyError:
+                                node.nsmap = cast(ElementNode, node.parent).nsmap
+                            else:
+                                node.nsmap = {k or '': v for k, v in nsmap.items()}
 
                     self._xpath_root = node_tree
 
@@ -415,6 +643,13 @@ class XMLResource:
                 if child is None:
                     child = elem
 
+                if hasattr(child, 'getprevious'):
+                    # lxml elements have no nsmap entries and deleting a slice
+                    # of children is slower, because it counts all the children.
+                    while cast(Any, child).getprevious() is not None:
+                        del parent[0]
+                    continue
+
                 for k, e in enumerate(parent):
                     if child is not e:
                         if e in self._xmlns:
@@ -425,27 +660,37 @@ class XMLResource:
                             del parent[:k]
                         break
 
-        for e in elem.iter():
-            if elem is not e:
-                if e in self._xmlns:
-                    del self._xmlns[e]
-                del self._nsmaps[e]
-
+        self._lazy_clear_scopes(int(self._lazy))
         del elem[:]  # delete children, keep attributes, text and tail.
 
         # reset the whole XPath tree to let it still usable if other
         # children are added to the root by ElementTree.iterparse().
         self.xpath_root.children.clear()
 
+    def _is_defused(self) -> bool:
+        return self._defuse == 'remote' and is_remote_url(self.base_url) \
+            or self._defuse == 'nonlocal' and not is_local_url(self.base_url) \
+            or self._defuse == 'always'
+
+    def _lazy_clear_scopes(self, level: int) -> None:
+        # Remove the namespace maps of the elements deeper than level, that
+        # are the last ones added because they belong to the removed subtree.
+        while self._lazy_scopes and self._lazy_scopes[-1][0] > level:
+            e = self._lazy_scopes.pop()[1]
+            del self._xmlns[e]
+            del self._nsmaps[e]
+
     def _lazy_iterparse(self, resource: IO[AnyStr]) -> Iterator[Tuple[str, ElementType]]:
         events: Tuple[str, ...]
 
         events = 'start-ns', 'end-ns', 'start', 'end'
-        if self._defuse == 'remote' and is_remote_url(self.base_url) \
-                or self._defuse == 'nonlocal' and not is_local_url(self.base_url) \
-                or self._defuse == 'always':
+        native_nsmaps = False
+        if self._is_defused():
             safe_parser = SafeXMLParser(target=PyElementTree.TreeBuilder())
             tree_iterator = PyElementTree.iterparse(resource, events, safe_parser)
+        elif self._xml_parser == 'lxml':
+            tree_iterator = self._lxml_iterparse(resource, ('start', 'end'))
+            native_nsmaps = True
         else:
             tree_iterator = ElementTree.iterparse(resource, events)
 
@@ -453,6 +698,8 @@ class XMLResource:
         start_ns: List[Tuple[str, str]] = []
         end_ns = False
         nsmap_stack: List[Dict[str, str]] = [{}]
+        lazy_depth = int(self._lazy)
+        level = 0
 
         # Save previous status (if any)
         _root: Optional[ElementType]
@@ -463,13 +710,30 @@ class XMLResource:
             _nsmaps = self._nsmaps
             _ns_declarations = self._xmlns
             _xpath_root = self._xpath_root
+            _lazy_scopes = getattr(self, '_lazy_scopes', [])
+            _lazy_started, _lazy_ended = self._lazy_started, self._lazy_ended
         else:
             _root = _nsmaps = _ns_declarations = _xpath_root = None
+            _lazy_started = _lazy_ended = None
+            _lazy_scopes = []
 
         self._nsmaps = {}
         self._xmlns = {}
+        self._lazy_scopes = []
+        self._lazy_started = self._lazy_ended = None
 
         try:
+            if native_nsmaps:
+                for event, node in tree_iterator:
+                    if not root_started:
+                        self._root = node
+                        self._xpath_root = LazyElementNode(
+                            self._root, nsmap=self.get_nsmap(node)
+                        )
+                        root_started = True
+                    yield event, node
+                return
+
             for event, node in tree_iterator:
                 if event == 'start':
                     if end_ns:
@@ -480,16 +744,23 @@ class XMLResource:
                         nsmap_stack.append(nsmap_stack[-1].copy())
                         nsmap_stack[-1].update(start_ns)
                         self._xmlns[node] = start_ns
+                        self._nsmaps[node] = nsmap_stack[-1]
+                        if level > lazy_depth:
+                            self._lazy_scopes.append((level, node))
                         start_ns = []
+                    elif level <= lazy_depth:
+                        self._nsmaps[node] = nsmap_stack[-1]
 
-                    self._nsmaps[node] = nsmap_stack[-1]
                     if not root_started:
                         self._root = node
+                        self._nsmaps[node] = nsmap_stack[-1]
                         self._xpath_root = LazyElementNode(
                             self._root, nsmap=self._nsmaps[node]
                         )
                         root_started = True
 
+                    level += 1
+                    self._lazy_started = node, nsmap_stack[-1]
                     yield event, node
 
                 elif event == 'end':
@@ -497,6 +768,8 @@ class XMLResource:
                         nsmap_stack.pop()
                         end_ns = False
 
+                    level -= 1
+                    self._lazy_ended = node, nsmap_stack[-1]
                     yield event, node
 
                 elif event == 'start-ns':
@@ -512,15 +785,14 @@ class XMLResource:
                 self._nsmaps = _nsmaps
                 self._xmlns = _ns_declarations
                 self._xpath_root = _xpath_root
+                self._lazy_scopes = _lazy_scopes
+                self._lazy_started, self._lazy_ended = _lazy_started, _lazy_ended
             if isinstance(err, PyElementTree.ParseError):
                 raise ElementTree.ParseError(str(err)) from None
             raise
 
     def _parse(self, resource: IO[AnyStr]) -> None:
-        if self._defuse == 'remote' and is_remote_url(self.base_url) \
-                or self._defuse == 'nonlocal' and not is_local_url(self.base_url) \
-                or self._defuse == 'always':
-
+        if self._is_defused():
             if not hasattr(resource, 'seekable') or not resource.seekable():
                 text = resource.read()
                 if isinstance(text, str):
@@ -538,36 +810,84 @@ class XMLResource:
                 resource.seek(0)
 
         root: Optional[ElementType] = None
-        start_ns: List[Tuple[str, str]] = []
-        end_ns = False
         nsmaps: Dict[ElementType, Dict[str, str]] = {}
         ns_declarations: Dict[ElementType, List[Tuple[str, str]]] = {}
-        events = 'start-ns', 'end-ns', 'start'
-        nsmap_stack: List[Dict[str, str]] = [{}]
 
-        for event, node in ElementTree.iterparse(resource, events):
-            if event == 'start':
-                if root is None:
-                    root = node
-                if end_ns:
-                    nsmap_stack.pop()
-                    end_ns = False
-                if start_ns:
-                    nsmap_stack.append(nsmap_stack[-1].copy())
-                    nsmap_stack[-1].update(start_ns)
-                    ns_declarations[node] = start_ns
-                    start_ns = []
-                nsmaps[node] = nsmap_stack[-1]
-            elif event == 'start-ns':
-                start_ns.append(node)
-            else:
-                end_ns = True
+        if self._xml_parser == 'lxml':
+            # lxml elements have native namespace maps
+            for _, root in self._lxml_iterparse(resource, ()):
+                pass
+        else:
+            start_ns: List[Tuple[str, str]] = []
+            end_ns = False
+            events = 'start-ns', 'end-ns', 'start'
+            nsmap_stack: List[Dict[str, str]] = [{}]
+
+            for event, node in ElementTree.iterparse(resource, events):
+                if event == 'start':
+                    if root is None:
+                        root = node
+                    if end_ns:
+                        nsmap_stack.pop()
+                        end_ns = False
+                    if start_ns:
+                        nsmap_stack.append(nsmap_stack[-1].copy())
+                        nsmap_stack[-1].update(start_ns)
+                        ns_declarations[node] = start_ns
+                        nsmaps[node] = nsmap_stack[-1]
+                        start_ns = []
+                    elif root is node:
+                        nsmaps[node] = nsmap_stack[-1]
+                elif event == 'start-ns':
+                    start_ns.append(node)
+                else:
+                    end_ns = True
 
         assert root is not None
         self._root = root
         self._xpath_root = None
         self._nsmaps = nsmaps
         self._xmlns = ns_declarations
+        self._lazy_scopes = []
+        self._lazy_started = self._lazy_ended = None
+
+    def _lxml_iterparse(self, resource: IO[AnyStr], events: Tuple[str, ...]) \
+            -> Iterator[Tuple[str, ElementType]]:
+        # Parses the resource with a lxml pull parser. Data is fed as bytes, because
+        # lxml doesn't accept memoryview chunks, and text is fed encoded to UTF-8,
+        # overriding the encoding of the XML declaration. Internal entities are
+        # expanded like ElementTree does (lxml>=5.0), external entities never.
+        # Comments and processing instructions are removed like ElementTree does,
+        # so the text of an element is not split by them.
+        # Without events only the end of the root element is generated.
+        assert lxml_etree is not None
+        data = resource.read(65536)
+        parser = lxml_etree.XMLPullParser(
+            events,
+            encoding='utf-8' if isinstance(data, str) else None,
+            huge_tree=True,
+            resolve_entities='internal' if lxml_etree.LXML_VERSION >= (5,) else False,
+            remove_comments=True,
+            remove_pis=True
+        )
+
+        try:
+            while data:
+                if isinstance(data, str):
+                    parser.feed(data.encode('utf-8'))
+                else:
+                    parser.feed(bytes(data))
+                if events:
+                    yield from parser.read_events()
+                data = resource.read(65536)
+
+            root = parser.close()
+            if events:
+                yield from parser.read_events()
+            else:
+                yield 'end', root
+        except lxml_etree.XMLSyntaxError as err:
+            raise ElementTree.ParseError(str(err)) from None
 
     def _parse_resource(self, resource: IO[AnyStr],
                         url: Optional[str],
@@ -583,6 +903,21 @@ class XMLResource:
             self._url = _url
             raise
 
+    def _open_url(self, url: str) -> IO[Any]:
+        if self._memory_map and urlsplit(url).scheme in ('', 'file'):
+            if self._mmap is None or self._mmap.closed:
+                try:
+                    with open(str(LocationPath.from_uri(url)), 'rb') as fp:
+                        if os.fstat(fp.fileno()).st_size:
+                            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+                except OSError:
+                    pass  # fallback to urlopen() for reporting the error
+
+            if self._mmap is not None:
+                return cast(IO[Any], _MemoryMapReader(self._mmap))
+
+        return cast(IO[Any], urlopen(url, timeout=self._timeout))
+
     def _get_parsed_url(self, url: str) -> str:
         if isinstance(self._uri_mapper, MutableMapping):
             if url in self._uri_mapper:
@@ -604,13 +939,16 @@ class XMLResource:
             msg = "invalid value %r for the attribute 'lazy'"
             raise XMLSchemaValueError(msg % lazy)
 
+        self._mmap = None  # release the memory mapping of a previous source
+        self._index = None
+
         url: Optional[str]
         if isinstance(source, str):
             if is_url(source):
                 # source is a string containing a URL or a file path
                 url = self._get_parsed_url(source.strip())
 
-                with urlopen(url, timeout=self._timeout) as resource:
+                with self._open_url(url) as resource:
                     self._parse_resource(resource, url, lazy)
 
                 self._text = None
@@ -627,7 +965,7 @@ class XMLResource:
                 # source is a byte-string containing a URL or a file path
                 url = self._get_parsed_url(source.decode().strip())
 
-                with urlopen(url, timeout=self._timeout) as resource:
+                with self._open_url(url) as resource:
                     self._parse_resource(resource, url, lazy)
 
                 self._text = None
@@ -642,7 +980,7 @@ class XMLResource:
         elif isinstance(source, Path):
             url = self._get_parsed_url(str(source))
 
-            with urlopen(url, timeout=self._timeout) as resource:
+            with self._open_url(url) as resource:
                 self._parse_resource(resource, url, lazy)
 
             self._text = None
@@ -687,31 +1025,8 @@ class XMLResource:
             self._lazy = False
             self._nsmaps = {}
             self._xmlns = {}
-
-            if hasattr(self._root, 'xpath'):
-                nsmap = {}
-                lxml_nsmap = None
-                for elem in cast(Any, self._root.iter()):
-                    if callable(elem.tag):
-                        self._nsmaps[elem] = {}
-                        continue
-
-                    if lxml_nsmap != elem.nsmap:
-                        nsmap = {k or '': v for k, v in elem.nsmap.items()}
-                        lxml_nsmap = elem.nsmap
-
-                    parent = elem.getparent()
-                    if parent is None:
-                        ns_declarations = [(k or '', v) for k, v in nsmap.items()]
-                    elif parent.nsmap != elem.nsmap:
-                        ns_declarations = [(k or '', v) for k, v in elem.nsmap.items()
-                                           if k not in parent.nsmap or v != parent.nsmap[k]]
-                    else:
-                        ns_declarations = None
-
-                    self._nsmaps[elem] = nsmap
-                    if ns_declarations:
-                        self._xmlns[elem] = ns_declarations
+            self._lazy_scopes = []
+            self._lazy_started = self._lazy_ended = None
 
         self._parent_map = None
         self._source = source
@@ -725,20 +1040,61 @@ class XMLResource:
         if xpath_node is not None:
             return xpath_node
 
-        try:
-            return LazyElementNode(elem, nsmap=self._nsmaps[elem])
-        except KeyError:
+        nsmap = self.get_nsmap(elem)
+        if nsmap is None:
             return LazyElementNode(elem)
+        return LazyElementNode(elem, nsmap=nsmap)
 
     def get_nsmap(self, elem: ElementType) -> Optional[Dict[str, str]]:
         """
         Returns the namespace map (nsmap) of the element. Returns `None` if no nsmap is
-        found for the element. Lazy resources have only the nsmap for the root element.
+        found for the element. Lazy resources have only the nsmaps of the root, of the
+        elements at lazy depth or above, of the last started element and of the last
+        processed subtree.
         """
         try:
             return self._nsmaps[elem]
         except KeyError:
-            return getattr(elem, 'nsmap', None)  # an lxml element
+            pass
+
+        if hasattr(elem, 'xpath'):
+            # a lxml element, that has a native namespace map
+            return {k or '': v for k, v in cast(Any, elem).nsmap.items()}
+        elif self._nsmaps and not hasattr(elem, 'nsmap'):
+            if not self._lazy:
+                # Find the nearest ancestor that has a namespace map
+                parent_map = self.parent_map
+                try:
+                    while True:
+                        elem = cast(ElementType, parent_map[elem])
+                        if elem in self._nsmaps:
+                            return self._nsmaps[elem]
+                except KeyError:
+                    return None
+            elif self._lazy_started is not None and self._lazy_started[0] is elem:
+                return self._lazy_started[1]
+            elif self._lazy_ended is not None:
+                # Search the last processed subtree
+                for e, nsmap in self._iter_nsmaps(*self._lazy_ended):
+                    if e is elem:
+                        return nsmap
+
+        return getattr(elem, 'nsmap', None)  # e.g. a data element
+
+    def _iter_nsmaps(self, elem: ElementType, nsmap: Optional[Dict[str, str]] = None) \
+            -> Iterator[Tuple[ElementType, Optional[Dict[str, str]]]]:
+        # Iterates the subtree of elem with the namespace maps of the elements.
+        if hasattr(elem, 'nsmap'):
+            for e in elem.iter():
+                yield e, self.get_nsmap(e)
+            return
+
+        nsmaps = {elem: self.get_nsmap(elem) if nsmap is None else nsmap}
+        for e in elem.iter():
+            nsmap = nsmaps.pop(e)
+            yield e, nsmap
+            for child in e:
+                nsmaps[child] = self._nsmaps.get(child, nsmap)
 
     def get_xmlns(self, elem: ElementType) -> Optional[List[Tuple[str, str]]]:
         """
@@ -746,7 +1102,22 @@ class XMLResource:
         of the element. Returns `None` if the element doesn't have namespace declarations.
         Lazy resources have only the namespace declarations for the root element.
         """
-        return self._xmlns.get(elem)
+        try:
+            return self._xmlns[elem]
+        except KeyError:
+            if not hasattr(elem, 'xpath'):
+                return None
+
+        # a lxml element: get the declarations from the native namespace maps
+        nsmap = cast(Any, elem).nsmap
+        parent = cast(Any, elem).getparent()
+        if parent is None:
+            ns_declarations = [(k or '', v) for k, v in nsmap.items()]
+        else:
+            parent_nsmap = parent.nsmap
+            ns_declarations = [(k or '', v) for k, v in nsmap.items()
+                               if k not in parent_nsmap or v != parent_nsmap[k]]
+        return ns_declarations or None
 
     def get_absolute_path(self, path: Optional[str] = None) -> str:
         if path is None:
@@ -828,18 +1199,215 @@ class XMLResource:
 
         resource = XMLResource(elem, self.base_url, self._allow, self._defuse, self._timeout)
         if not hasattr(elem, 'nsmap'):
-            for e in elem.iter():
-                resource._nsmaps[e] = self._nsmaps[e]
-
+            for e, nsmap in self._iter_nsmaps(elem):
                 if e is elem:
-                    ns_declarations = [(k, v) for k, v in self._nsmaps[e].items()]
-                    if ns_declarations:
-                        resource._xmlns[e] = ns_declarations
+                    if nsmap is not None:
+                        resource._nsmaps[e] = nsmap
+                        if nsmap:
+                            resource._xmlns[e] = [(k, v) for k, v in nsmap.items()]
                 elif e in self._xmlns:
+                    resource._nsmaps[e] = cast(Dict[str, str], nsmap)
                     resource._xmlns[e] = self._xmlns[e]
 
         return resource
 
+    def build_index(self) -> XMLResourceIndex:
+        """
+        Builds an index of the elements at *lazy_depth* level of a lazy resource,
+        with a parsing pass on the XML data that doesn't build any element. The
+        index is used by :meth:`get_subresource` for parsing single elements
+        without reading the XML data that precedes them.
+        """
+        if not self._lazy:
+            raise XMLResourceError("cannot build an index of a fully loaded XML resource")
+
+        lazy_depth = int(self._lazy)
+        index = XMLResourceIndex(lazy_depth)
+        parser = expat.ParserCreate(None, '}')
+        tags: List[str] = []
+        scopes: List[Tuple[Tuple[str, str], ...]] = [()]
+        start_ns: List[Tuple[str, str]] = []
+        prolog_offsets = [-1, -1]  # the offsets of the DOCTYPE and of the root element
+
+        def xml_declaration(version: str, encoding: Optional[str], standalone: int) -> None:
+            if encoding:
+                index.encoding = encoding
+
+        def start_doctype(*args: Any) -> None:
+            prolog_offsets[0] = parser.CurrentByteIndex
+
+        def start_namespace(prefix: Optional[str], uri: str) -> None:
+            start_ns.append((prefix or '', uri))
+
+        def start_element(name: str, attrs: Any) -> None:
+            level = len(scopes) - 1
+            if not level:
+                prolog_offsets[1] = parser.CurrentByteIndex
+            if level < lazy_depth:
+                tags.append('{%s' % name if '}' in name else name)
+            elif level == lazy_depth:
+                index.append(parser.CurrentByteIndex, parser.CurrentLineNumber,
+                             '/%s/%s' % ('/'.join(tags), '{%s' % name if '}' in name else name),
+                             scopes[-1])
+
+            if start_ns:
+                scope = dict(scopes[-1])
+                scope.update(start_ns)
+                scopes.append(tuple(scope.items()))
+                start_ns.clear()
+            else:
+                scopes.append(scopes[-1])
+
+        def end_element(name: str) -> None:
+            scopes.pop()
+            if len(scopes) <= lazy_depth:
+                tags.pop()
+
+        def forbidden_entity(*args: Any) -> None:
+            raise ElementTree.ParseError("Entities are forbidden")
+
+        def forbidden_external_entity(context: str, base: Optional[str],
+                                      system_id: Optional[str],
+                                      public_id: Optional[str]) -> int:
+            raise ElementTree.ParseError("Entities are forbidden")
+
+        parser.XmlDeclHandler = xml_declaration
+        parser.StartDoctypeDeclHandler = start_doctype
+        parser.StartNamespaceDeclHandler = start_namespace
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        if self._is_defused():
+            parser.EntityDeclHandler = forbidden_entity
+            parser.UnparsedEntityDeclHandler = forbidden_entity
+            parser.ExternalEntityRefHandler = forbidden_external_entity
+
+        resource = self.open()
+        try:
+            data = resource.read(65536)
+            if isinstance(data, str):
+                raise XMLResourceError("cannot build an index of a text XML resource")
+            elif data[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+                index.encoding = 'utf-16'
+
+            prolog = bytearray()
+            while data:
+                if prolog_offsets[1] < 0:
+                    prolog += data
+                parser.Parse(data, False)
+                data = resource.read(65536)
+            parser.Parse(b'', True)
+
+            if prolog_offsets[0] >= 0:
+                # the handler is called after the name of the DOCTYPE declaration
+                start = prolog.rfind(b'<!DOCTYPE', 0, prolog_offsets[0])
+                if start >= 0:
+                    index.doctype = bytes(prolog[start:prolog_offsets[1]])
+        except expat.ExpatError as err:
+            raise ElementTree.ParseError(str(err)) from None
+        finally:
+            if self._source is not resource:
+                resource.close()
+
+        self._index = index
+        return index
+
+    def get_subresource(self, k: int) -> 'XMLResource':
+        """
+        Parses the k-th element at *lazy_depth* level of a lazy resource, seeking
+        the position of the element in the XML data with the index of the resource,
+        that is built at first call. Returns a fully loaded :class:`XMLResource`
+        instance with the element as root, that includes the namespace declarations
+        of the element's ancestors. The DOCTYPE declaration of the XML data is
+        parsed before the element. A negative *k* counts from the last element.
+        """
+        index = self._index if self._index is not None else self.build_index()
+        offset, _line, _path = index[k]
+        xmlns = index.get_xmlns(k)
+
+        if codecs.lookup(index.encoding).name.startswith(('utf-16', 'utf-32')):
+            msg = "cannot parse a single element of a {!r} encoded resource"
+            raise XMLResourceError(msg.format(index.encoding))
+
+        # Parse the element inside a container that declares the namespace context,
+        # after the DOCTYPE declaration that can provide entities and default attributes.
+        container = '<_ %s>' % ' '.join(
+            'xmlns%s=%s' % (':' + pfx if pfx else '', quoteattr(uri)) for pfx, uri in xmlns
+        )
+        events = 'start-ns', 'end-ns', 'start', 'end'
+        if self._is_defused():
+            safe_parser = SafeXMLParser(target=PyElementTree.TreeBuilder())
+            parser = PyElementTree.XMLPullParser(events, _parser=safe_parser)
+        else:
+            parser = ElementTree.XMLPullParser(events)
+        parser.feed(f'<?xml version="1.0" encoding="{index.encoding}"?>\n'.encode('ascii'))
+        parser.feed(index.doctype)
+        parser.feed(container.encode(index.encoding, 'xmlcharrefreplace'))
+
+        elem: Optional[ElementType] = None
+        level = 0
+        start_ns: List[Tuple[str, str]] = []
+        end_ns = False
+        nsmaps: Dict[ElementType, Dict[str, str]] = {}
+        ns_declarations: Dict[ElementType, List[Tuple[str, str]]] = {}
+        nsmap_stack: List[Dict[str, str]] = [{}]
+
+        resource = self.open()
+        try:
+            if resource.seekable():
+                resource.seek(offset)
+            else:
+                while offset > 0:  # skip the data of a non-seekable resource
+                    offset -= len(resource.read(min(offset, 65536))) or offset
+
+            while elem is None:
+                data = resource.read(65536)
+                if not data:
+                    parser.close()  # raises a parse error for truncated data
+                parser.feed(data)
+
+                for event, node in parser.read_events():
+                    if event == 'start':
+                        if end_ns:
+                            nsmap_stack.pop()
+                            end_ns = False
+                        if start_ns:
+                            nsmap_stack.append(nsmap_stack[-1].copy())
+                            nsmap_stack[-1].update(start_ns)
+                            ns_declarations[node] = start_ns
+                            start_ns = []
+                        nsmaps[node] = nsmap_stack[-1]
+                        level += 1
+                    elif event == 'end':
+                        if end_ns:
+                            nsmap_stack.pop()
+                            end_ns = False
+                        level -= 1
+                        if level == 1:
+                            elem = node
+                            break
+                    elif event == 'start-ns':
+                        start_ns.append(node)
+                    else:
+                        end_ns = True
+        except PyElementTree.ParseError as err:
+            raise ElementTree.ParseError(str(err)) from None
+        finally:
+            if self._source is not resource:
+                resource.close()
+
+        assert elem is not None
+        subresource = XMLResource(elem, self.base_url, self._allow, self._defuse, self._timeout)
+        for e in elem.iter():
+            if e is elem:
+                subresource._nsmaps[e] = nsmaps[e]
+                if nsmaps[e]:
+                    subresource._xmlns[e] = [(k, v) for k, v in nsmaps[e].items()]
+            elif e in ns_declarations:
+                subresource._nsmaps[e] = nsmaps[e]
+                subresource._xmlns[e] = ns_declarations[e]
+
+        return subresource
+
     def open(self) -> IO[AnyStr]:
         """
         Returns an opened resource reader object for the instance URL. If the
@@ -852,7 +1420,7 @@ class XMLResource:
             raise XMLResourceError(f"can't open, {self!r} has no URL associated")
 
         try:
-            return cast(IO[AnyStr], urlopen(self._url, timeout=self._timeout))
+            return self._open_url(self._url)
         except URLError as err:
             msg = "cannot access to resource %(url)r: %(reason)s"
             raise XMLResourceError(msg % {'url': self._url, 'reason': err.reason})
@@ -877,9 +1445,17 @@ class XMLResource:
 
     def close(self) -> None:
         """
-        Close the XML resource if it's created with a file-like object.
-        In other cases this method has no effect.
+        Close the XML resource if it's created with a file-like object, or
+        release the memory mapping of the file. In other cases this method
+        has no effect.
         """
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # still in use by an iteration, unmapped at its end
+            self._mmap = None
+
         try:
             self._source.close()  # type: ignore[union-attr]
         except (AttributeError, TypeError):
@@ -905,13 +1481,13 @@ class XMLResource:
             if resource is not self._source:
                 resource.close()
 
-        if isinstance(data, bytes):
+        if isinstance(data, str):
+            text = data
+        else:
             try:
-                text = data.decode('utf-8')
+                text = str(data, 'utf-8')
             except UnicodeDecodeError:
-                text = data.decode('iso-8859-1')
-        else:
-            text = data
+                text = str(data, 'iso-8859-1')
 
         self._text = text
 
@@ -1043,6 +1619,74 @@ class XMLResource:
             if self._source is not resource:
                 resource.close()
 
+    def iter_stream(self, path: str,
+                    namespaces: Optional[NamespacesType] = None,
+                    ancestors: Optional[List[ElementType]] = None) -> Iterator[ElementType]:
+        """
+        Streams the complete subtrees selected by a path. On lazy resources, if the
+        path is a sequence of name tests or wildcards (e.g. '/root/section/record'),
+        the elements are matched during parsing and each yielded subtree is removed
+        from the tree when the iteration is resumed, together with the subtrees that
+        cannot match the path. So the memory usage is bounded by the size of selected
+        subtrees instead of the size of the XML document. In other cases the method
+        is equivalent to :meth:`iterfind`.
+
+        :param path: an XPath expression that selects element nodes.
+        :param namespaces: an optional mapping from namespace prefixes to URIs \
+        used for resolving the prefixed names of the path.
+        :param ancestors: provide a list for tracking the ancestors of yielded elements.
+        """
+        steps = get_stream_steps(path, namespaces) if self._lazy else None
+        if steps is None or len(steps) < 2:
+            yield from self.iterfind(path, namespaces, ancestors)
+            return
+
+        if ancestors is not None:
+            ancestors.clear()
+        else:
+            ancestors = []
+
+        resource = self.open()
+        path_depth = len(steps) - 1
+        lazy_depth = int(self._lazy)
+        matching = [True]  # matching status of ancestors and of current element
+        level = 0
+
+        try:
+            for event, node in self._lazy_iterparse(resource):
+                if event == "start":
+                    if level <= path_depth:
+                        matching.append(matching[-1] and steps[level] in ('*', node.tag))
+                        if level < path_depth:
+                            ancestors.append(node)
+                    level += 1
+                    continue
+
+                level -= 1
+                if level > path_depth:
+                    continue
+                elif level < path_depth:
+                    ancestors.pop()
+
+                if matching.pop() and level == path_depth:
+                    yield node
+
+                if level:
+                    # Remove the subtree, it has been yielded or it cannot match
+                    self._lazy_clear_scopes(level - 1)
+                    if level < lazy_depth:
+                        for e in node.iter():
+                            self._nsmaps.pop(e, None)
+                            self._xmlns.pop(e, None)
+                    elif level == lazy_depth:
+                        self._nsmaps.pop(node, None)
+                        self._xmlns.pop(node, None)
+                    ancestors[-1].remove(node)
+                    self.xpath_root.children.clear()
+        finally:
+            if self._source is not resource:
+                resource.close()
+
     def _select_elements(self, token: XPathToken,
                          node: ResourceNodeType,
                          ancestors: Optional[List[ElementType]] = None) -> Iterator[ElementType]:
@@ -1161,13 +1805,18 @@ class XMLResource:
         :return: a dictionary for mapping namespace prefixes to full URI.
         """
         namespaces = get_namespace_map(namespaces)
+        if root_only:
+            # The root is already parsed: don't reopen and parse again a lazy resource
+            xmlns = self.get_xmlns(self._root)
+            if xmlns:
+                update_namespaces(namespaces, xmlns, True)
+            return namespaces
 
         try:
             for elem in self.iter():
-                if elem in self._xmlns:
-                    update_namespaces(namespaces, self._xmlns[elem], elem is self._root)
-                if root_only:
-                    break
+                xmlns = self.get_xmlns(elem)
+                if xmlns:
+                    update_namespaces(namespaces, xmlns, elem is self._root)
         except (ElementTree.ParseError, PyElementTree.ParseError, UnicodeEncodeError):
             return namespaces  # a lazy resource with malformed XML data
         else:
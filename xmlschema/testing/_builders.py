@@ -555,10 +555,12 @@ def make_validation_test_class(test_file, test_args, test_num, schema_class, che
         def check_validate_and_is_valid_api(self):
             if expected_errors:
                 self.assertFalse(self.schema.is_valid(xml_file), msg=xml_file)
+                self.assertFalse(self.schema.is_valid(xml_file, fail_fast=True), msg=xml_file)
                 with self.assertRaises(XMLSchemaValidationError, msg=xml_file):
                     self.schema.validate(xml_file)
             else:
                 self.assertTrue(self.schema.is_valid(xml_file), msg=xml_file)
+                self.assertTrue(self.schema.is_valid(xml_file, fail_fast=True), msg=xml_file)
                 self.assertIsNone(self.schema.validate(xml_file), msg=xml_file)
 
         def check_iter_errors(self):
@@ -577,6 +579,9 @@ def make_validation_test_class(test_file, test_args, test_num, schema_class, che
                 self.assertIsInstance(e.reason, str, msg=xml_file)
             self.assertEqual(len(errors), expected_errors, msg=xml_file)
 
+            fail_fast_errors = list(self.schema.iter_errors(xml_file, fail_fast=True))
+            self.assertEqual(len(fail_fast_errors), min(expected_errors, 1), msg=xml_file)
+
             module_api_errors = list(xmlschema.iter_errors(xml_file, schema=self.schema))
             self.assertEqual(len(errors), len(module_api_errors), msg=xml_file)
             for e, api_error in zip(errors, module_api_errors):
@@ -36,6 +36,9 @@ from .groups import XsdGroup, Xsd11Group
 from .elements import XsdElement, Xsd11Element, XsdAlternative
 
 from .global_maps import XsdGlobals
+from .caching import SchemaCache, TrustedSources, ValidationCache
+from .profiling import ValidationProfiler
+from .parallel import ValidationSummary
 from .schemas import XMLSchemaMeta, XMLSchemaBase, XMLSchema, XMLSchema10, XMLSchema11
 
 
@@ -58,5 +61,7 @@ __all__ = [
     'XsdAtomicBuiltin', 'XsdAtomicRestriction', 'Xsd11AtomicRestriction', 'XsdList',
     'XsdUnion', 'Xsd11Union', 'XsdComplexType', 'Xsd11ComplexType', 'ModelVisitor',
     'XsdGroup', 'Xsd11Group', 'XsdElement', 'Xsd11Element', 'XsdAlternative', 'XsdGlobals',
-    'XMLSchemaMeta', 'XMLSchemaBase', 'XMLSchema', 'XMLSchema10', 'XMLSchema11'
+    'SchemaCache', 'TrustedSources', 'ValidationCache', 'ValidationProfiler',
+    'ValidationSummary', 'XMLSchemaMeta', 'XMLSchemaBase', 'XMLSchema', 'XMLSchema10',
+    'XMLSchema11'
 ]
@@ -131,6 +131,12 @@ class XsdAssert(XsdComponent, ElementPathMixin[Union['XsdAssert', SchemaElementT
             if self.parser.variable_types:
                 self.parser.variable_types.clear()
 
+    def _bind_parser(self) -> None:
+        assert self.parser is not None
+        with self._xpath_lock:
+            if not self.parser.is_schema_bound() and self.parser.schema:
+                self.parser.schema.bind_parser(self.parser)
+
     def __call__(self, elem: ElementType,
                  value: Any = None,
                  namespaces: Optional[NamespacesType] = None,
@@ -139,10 +145,8 @@ class XsdAssert(XsdComponent, ElementPathMixin[Union['XsdAssert', SchemaElementT
 
         if self.parser is None or self.token is None:
             raise XMLSchemaNotBuiltError(self, 'schema bound parser not set')
-
-        with self._xpath_lock:
-            if not self.parser.is_schema_bound() and self.parser.schema:
-                self.parser.schema.bind_parser(self.parser)
+        elif not self.parser.is_schema_bound():
+            self._bind_parser()
 
         if namespaces is None or isinstance(namespaces, dict):
             _namespaces = namespaces
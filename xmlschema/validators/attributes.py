@@ -658,6 +658,12 @@ class XsdAttributeGroup(
     def iter_decode(self, obj: MutableMapping[str, str], validation: str = 'lax',
                     use_defaults: bool = True, **kwargs: Any) \
             -> IterDecodeType[List[Tuple[str, Any]]]:
+        if 'profiler' in kwargs and kwargs['profiler'].enter(self):
+            yield from kwargs['profiler'].iter_profile(
+                self, obj, validation, dict(kwargs, use_defaults=use_defaults)
+            )
+            return
+
         if not obj and not self:
             return
 
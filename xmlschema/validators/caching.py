@@ -0,0 +1,661 @@
+#
+# Copyright (c), 2016-2024, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+This module contains a persistent on-disk cache for built schemas, a registry
+of trusted schema sources and a cache of the validation outcomes of XML subtrees.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING, cast, Any, Dict, IO, Iterable, Iterator, \
+    List, MutableMapping, Optional, Set, Tuple, Union
+from urllib.request import urlopen
+
+import elementpath
+
+from ..exceptions import XMLSchemaTypeError, XMLSchemaValueError
+from ..names import XSD_IDREF, XSD_ASSERTION, XSI_TYPE
+from ..aliases import ElementType, NamespacesType, SchemaElementType
+from ..resources import XMLResource
+from .xsdbase import XsdComponent, XsdType
+from .wildcards import XsdAnyElement, XsdAnyAttribute
+from .simple_types import XsdSimpleType, XsdList, XsdUnion
+from .elements import XsdElement
+
+if TYPE_CHECKING:
+    from .schemas import XMLSchemaBase  # noqa: F401
+
+logger = logging.getLogger('xmlschema')
+
+CACHE_FORMAT_VERSION = 1
+"""The version of the format of cache entries, changed on incompatible updates."""
+
+
+def get_url_digest(url: str, timeout: int = 300) -> str:
+    """Returns the SHA-256 hex digest of the data of a resource URL."""
+    digest = hashlib.sha256()
+    with urlopen(url, timeout=timeout) as fp:
+        for chunk in iter(lambda: fp.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_resource_digest(resource: XMLResource) -> str:
+    """
+    Returns the SHA-256 hex digest of the data of an XML resource. For resources
+    without a URL the digest is computed on the XML text or on its serialization.
+    """
+    if resource.url is not None:
+        return get_url_digest(resource.url, resource.timeout)
+
+    text = resource.text if resource.text is not None else resource.tostring()
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def option_repr(value: Any) -> str:
+    """A reproducible representation of an option value, used for building cache keys."""
+    if isinstance(value, MutableMapping):
+        return repr(sorted((k, option_repr(v)) for k, v in value.items()))
+    elif isinstance(value, (list, tuple)):
+        return repr([option_repr(v) for v in value])
+    elif callable(value):
+        return '%s.%s' % (getattr(value, '__module__', ''),
+                          getattr(value, '__qualname__', type(value).__qualname__))
+    return repr(value)
+
+
+class _SchemaPickler(pickle.Pickler):
+    """Pickler that serializes the schema and the shared meta-schema objects by reference."""
+
+    def __init__(self, file: IO[bytes], schema: 'XMLSchemaBase',
+                 references: Dict[int, Tuple[Any, ...]]) -> None:
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.schema = schema
+        self.references = references
+
+    def persistent_id(self, obj: Any) -> Optional[Tuple[Any, ...]]:
+        if obj is self.schema:
+            return 'schema',
+        return self.references.get(id(obj))
+
+
+class _SchemaUnpickler(pickle.Unpickler):
+    """Unpickler that restores the references to the schema and to meta-schema objects."""
+
+    def __init__(self, file: IO[bytes], schema: 'XMLSchemaBase') -> None:
+        super().__init__(file)
+        self.schema = schema
+
+    def persistent_load(self, pid: Tuple[Any, ...]) -> Any:
+        meta_schema = type(self.schema).meta_schema
+        assert meta_schema is not None
+
+        if pid[0] == 'schema':
+            return self.schema
+        elif pid[0] == 'maps':
+            return meta_schema.maps
+        elif pid[0] == 'meta_schema':
+            for schema in meta_schema.maps.iter_schemas():
+                if schema.url == pid[1]:
+                    return schema
+        elif pid[0] == 'component':
+            obj = meta_schema.maps.global_maps[pid[1]].get(pid[2])
+            if isinstance(obj, XsdComponent):
+                return obj
+
+        raise pickle.UnpicklingError(f"unresolvable persistent reference {pid!r}")
+
+
+class SchemaCache:
+    """
+    A persistent on-disk cache of built schemas. Each entry stores the state of a
+    schema instance, with its global maps, in a file of the cache directory named
+    by a key computed from the schema class, the sources digest and the options.
+    An entry is valid only if the digests of all the included and imported schema
+    resources are unchanged and if the cache format, the Python version and the
+    versions of xmlschema and elementpath are the same of the current runtime.
+
+    The entries are composed by a JSON header line followed by pickled data, so
+    the cache directory has to be trusted and not writable by other users.
+
+    :param path: the path of the cache directory, created if it doesn't exist.
+    """
+    suffix = '.xsdcache'
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        if not isinstance(path, (str, Path)):
+            msg = "invalid type %r for argument 'path'"
+            raise XMLSchemaTypeError(msg % type(path))
+
+        self.path = str(path)
+        os.makedirs(self.path, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return '%s(path=%r)' % (self.__class__.__name__, self.path)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.iter_paths())
+
+    @property
+    def runtime_info(self) -> Dict[str, Any]:
+        """Runtime information that has to match with the header of a valid entry."""
+        from .. import __version__
+
+        return {
+            'format': CACHE_FORMAT_VERSION,
+            'xmlschema': __version__,
+            'elementpath': elementpath.__version__,
+            'python': '%d.%d' % sys.version_info[:2],
+        }
+
+    def iter_paths(self) -> Iterable[str]:
+        """Iterates the file paths of the cache entries."""
+        for name in sorted(os.listdir(self.path)):
+            if name.endswith(self.suffix):
+                yield os.path.join(self.path, name)
+
+    def get_path(self, key: str) -> str:
+        """Returns the file path of a cache entry."""
+        return os.path.join(self.path, key + self.suffix)
+
+    def get_key(self, schema_class: type,
+                sources: Iterable[XMLResource],
+                **options: Any) -> str:
+        """
+        Returns the key of the cache entry for a schema.
+
+        :param schema_class: the schema class.
+        :param sources: the XML resources of the schema sources. Both the URL and \
+        the data digest of each resource are used for the key.
+        :param options: the options that affect the build of the schema.
+        """
+        digest = hashlib.sha256()
+        digest.update('{}:{}.{}:{}'.format(
+            CACHE_FORMAT_VERSION, schema_class.__module__,
+            schema_class.__qualname__, getattr(schema_class, 'XSD_VERSION', None)
+        ).encode('utf-8'))
+
+        for resource in sources:
+            digest.update(f'{resource.url}:'.encode('utf-8'))
+            digest.update(get_resource_digest(resource).encode('ascii'))
+        for name, value in sorted(options.items()):
+            digest.update(f'{name}={option_repr(value)}'.encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_references(schema: 'XMLSchemaBase') -> Dict[int, Tuple[Any, ...]]:
+        """
+        Returns a map from object ids to persistent references for the objects
+        of the meta-schema, that are shared and not stored into cache entries.
+        """
+        meta_schema = type(schema).meta_schema
+        if meta_schema is None:
+            return {}
+
+        references: Dict[int, Tuple[Any, ...]] = {id(meta_schema.maps): ('maps',)}
+        for s in meta_schema.maps.iter_schemas():
+            if s.url is not None:
+                references[id(s)] = 'meta_schema', s.url
+
+        for k, global_map in enumerate(meta_schema.maps.global_maps):
+            for name, obj in global_map.items():
+                if isinstance(obj, XsdComponent):
+                    references[id(obj)] = 'component', k, name
+        return references
+
+    def load(self, schema: 'XMLSchemaBase', key: str) -> bool:
+        """
+        Loads the state of a schema instance from a cache entry. Returns `True`
+        if a valid entry is found and loaded, `False` otherwise.
+
+        :param schema: the schema instance to restore.
+        :param key: the key of the cache entry.
+        """
+        path = self.get_path(key)
+        try:
+            fp = open(path, 'rb')
+        except OSError:
+            return False
+
+        with fp:
+            try:
+                header = json.loads(fp.readline())
+                if any(header.get(k) != v for k, v in self.runtime_info.items()):
+                    logger.debug("Discard cache entry %r: runtime mismatch", path)
+                    return False
+
+                for url, digest in header['manifest']:
+                    if get_url_digest(url, schema.timeout) != digest:
+                        logger.debug("Discard cache entry %r: %r is changed", path, url)
+                        return False
+
+                payload = fp.read()
+                if hashlib.sha256(payload).hexdigest() != header['checksum']:
+                    logger.debug("Discard cache entry %r: checksum mismatch", path)
+                    return False
+
+                state = _SchemaUnpickler(BytesIO(payload), schema).load()
+            except (OSError, ValueError, LookupError, TypeError,
+                    AttributeError, EOFError, pickle.UnpicklingError) as err:
+                logger.debug("Discard cache entry %r: %s", path, err)
+                return False
+
+        schema.__setstate__(state)
+        logger.debug("Schema %r loaded from cache entry %r", schema, path)
+        return True
+
+    def store(self, schema: 'XMLSchemaBase', key: str) -> bool:
+        """
+        Stores the state of a built schema instance into a cache entry. Returns
+        `True` if the entry is written, `False` if the schema can't be stored.
+
+        :param schema: the schema instance to store.
+        :param key: the key of the cache entry.
+        """
+        references = self.get_references(schema)
+        manifest: List[Tuple[str, str]] = []
+        buffer = BytesIO()
+
+        try:
+            for s in schema.maps.iter_schemas():
+                if s.url is not None and id(s) not in references:
+                    manifest.append((s.url, get_url_digest(s.url, s.timeout)))
+
+            _SchemaPickler(buffer, schema, references).dump(schema.__getstate__())
+        except (OSError, TypeError, AttributeError, pickle.PicklingError) as err:
+            logger.debug("Cannot store %r into the cache: %s", schema, err)
+            return False
+
+        payload = buffer.getvalue()
+        header = self.runtime_info
+        header['manifest'] = manifest
+        header['checksum'] = hashlib.sha256(payload).hexdigest()
+
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.path)
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(json.dumps(header).encode('utf-8'))
+                fp.write(b'\n')
+                fp.write(payload)
+            os.replace(tmp_path, self.get_path(key))
+        except OSError as err:
+            logger.debug("Cannot store %r into the cache: %s", schema, err)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+        logger.debug("Schema %r stored into cache entry %r", schema, self.get_path(key))
+        return True
+
+    def remove(self, key: str) -> None:
+        """Removes a cache entry, if it exists."""
+        try:
+            os.remove(self.get_path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Removes all the entries of the cache."""
+        for path in self.iter_paths():
+            os.remove(path)
+
+
+class TrustedSources:
+    """
+    A registry of the schema sources that have already passed the validation with
+    the meta-schema. A schema document whose digest is registered is not validated
+    again with the meta-schema, the parsing and the checks of its components are
+    instead always performed. The digest of a source is computed on its data, on
+    the namespace map used for validation, on the meta-schema and on the version
+    of the package.
+
+    :param path: an optional file path for making the registry persistent. The \
+    digests are loaded from the file at initialization and new digests are appended \
+    to the file when they are added to the registry.
+    """
+    def __init__(self, path: Union[None, str, Path] = None) -> None:
+        if path is not None and not isinstance(path, (str, Path)):
+            msg = "invalid type %r for argument 'path'"
+            raise XMLSchemaTypeError(msg % type(path))
+
+        self.path = str(path) if path is not None else None
+        self.lock = threading.Lock()
+        self._digests: Set[str] = set()
+
+        if self.path is not None and os.path.isfile(self.path):
+            with open(self.path) as fp:
+                self._digests.update(line.strip() for line in fp if line.strip())
+
+    def __repr__(self) -> str:
+        return '%s(path=%r)' % (self.__class__.__name__, self.path)
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def __contains__(self, digest: object) -> bool:
+        return digest in self._digests
+
+    def __iter__(self) -> Iterator[str]:
+        yield from sorted(self._digests)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop('lock', None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_digest(resource: XMLResource,
+                   meta_schema: 'XMLSchemaBase',
+                   namespaces: Optional[MutableMapping[str, str]] = None) -> str:
+        """
+        Returns the digest of a schema source for the registry.
+
+        :param resource: the XML resource of the schema source.
+        :param meta_schema: the meta-schema used for validating the source.
+        :param namespaces: the namespace map used for validating the source.
+        """
+        from .. import __version__
+
+        digest = hashlib.sha256()
+        digest.update('{}:{}:{}:{}'.format(
+            __version__, elementpath.__version__,
+            meta_schema.__class__.__qualname__, meta_schema.url
+        ).encode('utf-8'))
+        if namespaces:
+            digest.update(repr(sorted(namespaces.items())).encode('utf-8'))
+        digest.update(get_resource_digest(resource).encode('ascii'))
+        return digest.hexdigest()
+
+    def add(self, digest: str) -> None:
+        """Registers the digest of a schema source that is valid for its meta-schema."""
+        with self.lock:
+            if digest in self._digests:
+                return
+            self._digests.add(digest)
+
+            if self.path is not None:
+                try:
+                    with open(self.path, 'a') as fp:
+                        fp.write(digest + '\n')
+                except OSError as err:
+                    logger.debug("Cannot write trusted source digest to %r: %s",
+                                 self.path, err)
+
+    def discard(self, digest: str) -> None:
+        """Removes a digest from the registry, if it's registered."""
+        with self.lock:
+            self._digests.discard(digest)
+            if self.path is not None and os.path.isfile(self.path):
+                with open(self.path, 'w') as fp:
+                    fp.writelines(x + '\n' for x in sorted(self._digests))
+
+    def clear(self) -> None:
+        """Removes all the digests from the registry."""
+        with self.lock:
+            self._digests.clear()
+            if self.path is not None and os.path.isfile(self.path):
+                os.remove(self.path)
+
+
+class _Fingerprint:
+    """
+    The structural fingerprint of an XML subtree, that includes the tags,
+    the attributes, the text and the tails of the elements. The hash value is
+    computed once from the data of the element and from the hash values of
+    the fingerprints of the children.
+    """
+    __slots__ = ('_hash', 'data')
+
+    def __init__(self, data: Tuple[Any, ...]) -> None:
+        self._hash = hash(data)
+        self.data = data
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        return self is other or isinstance(other, _Fingerprint) and \
+            self._hash == other._hash and self.data == other.data
+
+    @property
+    def children(self) -> List[Optional['_Fingerprint']]:
+        return [x[0] for x in self.data[3]]
+
+
+class ValidationCache:
+    """
+    A bounded LRU cache of the outcomes of the validation of XML subtrees, useful
+    for validating documents with many repeated subtrees. The entries are keyed by
+    the XSD element declaration, by the namespace map and by a structural fingerprint
+    of the subtree (tags, attributes, text and tails), so a subtree that matches a
+    cached entry is known to be valid and is not validated again.
+
+    Only the subtrees of elements whose declarations don't involve identity
+    constraints, ID/IDREF values, assertions, type alternatives or not skipped
+    wildcards are cached. Also the subtrees that contain *xsi:type* attributes or
+    internal namespace declarations are always validated.
+
+    :param maxsize: the maximum number of cached validation outcomes.
+    """
+    def __init__(self, maxsize: int = 1024) -> None:
+        if not isinstance(maxsize, int) or isinstance(maxsize, bool):
+            msg = "invalid type %r for argument 'maxsize'"
+            raise XMLSchemaTypeError(msg % type(maxsize))
+        elif maxsize < 1:
+            raise XMLSchemaValueError("argument 'maxsize' must be a positive integer")
+
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self.lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple[Any, ...], None]' = OrderedDict()
+        self._elements: Dict[XsdElement, bool] = {}
+        self._types: Dict[XsdType, bool] = {}
+
+    def __repr__(self) -> str:
+        return '%s(maxsize=%r)' % (self.__class__.__name__, self.maxsize)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop('lock', None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def clear(self) -> None:
+        """Removes all the entries and resets the statistics of the cache."""
+        with self.lock:
+            self._entries.clear()
+            self._elements.clear()
+            self._types.clear()
+            self.hits = self.misses = 0
+
+    def is_cacheable(self, xsd_element: XsdElement) -> bool:
+        """
+        Returns `True` if the validation outcomes of the instances of an
+        XSD element declaration can be cached, `False` otherwise.
+        """
+        try:
+            return self._elements[xsd_element]
+        except KeyError:
+            pass
+
+        # Recursive declarations are considered not cacheable until checked
+        self._elements[xsd_element] = False
+
+        if xsd_element.identities or xsd_element.selected_by or \
+                getattr(xsd_element, 'alternatives', None):
+            result = False
+        else:
+            result = self._is_cacheable_type(xsd_element.type) and \
+                all(self.is_cacheable(e) for e in xsd_element.iter_substitutes())
+
+        self._elements[xsd_element] = result
+        return result
+
+    def _is_cacheable_type(self, xsd_type: XsdType) -> bool:
+        try:
+            return self._types[xsd_type]
+        except KeyError:
+            pass
+
+        self._types[xsd_type] = False
+        result = True
+
+        if isinstance(xsd_type, XsdSimpleType):
+            if isinstance(xsd_type, XsdList):
+                result = self._is_cacheable_type(xsd_type.item_type)
+            elif isinstance(xsd_type, XsdUnion):
+                result = all(self._is_cacheable_type(mt) for mt in xsd_type.member_types)
+            elif xsd_type.is_key() or xsd_type.name == XSD_IDREF or \
+                    xsd_type.is_derived(xsd_type.maps.types[XSD_IDREF]):
+                result = False
+            else:
+                base_type: Any = xsd_type
+                while base_type is not None:
+                    if XSD_ASSERTION in getattr(base_type, 'facets', ()):
+                        result = False
+                        break
+                    base_type = base_type.base_type
+        elif getattr(xsd_type, 'assertions', None):
+            result = False
+        else:
+            for attribute in getattr(xsd_type, 'attributes', {}).values():
+                if isinstance(attribute, XsdAnyAttribute):
+                    if attribute.process_contents != 'skip':
+                        result = False
+                        break
+                elif not self._is_cacheable_type(attribute.type):
+                    result = False
+                    break
+            else:
+                content = getattr(xsd_type, 'content', None)
+                if isinstance(content, XsdSimpleType):
+                    result = self._is_cacheable_type(content)
+                elif content is not None:
+                    for wildcard in (content.interleave, content.suffix):
+                        if wildcard is not None and wildcard.process_contents != 'skip':
+                            result = False
+
+                    for e in content.iter_elements():
+                        if not result:
+                            break
+                        elif isinstance(e, XsdAnyElement):
+                            result = e.process_contents == 'skip'
+                        else:
+                            result = self.is_cacheable(e)
+
+        self._types[xsd_type] = result
+        return result
+
+    def get_fingerprint(self, elem: ElementType, resource: XMLResource,
+                        inner: bool = False) -> Optional[_Fingerprint]:
+        """
+        Returns the structural fingerprint of an XML subtree, or `None` if the
+        subtree contains *xsi:type* attributes or internal namespace declarations.
+
+        :param elem: the root element of the subtree.
+        :param resource: the XML resource that contains the element.
+        :param inner: if `True` the namespace declarations of the provided element \
+        are considered internal.
+        """
+        if callable(elem.tag):
+            return _Fingerprint((elem.tag, (), elem.text, ()))
+        elif XSI_TYPE in elem.attrib or inner and resource.get_xmlns(elem):
+            return None
+
+        children = []
+        for child in elem:
+            fingerprint = self.get_fingerprint(child, resource, True)
+            if fingerprint is None:
+                return None
+            children.append((fingerprint, child.tail))
+
+        return _Fingerprint(
+            (elem.tag, tuple(elem.attrib.items()), elem.text, tuple(children))
+        )
+
+    def get_children_fingerprints(self, elem: ElementType, kwargs: Dict[str, Any]) \
+            -> Optional[List[Optional[_Fingerprint]]]:
+        """
+        Returns the fingerprints of the children of an element that is under
+        validation, or `None` if the validation outcomes can't be cached with
+        the provided validation options. A fingerprint of the element, passed
+        down with the *fingerprint* option, is used if it's available.
+        """
+        if 'extra_validator' in kwargs or 'validation_hook' in kwargs or \
+                'max_depth' in kwargs or 'use_location_hints' in kwargs:
+            return None
+
+        try:
+            item, fingerprint = kwargs['fingerprint']
+        except KeyError:
+            pass
+        else:
+            if item is elem:
+                return cast(_Fingerprint, fingerprint).children
+
+        try:
+            resource = kwargs['source']
+        except KeyError:
+            return None
+        else:
+            if not isinstance(resource, XMLResource):
+                return None
+        return [self.get_fingerprint(child, resource) for child in elem]
+
+    def get_key(self, xsd_element: SchemaElementType,
+                fingerprint: Optional[_Fingerprint],
+                namespaces: NamespacesType) -> Optional[Tuple[Any, ...]]:
+        """
+        Returns the cache key for the validation of an XML subtree with an
+        XSD element declaration, or `None` if the subtree is not cacheable.
+        """
+        if fingerprint is None or not isinstance(xsd_element, XsdElement) \
+                or not self.is_cacheable(xsd_element):
+            return None
+        return xsd_element, tuple(namespaces.items()), fingerprint
+
+    def lookup(self, key: Tuple[Any, ...]) -> bool:
+        """Returns `True` if the key matches a cached successful validation."""
+        with self.lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def add(self, key: Tuple[Any, ...]) -> None:
+        """Caches the key of a successful validation, evicting the oldest entry if full."""
+        with self.lock:
+            self._entries[key] = None
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
@@ -591,6 +591,10 @@ class XsdElement(XsdComponent, ParticleMixin,
         :return: yields a decoded object, eventually preceded by a sequence of \
         validation or decoding errors.
         """
+        if 'profiler' in kwargs and kwargs['profiler'].enter(self):
+            yield from kwargs['profiler'].iter_profile(self, obj, validation, kwargs)
+            return
+
         error: Union[XMLSchemaValueError, XMLSchemaValidationError]
         result: Any
 
@@ -79,7 +79,9 @@ class XMLSchemaValidatorError(XMLSchemaException):
                 raise XMLSchemaValueError(
                     "'elem' attribute requires an Element, not %r." % type(value)
                 )
-            if isinstance(self.source, XMLResource):
+            if isinstance(self.source, XMLResource) and self.source.is_lazy():
+                # The elements of a lazy resource are pruned during the
+                # iteration, so the path has to be computed immediately.
                 self._path = etree_getpath(
                     elem=value,
                     root=self.source.root,
@@ -87,8 +89,7 @@ class XMLSchemaValidatorError(XMLSchemaException):
                     relative=False,
                     add_position=True
                 )
-                if self.source.is_lazy():
-                    value = None  # Don't save the element of a lazy resource
+                value = None  # Don't save the element of a lazy resource
         super(XMLSchemaValidatorError, self).__setattr__(name, value)
 
     @property
@@ -227,30 +228,40 @@ class XMLSchemaValidationError(XMLSchemaValidatorError, ValueError):
     :param source: the XML resource that contains the error.
     :param namespaces: is an optional mapping from namespace prefix to URI.
     """
+    _message: Optional[str] = None
+
     def __init__(self,
                  validator: ValidatorType,
                  obj: Any,
                  reason: Optional[str] = None,
                  source: Optional[Any] = None,
                  namespaces: Optional[NamespacesType] = None) -> None:
+        # The message is formatted only when accessed, because many errors of
+        # a validation are only counted or discarded by the caller.
+        self._path = None
+        self.validator = validator
+        self.namespaces = namespaces
+        self.source = source
+        self.elem = obj if is_etree_element(obj) else None
+        self.obj = obj
+        self.reason = reason
 
-        if isinstance(obj, str):
-            obj_repr = repr(obj.encode('ascii', 'xmlcharrefreplace').decode('utf-8'))
-        else:
-            obj_repr = repr(obj)
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            if isinstance(self.obj, str):
+                obj_repr = repr(self.obj.encode('ascii', 'xmlcharrefreplace').decode('utf-8'))
+            else:
+                obj_repr = repr(self.obj)
 
-        if len(obj_repr) > 200:
-            obj_repr = f"{type(obj)} instance"
+            if len(obj_repr) > 200:
+                obj_repr = f"{type(self.obj)} instance"
+            self._message = "failed validating {} with {!r}".format(obj_repr, self.validator)
+        return self._message
 
-        super(XMLSchemaValidationError, self).__init__(
-            validator=validator,
-            message="failed validating {} with {!r}".format(obj_repr, validator),
-            elem=obj if is_etree_element(obj) else None,
-            source=source,
-            namespaces=namespaces,
-        )
-        self.obj = obj
-        self.reason = reason
+    @message.setter
+    def message(self, message: str) -> None:
+        self._message = message
 
     def __repr__(self) -> str:
         return '%s(reason=%r)' % (self.__class__.__name__, self.reason)
@@ -314,8 +325,6 @@ class XMLSchemaDecodeError(XMLSchemaValidationError):
     :param source: the XML resource that contains the error.
     :param namespaces: is an optional mapping from namespace prefix to URI.
     """
-    message = "failed decoding {!r} with {!r}.\n"
-
     def __init__(self, validator: Union['XsdValidator', Callable[[Any], None]],
                  obj: Any,
                  decoder: Any,
@@ -337,8 +346,6 @@ class XMLSchemaEncodeError(XMLSchemaValidationError):
     :param source: the XML resource that contains the error.
     :param namespaces: is an optional mapping from namespace prefix to URI.
     """
-    message = "failed encoding {!r} with {!r}.\n"
-
     def __init__(self, validator: Union['XsdValidator', Callable[[Any], None]],
                  obj: Any,
                  encoder: Any,
@@ -365,6 +372,8 @@ class XMLSchemaChildrenValidationError(XMLSchemaValidationError):
     invalid_tag: Optional[str]
     """The tag of the invalid child element, `None` in case of an incomplete content."""
 
+    _reason: Optional[str] = None
+
     def __init__(self, validator: 'XsdValidator',
                  elem: ElementType,
                  index: int,
@@ -378,15 +387,27 @@ class XMLSchemaChildrenValidationError(XMLSchemaValidationError):
         self.particle = particle
         self.occurs = occurs
         self.expected = expected
+        self.invalid_tag = None if index >= len(elem) else elem[index].tag
+
+        # The reason is built at the first access (see the reason property)
+        super(XMLSchemaChildrenValidationError, self).\
+            __init__(validator, elem, None, source, namespaces)
+
+    @property
+    def reason(self) -> Optional[str]:
+        if self._reason is not None:
+            return self._reason
 
-        if index >= len(elem):
-            self.invalid_tag = None
-            tag = get_prefixed_qname(elem.tag, validator.namespaces, use_empty=False)
+        validator = cast('XsdValidator', self.validator)
+        particle = self.particle
+        occurs = self.occurs
+
+        if self.invalid_tag is None:
+            tag = get_prefixed_qname(self.obj.tag, validator.namespaces, use_empty=False)
             reason = _("The content of element %r is not complete.") % tag
         else:
-            self.invalid_tag = elem[index].tag
             tag = get_prefixed_qname(self.invalid_tag, validator.namespaces, use_empty=False)
-            reason = _("Unexpected child with tag %r at position %d.") % (tag, index + 1)
+            reason = _("Unexpected child with tag %r at position %d.") % (tag, self.index + 1)
 
         if occurs and particle.is_missing(occurs):
             reason += " The particle %r occurs %d times but the minimum is %d." % (
@@ -397,11 +418,11 @@ class XMLSchemaChildrenValidationError(XMLSchemaValidationError):
                 particle, occurs, particle.max_occurs
             )
 
-        if expected is None:
+        if self.expected is None:
             pass
         else:
             expected_tags = []
-            for xsd_element in expected:
+            for xsd_element in self.expected:
                 name = xsd_element.display_name
                 if name is not None:
                     expected_tags.append(name)
@@ -419,8 +440,12 @@ class XMLSchemaChildrenValidationError(XMLSchemaValidationError):
             else:
                 reason += _(" Tag %r expected.") % expected_tags[0]
 
-        super(XMLSchemaChildrenValidationError, self).\
-            __init__(validator, elem, reason, source, namespaces)
+        self._reason = reason
+        return reason
+
+    @reason.setter
+    def reason(self, reason: Optional[str]) -> None:
+        self._reason = reason
 
     @property
     def invalid_child(self) -> Optional[ElementType]:
@@ -13,9 +13,11 @@ This module contains declarations and classes for XML Schema constraint facets.
 import re
 import math
 import operator
+from decimal import Decimal
 from abc import abstractmethod
-from typing import TYPE_CHECKING, cast, Any, List, Optional, Pattern, Union, \
-    MutableSequence, overload, Tuple, Type, Dict
+from functools import lru_cache
+from typing import TYPE_CHECKING, cast, Any, FrozenSet, List, Optional, Pattern, \
+    Union, MutableSequence, overload, Tuple, Type, Dict
 from xml.etree.ElementTree import Element
 
 from elementpath import XPathContext, ElementPathError, \
@@ -39,6 +41,28 @@ if TYPE_CHECKING:
 
 LaxDecodeType = Tuple[Any, List[XMLSchemaValidationError]]
 
+HASHABLE_VALUE_TYPES = frozenset((str, int, float, bool, Decimal))
+"""Types of decoded values that have an equality consistent with their hash."""
+
+
+@lru_cache(maxsize=1000)
+def compile_pattern(pattern: str, xsd_version: str = '1.0') -> Pattern[str]:
+    """
+    Translates an XSD regular expression to a Python regular expression and
+    compiles it. The compiled patterns are cached, because the same patterns
+    are often shared by many types and schemas.
+
+    :param pattern: the XSD regular expression.
+    :param xsd_version: the XSD version of the regular expression syntax.
+    """
+    return re.compile(translate_pattern(
+        pattern=pattern,
+        xsd_version=xsd_version,
+        back_references=False,
+        lazy_quantifiers=False,
+        anchors=False
+    ))
+
 
 class XsdFacet(XsdComponent):
     """
@@ -551,11 +575,16 @@ class XsdEnumerationFacets(MutableSequence[ElementType], XsdFacet):
                  base_type: BaseXsdType) -> None:
         XsdFacet.__init__(self, elem, schema, parent, base_type)
 
+    # The enumeration values split in a set of hashable values and a list of the
+    # others, used for checking values. Built at first use by __call__().
+    _index: Optional[Tuple[FrozenSet[Any], List[Any]]] = None
+
     def _parse(self) -> None:
         self._elements = [self.elem]
         self.enumeration = [self._parse_value(self.elem)]
 
     def _parse_value(self, elem: ElementType) -> Optional[AtomicValueType]:
+        self._index = None
         try:
             value = self.base_type.decode(elem.attrib['value'], namespaces=self.schema.namespaces)
         except KeyError:
@@ -598,6 +627,7 @@ class XsdEnumerationFacets(MutableSequence[ElementType], XsdFacet):
     def __delitem__(self, i: Union[int, slice]) -> None:
         del self._elements[i]
         del self.enumeration[i]
+        self._index = None
 
     def __len__(self) -> int:
         return len(self._elements)
@@ -614,9 +644,35 @@ class XsdEnumerationFacets(MutableSequence[ElementType], XsdFacet):
         else:
             return '%s(%r)' % (self.__class__.__name__, self.enumeration)
 
+    def _build_index(self) -> Tuple[FrozenSet[Any], List[Any]]:
+        hashable_values = set()
+        other_values = []
+        for x in self.enumeration:
+            if type(x) not in HASHABLE_VALUE_TYPES:
+                other_values.append(x)
+                continue
+
+            try:
+                hashable_values.add(x)
+            except TypeError:
+                other_values.append(x)  # a signaling NaN decimal
+
+        self._index = frozenset(hashable_values), other_values
+        return self._index
+
     def __call__(self, value: Any) -> None:
-        if value in self.enumeration:
-            return
+        index = self._index or self._build_index()
+        if type(value) not in HASHABLE_VALUE_TYPES:
+            if value in self.enumeration:
+                return
+        else:
+            try:
+                if value in index[0]:
+                    return
+            except TypeError:
+                pass
+            if index[1] and value in index[1]:
+                return
 
         try:
             if math.isnan(value):
@@ -665,20 +721,18 @@ class XsdPatternFacets(MutableSequence[ElementType], XsdFacet):
                  base_type: Optional[BaseXsdType]) -> None:
         XsdFacet.__init__(self, elem, schema, parent, base_type)
 
+    # The alternation of the patterns, used for matching values with a single call.
+    # Built at first use by __call__().
+    _regex: Optional[Pattern[str]] = None
+
     def _parse(self) -> None:
         self._elements = [self.elem]
         self.patterns = [self._parse_value(self.elem)]
 
     def _parse_value(self, elem: ElementType) -> Pattern[str]:
+        self._regex = None
         try:
-            python_pattern = translate_pattern(
-                pattern=elem.attrib['value'],
-                xsd_version=self.xsd_version,
-                back_references=False,
-                lazy_quantifiers=False,
-                anchors=False
-            )
-            return re.compile(python_pattern)
+            return compile_pattern(elem.attrib['value'], self.xsd_version)
         except KeyError:
             return re.compile(r'^.*$')
         except (RegexError, re.error, XMLSchemaDecodeError) as err:
@@ -707,6 +761,7 @@ class XsdPatternFacets(MutableSequence[ElementType], XsdFacet):
     def __delitem__(self, i: Union[int, slice]) -> None:
         del self._elements[i]
         del self.patterns[i]
+        self._regex = None
 
     def __len__(self) -> int:
         return len(self._elements)
@@ -722,9 +777,17 @@ class XsdPatternFacets(MutableSequence[ElementType], XsdFacet):
         else:
             return '%s(%s...\'])' % (self.__class__.__name__, s[:70])
 
+    def _build_regex(self) -> Pattern[str]:
+        if len(self.patterns) == 1:
+            self._regex = self.patterns[0]
+        else:
+            self._regex = re.compile('|'.join(p.pattern for p in self.patterns))
+        return self._regex
+
     def __call__(self, text: str) -> None:
+        regex = self._regex or self._build_regex()
         try:
-            if all(pattern.match(text) is None for pattern in self.patterns):
+            if regex.match(text) is None:
                 reason = _("value doesn't match any pattern of {!r}").format(self.regexps)
                 raise XMLSchemaValidationError(self, text, reason)
         except TypeError as err:
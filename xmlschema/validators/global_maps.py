@@ -12,6 +12,7 @@ This module contains functions and classes for namespaces XSD declarations/defin
 """
 import warnings
 from collections import Counter
+from contextlib import contextmanager
 from functools import lru_cache
 from typing import cast, Any, Callable, Dict, List, Iterable, Iterator, \
     MutableMapping, Optional, Set, Union, Tuple, Type, TYPE_CHECKING
@@ -22,9 +23,11 @@ from ..names import XSD_NAMESPACE, XSD_REDEFINE, XSD_OVERRIDE, XSD_NOTATION, \
     XSD_ANY_TYPE, XSD_SIMPLE_TYPE, XSD_COMPLEX_TYPE, XSD_GROUP, \
     XSD_ATTRIBUTE, XSD_ATTRIBUTE_GROUP, XSD_ELEMENT, XSI_TYPE
 from ..aliases import ComponentClassType, ElementType, SchemaType, BaseXsdType, \
-    SchemaGlobalType
+    SchemaGlobalType, SchemaSourceType
 from ..helpers import get_qname, local_name, get_extended_qname
+from ..locations import normalize_url
 from ..namespaces import NamespaceResourcesMap
+from ..resources import XMLResource
 from ..translation import gettext as _
 
 from .exceptions import XMLSchemaNotBuiltError, XMLSchemaModelError, XMLSchemaModelDepthError, \
@@ -33,7 +36,7 @@ from .xsdbase import XsdValidator, XsdComponent
 from .builtins import xsd_builtin_types_factory
 from .models import check_model
 from . import XsdAttribute, XsdSimpleType, XsdComplexType, XsdElement, XsdAttributeGroup, \
-    XsdGroup, XsdNotation, XsdIdentity, XsdAssert, XsdUnion, XsdAtomicRestriction
+    XsdGroup, XsdNotation, XsdIdentity, XsdKeyref, XsdAssert, XsdUnion, XsdAtomicRestriction
 
 if TYPE_CHECKING:
     from .schemas import XMLSchemaBase
@@ -166,6 +169,12 @@ class XsdGlobals(XsdValidator):
     missing_locations: List[str]
 
     _loaded_schemas: Set['XMLSchemaBase']
+    _dependencies: Dict[Tuple[str, str], Set[Tuple[str, str]]]
+    _building: List[Tuple[str, str]]
+    _indexed_groups: List[XsdGroup]
+
+    _global_map_names = ('notations', 'types', 'attributes',
+                         'attribute_groups', 'groups', 'elements')
     _lookup_function_resolver = {
         XSD_SIMPLE_TYPE: 'lookup_type',
         XSD_COMPLEX_TYPE: 'lookup_type',
@@ -205,6 +214,9 @@ class XsdGlobals(XsdValidator):
             XSD_ELEMENT: validator.xsd_element_class,
         }
         self._loaded_schemas = set()
+        self._dependencies = {}  # Maps each global key to the keys of the dependent globals
+        self._building = []      # Keys of the globals that are building
+        self._indexed_groups = []  # Model groups that have built a match index
         self.load_namespace = lru_cache(maxsize=1000)(self._load_namespace)
 
     def __repr__(self) -> str:
@@ -242,6 +254,7 @@ class XsdGlobals(XsdValidator):
         obj.substitution_groups.update(self.substitution_groups)
         obj.identities.update(self.identities)
         obj._loaded_schemas.update(self._loaded_schemas)
+        obj._dependencies.update((k, v.copy()) for k, v in self._dependencies.items())
         return obj
 
     __copy__ = copy
@@ -268,6 +281,8 @@ class XsdGlobals(XsdValidator):
             return lookup_function(qname)
 
     def lookup_notation(self, qname: str) -> XsdNotation:
+        if self._building:
+            self._add_dependency('notations', qname)
         try:
             obj = self.notations[qname]
         except KeyError:
@@ -275,9 +290,11 @@ class XsdGlobals(XsdValidator):
         else:
             if isinstance(obj, XsdNotation):
                 return obj
-            return cast(XsdNotation, self._build_global(obj, qname, self.notations))
+            return cast(XsdNotation, self._build_global(obj, qname, 'notations'))
 
     def lookup_type(self, qname: str) -> BaseXsdType:
+        if self._building:
+            self._add_dependency('types', qname)
         try:
             obj = self.types[qname]
         except KeyError:
@@ -285,9 +302,11 @@ class XsdGlobals(XsdValidator):
         else:
             if isinstance(obj, (XsdSimpleType, XsdComplexType)):
                 return obj
-            return cast(BaseXsdType, self._build_global(obj, qname, self.types))
+            return cast(BaseXsdType, self._build_global(obj, qname, 'types'))
 
     def lookup_attribute(self, qname: str) -> XsdAttribute:
+        if self._building:
+            self._add_dependency('attributes', qname)
         try:
             obj = self.attributes[qname]
         except KeyError:
@@ -295,9 +314,11 @@ class XsdGlobals(XsdValidator):
         else:
             if isinstance(obj, XsdAttribute):
                 return obj
-            return cast(XsdAttribute, self._build_global(obj, qname, self.attributes))
+            return cast(XsdAttribute, self._build_global(obj, qname, 'attributes'))
 
     def lookup_attribute_group(self, qname: str) -> XsdAttributeGroup:
+        if self._building:
+            self._add_dependency('attribute_groups', qname)
         try:
             obj = self.attribute_groups[qname]
         except KeyError:
@@ -305,9 +326,11 @@ class XsdGlobals(XsdValidator):
         else:
             if isinstance(obj, XsdAttributeGroup):
                 return obj
-            return cast(XsdAttributeGroup, self._build_global(obj, qname, self.attribute_groups))
+            return cast(XsdAttributeGroup, self._build_global(obj, qname, 'attribute_groups'))
 
     def lookup_group(self, qname: str) -> XsdGroup:
+        if self._building:
+            self._add_dependency('groups', qname)
         try:
             obj = self.groups[qname]
         except KeyError:
@@ -315,9 +338,11 @@ class XsdGlobals(XsdValidator):
         else:
             if isinstance(obj, XsdGroup):
                 return obj
-            return cast(XsdGroup, self._build_global(obj, qname, self.groups))
+            return cast(XsdGroup, self._build_global(obj, qname, 'groups'))
 
     def lookup_element(self, qname: str) -> XsdElement:
+        if self._building:
+            self._add_dependency('elements', qname)
         try:
             obj = self.elements[qname]
         except KeyError:
@@ -325,11 +350,11 @@ class XsdGlobals(XsdValidator):
         else:
             if isinstance(obj, XsdElement):
                 return obj
-            return cast(XsdElement, self._build_global(obj, qname, self.elements))
+            return cast(XsdElement, self._build_global(obj, qname, 'elements'))
 
-    def _build_global(self, obj: Any, qname: str,
-                      global_map: Dict[str, Any]) -> Any:
+    def _build_global(self, obj: Any, qname: str, map_name: str) -> Any:
         factory_or_class: Callable[[ElementType, SchemaType], Any]
+        global_map: Dict[str, Any] = getattr(self, map_name)
 
         if isinstance(obj, tuple):
             # Not built XSD global component without redefinitions
@@ -345,7 +370,11 @@ class XsdGlobals(XsdValidator):
                 raise XMLSchemaKeyError(msg.format(elem, global_map))
 
             global_map[qname] = obj,  # Encapsulate into a tuple to catch circular builds
-            global_map[qname] = factory_or_class(elem, schema)
+            self._building.append((map_name, qname))
+            try:
+                global_map[qname] = factory_or_class(elem, schema)
+            finally:
+                self._building.pop()
             return global_map[qname]
 
         elif isinstance(obj, list):
@@ -362,18 +391,22 @@ class XsdGlobals(XsdValidator):
                 raise XMLSchemaKeyError(msg.format(elem, global_map))
 
             global_map[qname] = obj[0],  # To catch circular builds
-            global_map[qname] = component = factory_or_class(elem, schema)
+            self._building.append((map_name, qname))
+            try:
+                global_map[qname] = component = factory_or_class(elem, schema)
 
-            # Apply redefinitions (changing elem involve reparse of the component)
-            for elem, schema in obj[1:]:
-                if component.schema.target_namespace != schema.target_namespace:
-                    msg = _("redefined schema {!r} has a different targetNamespace")
-                    raise XMLSchemaValueError(msg.format(schema))
+                # Apply redefinitions (changing elem involve reparse of the component)
+                for elem, schema in obj[1:]:
+                    if component.schema.target_namespace != schema.target_namespace:
+                        msg = _("redefined schema {!r} has a different targetNamespace")
+                        raise XMLSchemaValueError(msg.format(schema))
 
-                component.redefine = component.copy()
-                component.redefine.parent = component
-                component.schema = schema
-                component.elem = elem
+                    component.redefine = component.copy()
+                    component.redefine.parent = component
+                    component.schema = schema
+                    component.elem = elem
+            finally:
+                self._building.pop()
 
             return global_map[qname]
 
@@ -381,6 +414,58 @@ class XsdGlobals(XsdValidator):
             msg = _("unexpected instance {!r} in global map")
             raise XMLSchemaTypeError(msg.format(obj))
 
+    def _add_dependency(self, map_name: str, qname: str) -> None:
+        """Registers a lookup as a dependency of the global that is building."""
+        try:
+            self._dependencies[map_name, qname].add(self._building[-1])
+        except KeyError:
+            self._dependencies[map_name, qname] = {self._building[-1]}
+
+    def _get_global_key(self, component: XsdComponent) -> Tuple[str, str]:
+        """Returns the key of the global component that contains the component."""
+        xsd_global = component.get_global()
+        if isinstance(xsd_global, XsdElement):
+            map_name = 'elements'
+        elif isinstance(xsd_global, XsdGroup):
+            map_name = 'groups'
+        elif isinstance(xsd_global, XsdAttributeGroup):
+            map_name = 'attribute_groups'
+        elif isinstance(xsd_global, XsdAttribute):
+            map_name = 'attributes'
+        elif isinstance(xsd_global, XsdNotation):
+            map_name = 'notations'
+        else:
+            map_name = 'types'
+        return map_name, cast(str, xsd_global.name)
+
+    def _get_dependents(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Returns the keys and the keys of all their direct or indirect dependents."""
+        dependents = set(keys)
+        stack = list(dependents)
+        while stack:
+            for key in self._dependencies.get(stack.pop(), ()):
+                if key not in dependents:
+                    dependents.add(key)
+                    stack.append(key)
+        return dependents
+
+    def _iter_global_keys(self, schemas: Iterable[SchemaType]) -> Iterator[Tuple[str, str]]:
+        """Iterates the keys of the globals of the schemas and of the unbuilt globals."""
+        schemas = set(schemas)
+        for map_name, global_map in zip(self._global_map_names, self.global_maps):
+            for qname, obj in global_map.items():
+                if not isinstance(obj, XsdComponent) or obj.schema in schemas:
+                    yield map_name, qname
+
+    @contextmanager
+    def _tracking_lookups(self, component: XsdComponent) -> Iterator[None]:
+        """Registers the lookups done in the context as dependencies of the component's global."""
+        self._building.append(self._get_global_key(component))
+        try:
+            yield
+        finally:
+            self._building.pop()
+
     def get_instance_type(self, type_name: str, base_type: BaseXsdType,
                           namespaces: MutableMapping[str, str]) -> BaseXsdType:
         """
@@ -500,6 +585,20 @@ class XsdGlobals(XsdValidator):
                          for obj in ns_schemas):
                 ns_schemas.append(schema)
 
+    def _reset_lookups(self) -> None:
+        """
+        Resets the lookups that depend on the globals and on the substitution
+        groups, that are the element chains of the schemas and the match
+        indexes of the model groups.
+        """
+        for schema in self.iter_schemas():
+            schema._element_chains = None
+            schema._selected_elements = None
+
+        for group in self._indexed_groups:
+            group._match_index = None
+        self._indexed_groups.clear()
+
     def _load_namespace(self, namespace: str, build: bool = True) -> bool:
         """
         Load namespace from available location hints. Returns `True` if the namespace
@@ -568,11 +667,12 @@ class XsdGlobals(XsdValidator):
             if not not_built_schemas:
                 return
 
-            for global_map in self.global_maps:
+            for map_name, global_map in zip(self._global_map_names, self.global_maps):
                 for k in list(global_map.keys()):
                     obj = global_map[k]
                     if not isinstance(obj, XsdComponent) or obj.schema in not_built_schemas:
                         del global_map[k]
+                        self._dependencies.pop((map_name, k), None)
                         if k in self.substitution_groups:
                             del self.substitution_groups[k]
                         if k in self.identities:
@@ -595,10 +695,13 @@ class XsdGlobals(XsdValidator):
             self.substitution_groups.clear()
             self.identities.clear()
             self._loaded_schemas.clear()
+            self._dependencies.clear()
 
             if remove_schemas:
                 self.namespaces.clear()
 
+        self._reset_lookups()
+
     def build(self) -> None:
         """
         Build the maps of XSD global definitions/declarations. The global maps are
@@ -633,14 +736,11 @@ class XsdGlobals(XsdValidator):
             schema._root_elements = None
             self._loaded_schemas.add(schema)
 
+        # New globals can change the lookups of the schemas already built
+        self._reset_lookups()
+
         # Load and build global declarations
-        load_xsd_simple_types(self.types, not_loaded_schemas)
-        load_xsd_complex_types(self.types, not_loaded_schemas)
-        load_xsd_notations(self.notations, not_loaded_schemas)
-        load_xsd_attributes(self.attributes, not_loaded_schemas)
-        load_xsd_attribute_groups(self.attribute_groups, not_loaded_schemas)
-        load_xsd_elements(self.elements, not_loaded_schemas)
-        load_xsd_groups(self.groups, not_loaded_schemas)
+        self._load_globals(self.global_maps, not_loaded_schemas)
 
         if not meta_schema.built:
             xsd_builtin_types_factory(meta_schema, self.types)
@@ -657,7 +757,46 @@ class XsdGlobals(XsdValidator):
 
         for qname in self.attribute_groups:
             self.lookup_attribute_group(qname)
+        self._set_default_attributes(not_loaded_schemas)
+
+        for qname in self.types:
+            self.lookup_type(qname)
+        for qname in self.elements:
+            self.lookup_element(qname)
+        for qname in self.groups:
+            self.lookup_group(qname)
+
+        # Build element declarations inside model groups.
         for schema in not_loaded_schemas:
+            for group in schema.iter_components(XsdGroup):
+                assert isinstance(group, XsdGroup)
+                with self._tracking_lookups(group):
+                    group.build()
+
+        # Build identity references and XSD 1.1 assertions
+        for schema in not_loaded_schemas:
+            for obj in schema.iter_components((XsdIdentity, XsdAssert)):
+                assert isinstance(obj, (XsdIdentity, XsdAssert))
+                with self._tracking_lookups(obj):
+                    obj.build()
+
+        self.check(filter(lambda x: x.meta_schema is not None, not_loaded_schemas), self.validation)
+
+    @staticmethod
+    def _load_globals(global_maps: Tuple[Dict[str, Any], ...],
+                      schemas: Iterable[SchemaType]) -> None:
+        notations, types, attributes, attribute_groups, groups, elements = global_maps
+        schemas = list(schemas)
+        load_xsd_simple_types(types, schemas)
+        load_xsd_complex_types(types, schemas)
+        load_xsd_notations(notations, schemas)
+        load_xsd_attributes(attributes, schemas)
+        load_xsd_attribute_groups(attribute_groups, schemas)
+        load_xsd_elements(elements, schemas)
+        load_xsd_groups(groups, schemas)
+
+    def _set_default_attributes(self, schemas: Iterable[SchemaType]) -> None:
+        for schema in schemas:
             if not isinstance(schema.default_attributes, str):
                 continue
 
@@ -673,24 +812,203 @@ class XsdGlobals(XsdValidator):
             else:
                 schema.default_attributes = cast(XsdAttributeGroup, attributes)
 
-        for qname in self.types:
-            self.lookup_type(qname)
-        for qname in self.elements:
-            self.lookup_element(qname)
-        for qname in self.groups:
-            self.lookup_group(qname)
+    def reload_schema(self, schema: Union[SchemaType, str],
+                      source: Optional[SchemaSourceType] = None) -> SchemaType:
+        """
+        Reloads a registered schema, parsing again its source, and rebuilds only the
+        global components defined by the schema and the global components that depend
+        on them, tracked by the lookups done during the build. Schemas that are included
+        or imported for the first time by the reloaded source are loaded and built too.
+        The global maps are fully rebuilt if they have schemas that are not loaded or if
+        the registered schemas use redefinitions or overrides. If the incremental rebuild
+        fails the global maps are cleared.
+
+        :param schema: the schema instance to reload or its URL.
+        :param source: an optional source to use instead of the URL of the schema.
+        :returns: the reloaded schema, that is the same instance of the registered schema.
+        """
+        if isinstance(schema, str):
+            url = normalize_url(schema)
+            for obj in self.iter_schemas():
+                if obj.url == url:
+                    schema = obj
+                    break
+            else:
+                msg = _("no schema with URL {0!r} is registered in {1!r}")
+                raise XMLSchemaValueError(msg.format(url, self))
+        elif not any(obj is schema for obj in self.iter_schemas()):
+            msg = _("{0!r} is not registered in {1!r}")
+            raise XMLSchemaValueError(msg.format(schema, self))
+
+        if schema.meta_schema is None:
+            raise XMLSchemaValueError(_("cannot reload a meta-schema"))
+        elif source is None:
+            if schema.url is None:
+                msg = _("missing source for reloading {!r}")
+                raise XMLSchemaValueError(msg.format(schema))
+            source = schema.url
+
+        if not isinstance(source, XMLResource):
+            source = XMLResource(source, schema.source._base_url, schema.allow,
+                                 schema.defuse, schema.timeout, uri_mapper=schema.uri_mapper)
+
+        options = {
+            'namespace': schema.target_namespace,
+            'validation': schema.validation,
+            'converter': schema.converter,
+            'locations': schema.locations,
+            'use_xpath3': schema.use_xpath3,
+            'trusted_sources': schema.trusted_sources,
+        }
+        full_rebuild = any(s not in self._loaded_schemas for s in self.iter_schemas())
+        stale = set(self._iter_global_keys((schema,)))
 
-        # Build element declarations inside model groups.
-        for schema in not_loaded_schemas:
-            for group in schema.iter_components(XsdGroup):
-                group.build()
+        # Parse again the schema on the same instance, keeping the attributes
+        # set by the global maps and by the schemas that include it.
+        for name in list(schema.__dict__):
+            if name not in ('lock', 'maps', 'redefine', 'override', 'fallback_locations'):
+                del schema.__dict__[name]
+        schema.__init__(source, global_maps=self, build=False, **options)  # type: ignore
 
-        # Build identity references and XSD 1.1 assertions
-        for schema in not_loaded_schemas:
-            for obj in schema.iter_components((XsdIdentity, XsdAssert)):
-                obj.build()
+        reloaded = [schema]
+        reloaded.extend(s for s in self.iter_schemas() if s not in self._loaded_schemas)
 
-        self.check(filter(lambda x: x.meta_schema is not None, not_loaded_schemas), self.validation)
+        if full_rebuild or any(s.redefine is not None or s.override is not None
+                               for s in self.iter_schemas()):
+            self.clear()
+            self.build()
+            return schema
+
+        try:
+            self._rebuild_globals(stale, reloaded)
+        except Exception:
+            self.clear()  # a following reload or build does a full rebuild
+            raise
+        return schema
+
+    def _rebuild_globals(self, stale: Set[Tuple[str, str]], reloaded: List[SchemaType]) -> None:
+        """
+        Rebuilds the stale globals, the globals of the reloaded schemas
+        and all the globals that depend on them.
+        """
+        reloaded_maps: Tuple[Dict[str, Any], ...] = tuple({} for _ in self.global_maps)
+        self._load_globals(reloaded_maps, reloaded)
+        for map_name, global_map in zip(self._global_map_names, reloaded_maps):
+            stale.update((map_name, qname) for qname in global_map)
+        stale = self._get_dependents(stale)
+
+        # The complex types use the default attributes of their schema without a lookup
+        for schema in self.iter_schemas():
+            if schema not in reloaded and \
+                    isinstance(schema.default_attributes, XsdAttributeGroup) and \
+                    ('attribute_groups', schema.default_attributes.name) in stale:
+                schema.default_attributes = schema.default_attributes.name
+                stale.update(self._get_dependents(self._iter_global_keys((schema,))))
+
+        # Remove stale globals, with their substitutions and identity constraints
+        owners: Set[SchemaType] = set()
+        removed: Set[XsdComponent] = set()
+        for map_name, qname in stale:
+            obj = getattr(self, map_name).pop(qname, None)
+            self._dependencies.pop((map_name, qname), None)
+            if isinstance(obj, XsdComponent):
+                removed.add(obj)
+                owners.add(obj.schema)
+            elif obj is not None:
+                owners.add(obj[1] if len(obj) == 2 else obj[0][1])  # an unbuilt global
+
+        owners.difference_update(reloaded)
+        for dependents in self._dependencies.values():
+            dependents.difference_update(stale)
+
+        removed_identities = set()
+        for xsd_global in removed:
+            if isinstance(xsd_global, XsdElement) and xsd_global.substitution_group is not None:
+                members = self.substitution_groups.get(xsd_global.substitution_group)
+                if members is not None:
+                    members.discard(xsd_global)
+                    if not members:
+                        del self.substitution_groups[xsd_global.substitution_group]
+
+            for identity in xsd_global.iter_components(XsdIdentity):
+                assert isinstance(identity, XsdIdentity)
+                removed_identities.add(identity)
+                for xsd_element in identity.elements:
+                    xsd_element.selected_by.discard(identity)
+
+        for qname in [k for k, v in self.identities.items() if v.get_global() in removed]:
+            del self.identities[qname]
+
+        self._reset_lookups()
+        for schema in self.iter_schemas():
+            schema._xpath_node = schema._components = None
+            schema._root_elements = None
+
+        # Load again the stale globals and build them
+        owners_maps: Tuple[Dict[str, Any], ...] = tuple({} for _ in self.global_maps)
+        self._load_globals(owners_maps, owners)
+        for map_name, global_map, reloaded_map, owners_map in \
+                zip(self._global_map_names, self.global_maps, reloaded_maps, owners_maps):
+            for qname, value in owners_map.items():
+                if (map_name, qname) in stale:
+                    global_map[qname] = value
+
+            for qname, value in reloaded_map.items():
+                if qname not in global_map:
+                    global_map[qname] = value
+                else:
+                    msg = _("global {0} with name={1!r} is already defined")
+                    value[1].parse_error(
+                        error=msg.format(local_name(value[0].tag), qname),
+                        elem=value[0]
+                    )
+
+        self._loaded_schemas.update(reloaded)
+
+        lookups: Tuple[Tuple[str, Callable[[str], Any]], ...] = (
+            ('notations', self.lookup_notation),
+            ('attributes', self.lookup_attribute),
+            ('attribute_groups', self.lookup_attribute_group),
+            ('types', self.lookup_type),
+            ('elements', self.lookup_element),
+            ('groups', self.lookup_group),
+        )
+        rebuilt: List[SchemaGlobalType] = []
+        for map_name, lookup_function in lookups:
+            if map_name == 'types':
+                self._set_default_attributes(self.iter_schemas())
+
+            global_map = getattr(self, map_name)
+            for qname in sorted(k[1] for k in stale if k[0] == map_name and k[1] in global_map):
+                rebuilt.append(lookup_function(qname))
+
+        for xsd_global in rebuilt:
+            for group in xsd_global.iter_components(XsdGroup):
+                with self._tracking_lookups(group):
+                    group.build()
+
+        components = [x for xsd_global in rebuilt
+                      for x in xsd_global.iter_components((XsdIdentity, XsdAssert))]
+        if removed_identities:
+            # Rebind the identity constraints that refer to removed constraints
+            for schema in self.iter_schemas():
+                for xsd_identity in schema.iter_components(XsdIdentity):
+                    assert isinstance(xsd_identity, XsdIdentity)
+                    if xsd_identity.ref in removed_identities:
+                        xsd_identity.ref = True  # type: ignore[assignment]
+                        components.append(xsd_identity)
+                    elif isinstance(xsd_identity, XsdKeyref) and \
+                            isinstance(xsd_identity.refer, XsdIdentity) and \
+                            xsd_identity.refer in removed_identities:
+                        xsd_identity.refer = xsd_identity.refer.name
+                        components.append(xsd_identity)
+
+        for component in components:
+            with self._tracking_lookups(component):
+                component.build()
+
+        self.check(filter(lambda x: x.meta_schema is not None, reloaded + list(owners)),
+                   self.validation)
 
     def check(self, schemas: Optional[Iterable[SchemaType]] = None,
               validation: str = 'strict') -> None:
@@ -712,7 +1030,8 @@ class XsdGlobals(XsdValidator):
                 msg = _("circularity found for substitution group with head element {}")
                 xsd_element.parse_error(msg.format(xsd_element), validation=validation)
 
-        if validation == 'strict' and not self.built:
+        if validation == 'strict' and \
+                not all(s.built for s in _schemas or self.iter_schemas()):
             raise XMLSchemaNotBuiltError(
                 self, _("global map has unbuilt components: %r") % self.unbuilt
             )
@@ -766,3 +1085,5 @@ class XsdGlobals(XsdValidator):
                     if validation == 'strict':
                         raise
                     xsd_type.errors.append(err)
+                else:
+                    xsd_type.content.compile_model()
@@ -13,7 +13,7 @@ This module contains classes for XML Schema model groups.
 import warnings
 from collections.abc import MutableMapping
 from copy import copy as _copy
-from typing import TYPE_CHECKING, cast, overload, Any, Iterable, Iterator, \
+from typing import TYPE_CHECKING, cast, overload, Any, Dict, Iterable, Iterator, \
     List, MutableSequence, Optional, Tuple, Union
 from xml.etree import ElementTree
 
@@ -34,9 +34,11 @@ from .xsdbase import ValidationMixin, XsdComponent, XsdType
 from .particles import ParticleMixin, OccursCalculator
 from .elements import XsdElement, XsdAlternative
 from .wildcards import XsdAnyElement, Xsd11AnyElement
-from .models import ModelVisitor, iter_unordered_content, iter_collapsed_content
+from .models import ModelVisitor, ModelAutomaton, iter_unordered_content, \
+    iter_collapsed_content
 
 if TYPE_CHECKING:
+    from .caching import ValidationCache
     from .complex_types import XsdComplexType
 
 ANY_ELEMENT = ElementTree.Element(
@@ -101,6 +103,15 @@ class XsdGroup(XsdComponent, MutableSequence[ModelParticleType],
     interleave: Optional[Xsd11AnyElement] = None  # if openContent with mode='interleave'
     suffix: Optional[Xsd11AnyElement] = None  # if openContent with mode='suffix'/'interleave'
 
+    # The compiled content model, built for checked model groups
+    automaton: Optional[ModelAutomaton] = None
+
+    # The index for model-less matching, built at first use by match_element()
+    # and reset by the global maps when the substitution groups can change.
+    _match_index: Optional[Tuple[
+        Dict[str, Tuple[int, SchemaElementType]], List[Tuple[int, SchemaElementType]]
+    ]] = None
+
     _ADMITTED_TAGS = {XSD_GROUP, XSD_SEQUENCE, XSD_ALL, XSD_CHOICE}
 
     def __init__(self, elem: ElementType,
@@ -416,6 +427,7 @@ class XsdGroup(XsdComponent, MutableSequence[ModelParticleType],
         group.__dict__.update(self.__dict__)
         group.errors = self.errors[:]
         group._group = self._group[:]
+        group._match_index = None
         return group
 
     __copy__ = copy
@@ -881,15 +893,71 @@ class XsdGroup(XsdComponent, MutableSequence[ModelParticleType],
                         "{0!r} and {1!r}.").format(self, xsd_element)
                 warnings.warn(msg, XMLSchemaTypeTableWarning, stacklevel=3)
 
+    def compile_model(self) -> None:
+        """
+        Compiles the content model into a deterministic automaton, that is used
+        for matching the children in place of the model visitor. Has to be called
+        only after a successful check of the model. Models that cannot be compiled
+        are left to the model visitor.
+        """
+        self._match_index = None
+        if self.interleave is not None or self.suffix is not None:
+            self.automaton = None
+        else:
+            try:
+                self.automaton = ModelAutomaton(self)
+            except XMLSchemaModelError:
+                self.automaton = None
+
     def match_element(self, name: str) -> Optional[SchemaElementType]:
         """
         Try a model-less match of a child element. Returns the
         matched element, or `None` if there is no match.
         """
-        for xsd_element in self.iter_elements():
-            if xsd_element.is_matching(name, group=self):
-                return xsd_element
-        return None
+        index = self._match_index
+        if index is None:
+            index = self._build_match_index()
+
+        try:
+            position, xsd_element = index[0][name]
+        except KeyError:
+            position, xsd_element = -1, None
+
+        # Wildcards and substitution heads that precede the named match
+        for k, particle in index[1]:
+            if 0 <= position <= k:
+                break
+            elif particle.is_matching(name, group=self):
+                return particle
+        return xsd_element
+
+    def _build_match_index(self) -> Tuple[
+            Dict[str, Tuple[int, SchemaElementType]], List[Tuple[int, SchemaElementType]]]:
+        """
+        Builds the index used by match_element(), that maps the element names of
+        the model to their position and element. Wildcards and heads of substitution
+        groups are put in a list of fallbacks, ordered by position, that have to be
+        matched dynamically. The index is reset when the global maps are built,
+        rebuilt or cleared, because the substitution groups can change.
+        """
+        substitution_groups = self.maps.substitution_groups
+        names: Dict[str, Tuple[int, SchemaElementType]] = {}
+        fallbacks: List[Tuple[int, SchemaElementType]] = []
+
+        for k, xsd_element in enumerate(self.iter_elements()):
+            if isinstance(xsd_element, XsdAnyElement):
+                fallbacks.append((k, xsd_element))
+            elif xsd_element.name is not None:
+                if xsd_element.name not in names:
+                    names[xsd_element.name] = k, xsd_element
+                    if xsd_element.name in substitution_groups and \
+                            (xsd_element.parent is None or xsd_element.ref is not None):
+                        fallbacks.append((k, xsd_element))
+
+        if self._match_index is None:
+            self.maps._indexed_groups.append(self)
+        self._match_index = names, fallbacks
+        return self._match_index
 
     def iter_decode(self, obj: ElementType, validation: str = 'lax', **kwargs: Any) \
             -> IterDecodeType[GroupDecodeType]:
@@ -902,6 +970,10 @@ class XsdGroup(XsdComponent, MutableSequence[ModelParticleType],
         :return: yields a list of 3-tuples (key, decoded data, decoder), \
         eventually preceded by a sequence of validation or decoding errors.
         """
+        if 'profiler' in kwargs and kwargs['profiler'].enter(self):
+            yield from kwargs['profiler'].iter_profile(self, obj, validation, kwargs)
+            return
+
         result_list: GroupDecodeType = []
         cdata_index = 1  # keys for CDATA sections are positive integers
 
@@ -947,11 +1019,25 @@ class XsdGroup(XsdComponent, MutableSequence[ModelParticleType],
         xsd_element: Optional[SchemaElementType]
         expected: Optional[List[SchemaElementType]]
 
-        model = ModelVisitor(self)
         errors = []
         broken_model = False
         namespaces = converter.namespaces
 
+        fingerprints = None
+        if 'validation_cache' in kwargs and validation != 'skip':
+            validation_cache: 'ValidationCache' = kwargs['validation_cache']
+            fingerprints = validation_cache.get_children_fingerprints(obj, kwargs)
+
+        model: Optional[ModelVisitor] = None
+        matches: Optional[List[Tuple[SchemaElementType, SchemaElementType]]] = None
+        if self.automaton is not None:
+            matches = self.automaton.match_content(obj)
+
+        if matches is not None:
+            matched = iter(matches)
+        else:
+            model = ModelVisitor(self)
+
         for index, child in enumerate(obj):
             if callable(child.tag):
                 continue  # child is a comment or PI
@@ -960,50 +1046,62 @@ class XsdGroup(XsdComponent, MutableSequence[ModelParticleType],
             default_namespace = converter.default_namespace
             name = converter.map_qname(child.tag)
 
-            while model.element is not None:
-                if model.element.max_occurs == 0:
-                    xsd_element = None
-                else:
-                    xsd_element = model.element.match(
-                        child.tag, group=self, occurs=model.occurs
-                    )
+            if model is None:
+                # Content already matched by the compiled model
+                model_element, xsd_element = next(matched)
+                try:
+                    self.check_dynamic_context(child, xsd_element, model_element, namespaces)
+                except XMLSchemaValidationError as err:
+                    yield self.validation_error(validation, err, obj, **kwargs)
+            else:
+                while model.element is not None:
+                    if model.element.max_occurs == 0:
+                        xsd_element = None
+                    else:
+                        xsd_element = model.element.match(
+                            child.tag, group=self, occurs=model.occurs
+                        )
 
-                if xsd_element is None:
-                    if self.interleave is not None and self.interleave.is_matching(
-                            child.tag, default_namespace, self, model.occurs):
-                        xsd_element = self.interleave
-                        break
+                    if xsd_element is None:
+                        if self.interleave is not None and self.interleave.is_matching(
+                                child.tag, default_namespace, self, model.occurs):
+                            xsd_element = self.interleave
+                            break
 
-                    for particle, occurs, expected in model.advance(False):
-                        errors.append((index, particle, occurs, expected))
-                        model.clear()
-                        broken_model = True  # the model is broken, continues with raw decoding.
-                        xsd_element = self.match_element(child.tag)
+                        for particle, occurs, expected in model.advance(False):
+                            errors.append((index, particle, occurs, expected))
+                            model.clear()
+                            # the model is broken, continues with raw decoding.
+                            broken_model = True
+                            xsd_element = self.match_element(child.tag)
+                            break
+                        else:
+                            continue
                         break
-                    else:
-                        continue
-                    break
 
-                try:
-                    self.check_dynamic_context(child, xsd_element, model.element, namespaces)
-                except XMLSchemaValidationError as err:
-                    yield self.validation_error(validation, err, obj, **kwargs)
+                    try:
+                        self.check_dynamic_context(child, xsd_element, model.element, namespaces)
+                    except XMLSchemaValidationError as err:
+                        yield self.validation_error(validation, err, obj, **kwargs)
 
-                for particle, occurs, expected in model.advance(True):
-                    errors.append((index, particle, occurs, expected))
-                break
-            else:
-                if self.suffix is not None and \
-                        self.suffix.is_matching(child.tag, default_namespace, self):
-                    xsd_element = self.suffix
+                    for particle, occurs, expected in model.advance(True):
+                        errors.append((index, particle, occurs, expected))
+                    break
                 else:
-                    xsd_element = self.match_element(child.tag)
-                    if xsd_element is None:
-                        errors.append((index, self, 0, None))
-                        broken_model = True
-                    elif not broken_model:
-                        errors.append((index, xsd_element, 0, []))
-                        broken_model = True
+                    if self.suffix is not None and \
+                            self.suffix.is_matching(child.tag, default_namespace, self):
+                        xsd_element = self.suffix
+                    else:
+                        xsd_element = self.match_element(child.tag)
+                        if xsd_element is None:
+                            errors.append((index, self, 0, None))
+                            broken_model = True
+                        elif not broken_model:
+                            errors.append((index, xsd_element, 0, []))
+                            broken_model = True
+
+            if errors and 'fail_fast' in kwargs:
+                break  # report the content model errors before decoding the children
 
             if xsd_element is None:
                 if kwargs.get('keep_unknown'):
@@ -1016,11 +1114,26 @@ class XsdGroup(XsdComponent, MutableSequence[ModelParticleType],
                     result_list.append((name, func(xsd_element), xsd_element))
                 continue
 
-            for result in xsd_element.iter_decode(child, validation, **kwargs):
-                if isinstance(result, XMLSchemaValidationError):
-                    yield result
-                else:
-                    result_list.append((name, result, xsd_element))
+            cache_key = None
+            if fingerprints is not None:
+                cache_key = validation_cache.get_key(
+                    xsd_element, fingerprints[index], converter.namespaces
+                )
+                if cache_key is not None:
+                    kwargs['fingerprint'] = child, fingerprints[index]
+
+            if cache_key is not None and validation_cache.lookup(cache_key):
+                result_list.append((name, None, xsd_element))  # already validated
+            else:
+                for result in xsd_element.iter_decode(child, validation, **kwargs):
+                    if isinstance(result, XMLSchemaValidationError):
+                        cache_key = None
+                        yield result
+                    else:
+                        result_list.append((name, result, xsd_element))
+
+                if cache_key is not None:
+                    validation_cache.add(cache_key)
 
             if cdata_index and child.tail is not None:
                 tail = str(child.tail.strip())
@@ -1032,7 +1145,7 @@ class XsdGroup(XsdComponent, MutableSequence[ModelParticleType],
                         result_list.append((cdata_index, tail, None))
                         cdata_index += 1
 
-        if model.element is not None:
+        if model is not None and model.element is not None:
             index = len(obj)
             for particle, occurs, expected in model.stop():
                 errors.append((index, particle, occurs, expected))
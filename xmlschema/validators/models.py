@@ -8,15 +8,15 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 """
-This module contains a function and a class for validating XSD content models,
+This module contains a function and classes for validating XSD content models,
 plus a set of functions for manipulating encoded content.
 """
 from collections import defaultdict, deque
-from typing import Any, Counter, Dict, Iterable, Iterator, List, \
-    MutableMapping, MutableSequence, Optional, Tuple, Union
+from typing import Any, Counter, Dict, FrozenSet, Iterable, Iterator, List, \
+    MutableMapping, MutableSequence, Optional, Set, Tuple, Union
 
 from ..exceptions import XMLSchemaValueError
-from ..aliases import ModelGroupType, ModelParticleType, SchemaElementType
+from ..aliases import ElementType, ModelGroupType, ModelParticleType, SchemaElementType
 from ..translation import gettext as _
 from .. import limits
 from .exceptions import XMLSchemaModelError, XMLSchemaModelDepthError
@@ -427,6 +427,226 @@ class ModelVisitor:
         return iter_collapsed_content(content, self.root, default_namespace)
 
 
+class ModelAutomaton:
+    """
+    A deterministic finite automaton compiled from an XSD model group, usable
+    as a table-driven alternative to :class:`ModelVisitor` for matching the
+    children of an element. The states are built by a subset construction over
+    the particles of the model, with the occurrences expanded, so the automaton
+    can be created only for deterministic models without *all* groups and without
+    XSD 1.1 element wildcards. Models with repeated particles inside repeated
+    groups, or with emptiable groups that have more than one required occurrence,
+    are also excluded, because the model visitor counts the occurrences of these
+    groups with a greedy match, that doesn't accept some sequences of the model's
+    language.
+
+    :param root: the root model group, that has to be already checked with \
+    :func:`check_model`.
+    :raises: an `XMLSchemaModelError` if the model group cannot be compiled.
+    :ivar transitions: for each state a map from the expanded names to the \
+    couples (particle, next state).
+    :ivar fallbacks: for each state a list of couples (particle, next state) \
+    related to particles that can match also other names (wildcards and heads \
+    of substitution groups).
+    :ivar final: for each state a boolean that is `True` if the state is accepting.
+    """
+    max_states = 1000
+    """Maximum number of states of the automaton."""
+
+    max_occurs_expansion = 100
+    """Maximum value of finite minOccurs/maxOccurs that can be expanded."""
+
+    transitions: List[Dict[str, Tuple[SchemaElementType, int]]]
+    fallbacks: List[List[Tuple[SchemaElementType, int]]]
+    final: List[bool]
+
+    __slots__ = 'root', 'transitions', 'fallbacks', 'final'
+
+    def __init__(self, root: ModelGroupType) -> None:
+        self.root = root
+        self.transitions = []
+        self.fallbacks = []
+        self.final = []
+
+        epsilons: List[List[int]] = []
+        moves: List[List[Tuple[SchemaElementType, int]]] = []
+        max_nodes = self.max_states * 10
+
+        def new_node() -> int:
+            if len(epsilons) >= max_nodes:
+                raise XMLSchemaModelError(root, _("too many states for compiling the model"))
+            epsilons.append([])
+            moves.append([])
+            return len(epsilons) - 1
+
+        def build_term(item: ModelParticleType, repeated: bool) -> Tuple[int, int]:
+            start = new_node()
+            if not isinstance(item, groups.XsdGroup):
+                end = new_node()
+                moves[start].append((item, end))
+            elif not item:
+                end = start
+            elif item.model == 'sequence':
+                end = start
+                for particle in item:
+                    s, e = build_particle(particle, repeated)
+                    epsilons[end].append(s)
+                    end = e
+            else:
+                end = new_node()
+                for particle in item:
+                    s, e = build_particle(particle, repeated)
+                    epsilons[start].append(s)
+                    epsilons[e].append(end)
+            return start, end
+
+        def build_particle(item: ModelParticleType, repeated: bool) -> Tuple[int, int]:
+            if isinstance(item, groups.XsdGroup):
+                if item.model == 'all':
+                    raise XMLSchemaModelError(root, _("cannot compile an 'all' model group"))
+            elif isinstance(item, Xsd11AnyElement):
+                raise XMLSchemaModelError(root, _("cannot compile an XSD 1.1 wildcard"))
+            elif not isinstance(item, XsdAnyElement) and item.name is None:
+                raise XMLSchemaModelError(root, _("cannot compile an unnamed element"))
+
+            min_occurs, max_occurs = item.min_occurs, item.max_occurs
+            if max_occurs == 0:
+                start = new_node()
+                return start, start
+            elif max(min_occurs, max_occurs or 0) > self.max_occurs_expansion:
+                raise XMLSchemaModelError(root, _("too many occurrences for compiling the model"))
+            elif max_occurs != 1:
+                if repeated:
+                    msg = _("cannot compile a repeated particle inside a repeated group")
+                    raise XMLSchemaModelError(root, msg)
+                repeated = True
+
+            start = end = new_node()
+            for k in range(min_occurs):
+                s, e = build_term(item, repeated)
+                if k == 1 and e in closure((s,)):
+                    msg = _("cannot compile a group with many required empty occurrences")
+                    raise XMLSchemaModelError(root, msg)
+                epsilons[end].append(s)
+                end = e
+
+            if max_occurs is None:
+                s, e = build_term(item, repeated)
+                loop = new_node()
+                epsilons[end].append(loop)
+                epsilons[loop].append(s)
+                epsilons[e].append(loop)
+                end = loop
+            elif max_occurs > min_occurs:
+                exit_node = new_node()
+                for _k in range(max_occurs - min_occurs):
+                    s, e = build_term(item, repeated)
+                    epsilons[end].extend((s, exit_node))
+                    end = e
+                epsilons[end].append(exit_node)
+                end = exit_node
+
+            return start, end
+
+        def closure(nodes: Iterable[int]) -> FrozenSet[int]:
+            result = set(nodes)
+            stack = list(result)
+            while stack:
+                for node in epsilons[stack.pop()]:
+                    if node not in result:
+                        result.add(node)
+                        stack.append(node)
+            return frozenset(result)
+
+        initial_node, final_node = build_particle(root, False)
+        states = {closure((initial_node,)): 0}
+        pending = deque(states)
+
+        while pending:
+            nodes = pending.popleft()
+            targets: Dict[SchemaElementType, Set[int]] = {}
+            for node in sorted(nodes):
+                for particle, target in moves[node]:
+                    targets.setdefault(particle, set()).add(target)
+
+            transitions: Dict[str, Tuple[SchemaElementType, int]] = {}
+            fallbacks: List[Tuple[SchemaElementType, int]] = []
+
+            for particle, target_nodes in targets.items():
+                target_state = closure(target_nodes)
+                if target_state not in states:
+                    if len(states) >= self.max_states:
+                        msg = _("too many states for compiling the model")
+                        raise XMLSchemaModelError(root, msg)
+                    states[target_state] = len(states)
+                    pending.append(target_state)
+
+                state = states[target_state]
+                if isinstance(particle, XsdAnyElement):
+                    fallbacks.append((particle, state))
+                    continue
+                elif particle.name in transitions:
+                    msg = _("{!r} is ambiguous and cannot be compiled").format(particle)
+                    raise XMLSchemaModelError(root, msg)
+
+                transitions[particle.name] = particle, state
+                if particle.parent is None or particle.ref is not None:
+                    fallbacks.append((particle, state))  # could be substituted
+
+            self.transitions.append(transitions)
+            self.fallbacks.append(fallbacks)
+            self.final.append(final_node in nodes)
+
+    def __repr__(self) -> str:
+        return '%s(root=%r, states=%d)' % (
+            self.__class__.__name__, self.root, len(self.transitions)
+        )
+
+    def match(self, state: int, name: str) \
+            -> Optional[Tuple[SchemaElementType, SchemaElementType, int]]:
+        """
+        Matches a name from a state of the automaton. Returns a 3-tuple with
+        the matched particle, the matched element and the next state, or `None`
+        if the name doesn't match any transition.
+
+        :param state: the current state.
+        :param name: the expanded QName to match.
+        """
+        try:
+            particle, target = self.transitions[state][name]
+        except KeyError:
+            for particle, target in self.fallbacks[state]:
+                xsd_element = particle.match(name, group=self.root)
+                if xsd_element is not None:
+                    return particle, xsd_element, target
+            return None
+        else:
+            return particle, particle, target
+
+    def match_content(self, elem: ElementType) \
+            -> Optional[List[Tuple[SchemaElementType, SchemaElementType]]]:
+        """
+        Matches the children of an element. Returns a list of couples (particle,
+        matched element) for the children, comments and processing instructions
+        excluded, or `None` if the content is not accepted by the automaton.
+
+        :param elem: the Element whose children have to be matched.
+        """
+        matches = []
+        state = 0
+        for child in elem:
+            if callable(child.tag):
+                continue  # child is a comment or PI
+
+            result = self.match(state, child.tag)
+            if result is None:
+                return None
+            particle, xsd_element, state = result
+            matches.append((particle, xsd_element))
+
+        return matches if self.final[state] else None
+
+
 #
 # Functions for manipulating encoded content
 
@@ -0,0 +1,555 @@
+#
+# Copyright (c), 2016-2024, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+This module contains helper functions and classes for validating XML data with
+a pool of processes.
+"""
+import pickle
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, Counter, Deque, Dict, Iterable, Iterator, \
+    List, NamedTuple, Optional, Tuple, Union, cast
+from urllib.error import URLError
+from xml.etree.ElementTree import Element, ParseError, XML
+
+from ..exceptions import XMLSchemaException
+from ..names import XSI_TYPE
+from ..aliases import ElementType, NamespacesType
+from ..translation import gettext as _
+from ..helpers import etree_getpath, is_etree_element
+from ..namespaces import NamespaceMapper
+from ..resources import XMLResource, lxml_etree
+from .exceptions import XMLSchemaValidationError, XMLSchemaStopValidation
+from .xsdbase import XsdComponent
+from .identities import XsdIdentity, XsdKeyref, IdentityCounter
+
+if TYPE_CHECKING:
+    from .schemas import XMLSchemaBase  # noqa: F401
+    from .elements import XsdElement  # noqa: F401
+
+
+class ValidationSummary(NamedTuple):
+    """
+    The summary of the validation of an XML source.
+
+    :param source: the XML source, as provided to the validation.
+    :param errors: the messages of the validation errors.
+    :param exception: the message of the error that stopped the validation \
+    of the XML source, e.g. a resource access error or an XML syntax error.
+    """
+    source: Any
+    errors: List[str]
+    exception: Optional[str] = None
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors and self.exception is None
+
+
+def get_validation_summary(schema: 'XMLSchemaBase', source: Any,
+                           lazy: bool = False, **kwargs: Any) -> ValidationSummary:
+    """
+    Validates an XML source, returning a :class:`ValidationSummary`.
+
+    :param schema: the schema instance used for validation.
+    :param source: the XML source.
+    :param lazy: the lazy mode for the XML resource.
+    :param kwargs: other keyword arguments for :meth:`XMLSchemaBase.iter_errors`.
+    """
+    try:
+        if isinstance(source, XMLResource):
+            resource = source
+        else:
+            resource = XMLResource(source, defuse=schema.defuse, timeout=schema.timeout,
+                                   lazy=lazy, xml_parser=schema.xml_parser)
+        errors = [str(e) for e in schema.iter_errors(resource, **kwargs)]
+    except (XMLSchemaException, URLError, OSError, ParseError) as err:
+        return ValidationSummary(source, [], str(err))
+    else:
+        return ValidationSummary(source, errors)
+
+
+# The schema instance of a worker process, loaded once by the pool initializer,
+# and the list of its components, computed at first fragments validation.
+_worker_schema: Optional['XMLSchemaBase'] = None
+_worker_components: Optional[List[Any]] = None
+
+
+def _init_worker(data: bytes) -> None:
+    global _worker_schema
+    global _worker_components
+    _worker_schema = pickle.loads(data)
+    _worker_components = None
+
+
+def _validate_sources(sources: List[Any], kwargs: Any) -> List[ValidationSummary]:
+    assert _worker_schema is not None, "worker process not initialized"
+    return [get_validation_summary(_worker_schema, s, **kwargs) for s in sources]
+
+
+def iter_validation_summaries(schema: 'XMLSchemaBase',
+                              sources: Iterable[Any],
+                              workers: int,
+                              ordered: bool = True,
+                              chunksize: Optional[int] = None,
+                              **kwargs: Any) -> Iterator[ValidationSummary]:
+    """
+    Validates a set of XML sources with a pool of processes, yielding
+    the validation summaries. The schema is pickled and sent once to
+    each worker process.
+
+    :param schema: the schema instance used for validation.
+    :param sources: the XML sources, that must be picklable (e.g. paths or URLs).
+    :param workers: the number of worker processes.
+    :param ordered: if `True` the summaries are yielded in the order of the \
+    sources, otherwise are yielded as soon as they are completed.
+    :param chunksize: the number of sources sent to a worker process in a task. \
+    For default is computed from the number of sources and the number of workers.
+    :param kwargs: other keyword arguments for :meth:`XMLSchemaBase.iter_errors`.
+    """
+    sources = list(sources)
+    if not sources:
+        return
+    if chunksize is None:
+        chunksize = max(1, min(64, len(sources) // (workers * 4)))
+
+    data = pickle.dumps(schema, pickle.HIGHEST_PROTOCOL)
+    workers = min(workers, (len(sources) + chunksize - 1) // chunksize)
+
+    executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(data,))
+    futures: List['Future[List[ValidationSummary]]'] = []
+    try:
+        for k in range(0, len(sources), chunksize):
+            futures.append(executor.submit(
+                _validate_sources, sources[k:k + chunksize], kwargs
+            ))
+
+        for future in (futures if ordered else as_completed(futures)):
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown()
+
+
+###
+# Fragment-parallel validation of lazy XML resources
+
+def get_components(schema: 'XMLSchemaBase') -> List[Any]:
+    """
+    Returns a list with the global maps and the components of a schema, that
+    has the same order for the copies of the schema unpickled by other processes.
+    """
+    components: List[Any] = []
+    maps_ids = set()
+    for maps in [schema.maps] + [s.maps for s in schema.maps.iter_schemas()]:
+        if id(maps) in maps_ids:
+            continue
+
+        maps_ids.add(id(maps))
+        components.extend(maps.iter_schemas())
+        for component in maps.iter_components():
+            components.append(component)
+            facets = getattr(component, 'facets', None)
+            if isinstance(facets, dict):
+                components.extend(v for v in facets.values() if isinstance(v, XsdComponent))
+    return components
+
+
+class _ComponentsPickler(pickle.Pickler):
+    """Pickler that serializes schema components by their position in a list."""
+
+    def __init__(self, file: BytesIO, components: List[Any]) -> None:
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.index = {id(obj): k for k, obj in enumerate(components)}
+
+    def persistent_id(self, obj: Any) -> Optional[int]:
+        return self.index.get(id(obj))
+
+
+class _ComponentsUnpickler(pickle.Unpickler):
+    """Unpickler that restores schema components from their position in a list."""
+
+    def __init__(self, file: BytesIO, components: List[Any]) -> None:
+        super().__init__(file)
+        self.components = components
+
+    def persistent_load(self, pid: int) -> Any:
+        return self.components[pid]
+
+
+def _get_error_state(error: XMLSchemaValidationError,
+                     subtree: ElementType) -> Dict[str, Any]:
+    """
+    Returns the picklable state of an error. Like for a lazy resource the path of
+    an error related to an element of the subtree is the path of the subtree, that
+    is marked with a relative path to be completed by the validation process.
+    """
+    state = error.__dict__.copy()
+    state['source'] = None
+    state['elem'] = None
+
+    if error.elem is not None and etree_getpath(error.elem, subtree) is not None:
+        state['_path'] = '.'
+
+    if is_etree_element(error.obj):
+        # Like a lazy resource only a shallow copy of the element is kept
+        state['obj'] = Element(error.obj.tag, error.obj.attrib)
+        state['obj'].text = error.obj.text
+
+    return state
+
+
+class _FragmentsIdMap(Counter[str]):
+    """An ID map that records the position of the subtree where an ID is found."""
+    position = 0
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.positions: Dict[str, int] = {}
+
+    def __setitem__(self, key: str, value: int) -> None:
+        if value and key not in self.positions:
+            self.positions[key] = self.position
+        super().__setitem__(key, value)
+
+
+def _validate_chunk(schema: 'XMLSchemaBase', chunk: Dict[str, Any], id_map: _FragmentsIdMap) \
+        -> Tuple[List[List[Tuple[type, Dict[str, Any]]]], List[Tuple[XsdIdentity, Any]]]:
+    """
+    Validates a chunk of subtrees at the same depth of an XML document, returning
+    the states of the errors of each subtree and the identity counters of ancestors.
+    """
+    namespaces: NamespacesType = chunk['namespaces']
+
+    # Rebuild a skeleton of the document, with a copy of the ancestors and the subtrees
+    ancestors: List[ElementType] = []
+    nsmaps: Dict[ElementType, Dict[str, str]] = {}
+    xmlns: Dict[ElementType, List[Tuple[str, str]]] = {}
+    for tag, attrib, nsmap, declarations in chunk['ancestors']:
+        elem = Element(tag, attrib)
+        if ancestors:
+            ancestors[-1].append(elem)
+        ancestors.append(elem)
+        nsmaps[elem] = nsmap
+        if declarations:
+            xmlns[elem] = declarations
+
+    for subtree_data in chunk['subtrees']:
+        subtree, subtree_nsmaps, subtree_xmlns = pickle.loads(subtree_data)
+        for k, elem in enumerate(subtree.iter()):
+            if k in subtree_xmlns:
+                nsmaps[elem] = subtree_nsmaps[k]
+                xmlns[elem] = subtree_xmlns[k]
+            elif not k:
+                nsmaps[elem] = subtree_nsmaps[k]
+        ancestors[-1].append(subtree)
+
+    resource = XMLResource(ancestors[0])
+    resource._nsmaps.update(nsmaps)
+    resource._xmlns.update(xmlns)
+
+    try:
+        xsd_schema = schema.get_schema(chunk['namespace'])
+    except KeyError:
+        xsd_schema = schema
+
+    converter = NamespaceMapper(namespaces, source=resource)
+    namespaces = converter.namespaces
+
+    identities: Dict[XsdIdentity, IdentityCounter] = {}
+    xsd_ancestors = cast(List['XsdElement'], xsd_schema.get_element_chain(
+        [e.tag for e in ancestors], namespaces
+    ))
+    for xsd_ancestor, elem in zip(xsd_ancestors, ancestors):
+        for identity in xsd_ancestor.identities:
+            identities[identity] = identity.get_counter(elem)
+    counters = list(identities.items())
+
+    kwargs: Dict[str, Any] = {
+        'level': len(ancestors),
+        'source': resource,
+        'namespaces': namespaces,
+        'converter': converter,
+        'id_map': id_map,
+        'identities': identities,
+        'inherited': {},
+    }
+    kwargs.update(chunk['options'])
+
+    results: List[List[Tuple[type, Dict[str, Any]]]] = []
+    for position, subtree in enumerate(ancestors[-1]):
+        errors: List[Tuple[type, Dict[str, Any]]] = []
+        results.append(errors)
+        id_map.position = position
+
+        xsd_element = xsd_schema.get_element(subtree.tag, chunk['schema_path'], namespaces)
+        if xsd_element is None:
+            if XSI_TYPE not in subtree.attrib:
+                continue
+            xsd_element = schema.create_element(name=subtree.tag)
+
+        try:
+            for result in xsd_element.iter_decode(subtree, **kwargs):
+                if isinstance(result, XMLSchemaValidationError):
+                    errors.append((type(result), _get_error_state(result, subtree)))
+                else:
+                    del result
+        except XMLSchemaStopValidation:
+            pass
+
+        if errors and 'fail_fast' in kwargs:
+            break
+
+    return results, [(identity, counter.counter) for identity, counter in counters]
+
+
+def _validate_fragments(data: bytes) -> bytes:
+    """
+    Validates a set of subtrees at the same depth of an XML document, returning
+    the errors and the state of the ID map and of identity counters of ancestors.
+    """
+    global _worker_components
+
+    schema = _worker_schema
+    assert schema is not None, "worker process not initialized"
+    if _worker_components is None:
+        _worker_components = get_components(schema)
+
+    id_map = _FragmentsIdMap()
+    results, counters = _validate_chunk(schema, pickle.loads(data), id_map)
+
+    buffer = BytesIO()
+    _ComponentsPickler(buffer, _worker_components).dump((
+        results, dict(id_map), id_map.positions, counters
+    ))
+    return buffer.getvalue()
+
+
+class FragmentsValidator:
+    """
+    Validates the subtrees at *lazy_depth* level of a lazy XML resource with a pool
+    of worker processes. Consecutive subtrees with the same ancestors are grouped in
+    chunks, that are sent to workers together with a copy of their ancestors. The
+    results are processed in document order, merging the ID map and the identity
+    counters of the ancestors into the maps of the validation process.
+
+    :param schema: the schema instance used for validation.
+    :param resource: the lazy XML resource.
+    :param workers: the number of worker processes.
+    :param identities: the identity counters of the validation process.
+    :param id_map: the ID map of the validation process.
+    :param namespaces: the namespace map used for validation.
+    :param namespace: the namespace of the XML resource.
+    :param schema_path: an optional XPath expression to select the XSD element \
+    to use for validating subtrees.
+    :param options: other options for validating subtrees.
+    """
+    chunk_size = 5000
+    """Minimum number of elements of the subtrees sent in a single chunk."""
+
+    def __init__(self, schema: 'XMLSchemaBase',
+                 resource: XMLResource,
+                 workers: int,
+                 identities: Dict[XsdIdentity, IdentityCounter],
+                 id_map: Counter[str],
+                 namespaces: NamespacesType,
+                 namespace: str,
+                 schema_path: Optional[str] = None,
+                 **options: Any) -> None:
+        self.schema = schema
+        self.resource = resource
+        self.identities = identities
+        self.id_map = id_map
+        self.namespaces = namespaces
+        self.namespace = namespace
+        self.schema_path = schema_path
+        self.options = options
+
+        self.components = get_components(schema)
+        self.max_pending = workers * 2
+        self.pending = 0
+        self.queue: Deque[Union[Tuple['Future[bytes]', List[ElementType], bytes],
+                                List[Tuple[XsdIdentity, ElementType]]]] = deque()
+
+        self.ancestors: List[ElementType] = []
+        self.subtrees: List[ElementType] = []
+        self.subtrees_data: List[bytes] = []
+        self.elements_count = 0
+
+        data = pickle.dumps(schema, pickle.HIGHEST_PROTOCOL)
+        self.executor: Optional[ProcessPoolExecutor] = ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(data,)
+        )
+
+    def __del__(self) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """Shutdowns the pool of worker processes, cancelling pending tasks."""
+        if self.executor is not None:
+            for item in self.queue:
+                if isinstance(item, tuple):
+                    item[0].cancel()
+            self.queue.clear()
+            self.executor.shutdown()
+            self.executor = None
+
+    def reset_counters(self, xsd_ancestors: Iterable[Any],
+                       ancestors: Iterable[ElementType]) \
+            -> Iterator[XMLSchemaValidationError]:
+        """
+        Schedules the reset of the identity counters of changed ancestors, that is
+        applied after merging the results of the subtrees of preceding ancestors.
+        """
+        yield from self.submit()
+        self.queue.append([(identity, elem) for xsd_ancestor, elem in
+                           zip(xsd_ancestors, ancestors)
+                           for identity in xsd_ancestor.identities])
+
+    def add(self, elem: ElementType, ancestors: List[ElementType]) \
+            -> Iterator[XMLSchemaValidationError]:
+        """
+        Adds a subtree to validate, submitting a chunk if it's full. The subtree
+        is serialized immediately, before it's cleared by the lazy resource.
+        """
+        if not self.subtrees:
+            self.ancestors = ancestors[:]
+
+        subtree: Any
+        items: Iterable[Tuple[ElementType, Optional[Dict[str, str]]]]
+        if hasattr(elem, 'xpath'):
+            # lxml elements are not picklable: send an ElementTree copy of the
+            # subtree, without comments and processing instructions.
+            assert lxml_etree is not None
+            items = [x for x in self.resource._iter_nsmaps(elem) if not callable(x[0].tag)]
+            subtree = XML(lxml_etree.tostring(elem, with_tail=False))
+        else:
+            items = self.resource._iter_nsmaps(elem)
+            subtree = elem
+
+        nsmaps = []
+        xmlns = {}
+        for k, (e, nsmap) in enumerate(items):
+            nsmaps.append(nsmap)
+            declarations = self.resource.get_xmlns(e)
+            if declarations:
+                xmlns[k] = declarations
+
+        self.subtrees.append(elem)
+        self.subtrees_data.append(pickle.dumps((subtree, nsmaps, xmlns), pickle.HIGHEST_PROTOCOL))
+        self.elements_count += len(nsmaps)
+        if self.elements_count >= self.chunk_size:
+            yield from self.submit()
+
+    def submit(self) -> Iterator[XMLSchemaValidationError]:
+        """Submits the current chunk of subtrees to the pool of workers."""
+        if not self.subtrees:
+            return
+
+        assert self.executor is not None, "the pool of workers is shut down"
+        data = pickle.dumps({
+            'ancestors': [
+                (e.tag, dict(e.attrib), self.resource.get_nsmap(e), self.resource.get_xmlns(e))
+                for e in self.ancestors
+            ],
+            'subtrees': self.subtrees_data,
+            'namespaces': self.namespaces,
+            'namespace': self.namespace,
+            'schema_path': self.schema_path,
+            'options': self.options,
+        }, pickle.HIGHEST_PROTOCOL)
+
+        self.queue.append((self.executor.submit(_validate_fragments, data), self.subtrees, data))
+        self.pending += 1
+        self.subtrees = []
+        self.subtrees_data = []
+        self.elements_count = 0
+
+        while self.pending > self.max_pending:
+            yield from self.process()
+
+    def process(self) -> Iterator[XMLSchemaValidationError]:
+        """Processes the first item of the queue, waiting for a result if necessary."""
+        item = self.queue.popleft()
+        if isinstance(item, list):
+            for identity, elem in item:
+                if identity in self.identities:
+                    self.identities[identity].reset(elem)
+                else:
+                    self.identities[identity] = identity.get_counter(elem)
+            return
+
+        future, subtrees, data = item
+        self.pending -= 1
+        results, id_map, positions, counters = _ComponentsUnpickler(
+            BytesIO(future.result()), self.components
+        ).load()
+
+        # IDs already defined by the preceding chunks
+        duplicates: Dict[int, List[str]] = {}
+        for k, v in id_map.items():
+            if not v:
+                if k not in self.id_map:
+                    self.id_map[k] = 0
+            elif not self.id_map[k]:
+                self.id_map[k] = 1
+            else:
+                duplicates.setdefault(positions[k], []).append(k)
+
+        for position, (subtree, errors) in enumerate(zip(subtrees, results)):
+            if position in duplicates:
+                # Validate again the subtree with the duplicated IDs, for
+                # reporting the same errors of a sequential validation.
+                chunk = pickle.loads(data)
+                chunk['subtrees'] = chunk['subtrees'][position:position + 1]
+                duplicated_ids = _FragmentsIdMap()
+                duplicated_ids.update(dict.fromkeys(duplicates[position], 1))
+                errors = _validate_chunk(self.schema, chunk, duplicated_ids)[0][0]
+
+            path = None
+            for cls, state in errors:
+                error = cls.__new__(cls)
+                error.__dict__.update(state)
+                error.source = self.resource
+
+                if error._path is not None and error._path.startswith('.'):
+                    if path is None:
+                        path = etree_getpath(subtree, self.resource.root, self.namespaces,
+                                             relative=False, add_position=True) or ''
+                    error._path = path + error._path[1:]
+                yield error
+
+        for identity, counter in counters:
+            try:
+                identity_counter = self.identities[identity]
+            except KeyError:
+                continue
+
+            if isinstance(identity, XsdKeyref):
+                identity_counter.counter.update(counter)
+                continue
+
+            for fields, count in counter.items():
+                previous = identity_counter.counter[fields]
+                identity_counter.counter[fields] = previous + count
+                if previous == 1:
+                    msg = _("duplicated value {0!r} for {1!r}").format(fields, identity)
+                    yield identity.validation_error(
+                        'lax', msg, identity_counter.elem, self.resource, self.namespaces
+                    )
+
+    def finish(self) -> Iterator[XMLSchemaValidationError]:
+        """Submits the last chunk and processes all the results, then shutdowns the pool."""
+        yield from self.submit()
+        while self.queue:
+            yield from self.process()
+        self.shutdown()
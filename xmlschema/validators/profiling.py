@@ -0,0 +1,198 @@
+#
+# Copyright (c), 2016-2024, SISSA (International School for Advanced Studies).
+# All rights reserved.
+# This file is distributed under the terms of the MIT License.
+# See the file 'LICENSE' in the root directory of the present
+# distribution, or http://opensource.org/licenses/MIT.
+#
+# @author Davide Brunato <brunato@sissa.it>
+#
+"""
+This module contains a profiler for measuring the decoding time of XSD components.
+"""
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from ..exceptions import XMLSchemaValueError
+from .exceptions import XMLSchemaValidationError
+from .xsdbase import XsdComponent
+
+ProfilerCallbackType = Callable[[XsdComponent, float, int], None]
+
+SORT_KEYS = ('calls', 'errors', 'time', 'own_time')
+
+
+def get_component_name(component: XsdComponent) -> str:
+    """
+    Returns the prefixed name of a component. Anonymous components are named
+    with the name of the nearest named ancestor and with their class name.
+    """
+    if component.name is not None:
+        return component.prefixed_name or component.name
+
+    parent = component.parent
+    while parent is not None and parent.name is None:
+        parent = parent.parent
+
+    if parent is None:
+        return component.__class__.__name__
+    return '%s/%s' % (parent.prefixed_name, component.__class__.__name__)
+
+
+class ComponentStats:
+    """
+    The statistics collected for an XSD component.
+
+    :ivar calls: the number of decoding calls.
+    :ivar errors: the number of errors generated by the component.
+    :ivar time: the cumulative time of the calls, including the time \
+    spent in the calls of the nested components.
+    :ivar own_time: the time of the calls, excluding the time spent \
+    in the calls of the nested components.
+    """
+    __slots__ = ('component', 'calls', 'errors', 'time', 'own_time')
+
+    def __init__(self, component: XsdComponent) -> None:
+        self.component = component
+        self.calls = self.errors = 0
+        self.time = self.own_time = 0.0
+
+    def __repr__(self) -> str:
+        return '%s(name=%r, calls=%r, errors=%r, time=%r, own_time=%r)' % (
+            self.__class__.__name__, self.name, self.calls,
+            self.errors, self.time, self.own_time
+        )
+
+    @property
+    def name(self) -> str:
+        return get_component_name(self.component)
+
+    @property
+    def url(self) -> Optional[str]:
+        return self.component.schema.url
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'component': self.component.__class__.__name__,
+            'url': self.url,
+            'calls': self.calls,
+            'errors': self.errors,
+            'time': self.time,
+            'own_time': self.own_time,
+        }
+
+
+class ValidationProfiler:
+    """
+    A profiler for the decoding of XML data, that collects the number of calls,
+    the cumulative times and the number of errors for each XSD element, model
+    group, attribute group and simple type used in a validation or decoding.
+    Provide an instance with the *profiler* argument of validation or decoding
+    methods. Not thread-safe, use a different instance for each thread.
+
+    :param callback: an optional function that is called at the end of each \
+    profiled call, with the component, the elapsed time of the call and the \
+    number of errors generated by the component during the call as arguments.
+    """
+    def __init__(self, callback: Optional[ProfilerCallbackType] = None) -> None:
+        self.callback = callback
+        self.stats: Dict[int, ComponentStats] = {}  # keyed by component id
+        self._starting: Optional[XsdComponent] = None
+        self._nested_times: List[float] = []
+        self._last_error: Optional[Exception] = None
+
+    def __repr__(self) -> str:
+        return '%s(callback=%r)' % (self.__class__.__name__, self.callback)
+
+    def clear(self) -> None:
+        """Removes the collected statistics."""
+        self.stats.clear()
+        self._last_error = None
+
+    def enter(self, component: XsdComponent) -> bool:
+        """
+        Called at the start of decoding methods of XSD components. Returns `True`
+        if the call has to be profiled, `False` if it's the profiled call itself.
+        """
+        if self._starting is component:
+            self._starting = None
+            return False
+        return True
+
+    def iter_profile(self, component: XsdComponent, obj: Any,
+                     validation: str, kwargs: Dict[str, Any]) -> Iterator[Any]:
+        """Profiles the decoding of an object with an XSD component."""
+        try:
+            stats = self.stats[id(component)]
+        except KeyError:
+            stats = self.stats[id(component)] = ComponentStats(component)
+
+        stats.calls += 1
+        nested_times = self._nested_times
+        iterator = getattr(component, 'iter_decode')(obj, validation, **kwargs)
+        self._starting = component
+        elapsed = 0.0
+        errors = 0
+
+        try:
+            while True:
+                nested_times.append(0.0)
+                start = perf_counter()
+                try:
+                    result = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    delta = perf_counter() - start
+                    elapsed += delta
+                    stats.own_time += delta - nested_times.pop()
+                    if nested_times:
+                        nested_times[-1] += delta
+                    if self._starting is component:
+                        self._starting = None
+
+                if isinstance(result, XMLSchemaValidationError) and \
+                        result is not self._last_error:
+                    self._last_error = result
+                    errors += 1
+                yield result
+
+        except XMLSchemaValidationError as err:
+            if err is not self._last_error:
+                self._last_error = err
+                errors += 1
+            raise
+        finally:
+            stats.time += elapsed
+            stats.errors += errors
+            if self.callback is not None:
+                self.callback(component, elapsed, errors)
+
+    def get_stats(self, sort_key: str = 'own_time',
+                  limit: Optional[int] = None) -> List[ComponentStats]:
+        """
+        Returns the collected statistics, sorted in descending order.
+
+        :param sort_key: the attribute to sort, can be 'calls', 'errors', \
+        'time' or 'own_time'.
+        :param limit: an optional maximum number of items to return.
+        """
+        if sort_key not in SORT_KEYS:
+            msg = "invalid sort key {!r}, must be one of {!r}"
+            raise XMLSchemaValueError(msg.format(sort_key, SORT_KEYS))
+
+        items = sorted(self.stats.values(), key=lambda x: getattr(x, sort_key), reverse=True)
+        return items if limit is None else items[:limit]
+
+    def report(self, sort_key: str = 'own_time', limit: Optional[int] = 20) -> str:
+        """Returns a text report with the statistics of the most expensive components."""
+        lines = ['{:>10} {:>8} {:>10} {:>10}  {}'.format(
+            'calls', 'errors', 'time', 'own_time', 'component'
+        )]
+        for item in self.get_stats(sort_key, limit):
+            lines.append('{:>10} {:>8} {:>10.4f} {:>10.4f}  {} ({}, {})'.format(
+                item.calls, item.errors, item.time, item.own_time,
+                item.name, item.component.__class__.__name__, item.url
+            ))
+        return '\n'.join(lines)
@@ -23,8 +23,9 @@ import re
 import sys
 from copy import copy as _copy, deepcopy
 from operator import attrgetter
-from typing import cast, Callable, ItemsView, List, Optional, Dict, Any, \
-    Set, Union, Tuple, Type, Iterator, Counter
+from pathlib import Path
+from typing import cast, Callable, ItemsView, Iterable, List, Optional, Dict, Any, \
+    Sequence, Set, Union, Tuple, Type, Iterator, Counter
 from xml.etree.ElementTree import Element, ParseError
 
 from elementpath import XPathToken, SchemaElementNode, build_schema_node_tree
@@ -42,14 +43,14 @@ from ..names import VC_MIN_VERSION, VC_MAX_VERSION, VC_TYPE_AVAILABLE, \
 from ..aliases import ElementType, XMLSourceType, NamespacesType, LocationsType, \
     SchemaType, SchemaSourceType, ConverterType, ComponentClassType, DecodeType, \
     EncodeType, BaseXsdType, ExtraValidatorType, ValidationHookType, UriMapperType, \
-    SchemaGlobalType, FillerType, DepthFillerType, ValueHookType, ElementHookType
+    SchemaGlobalType, SchemaElementType, FillerType, DepthFillerType, ValueHookType, ElementHookType
 from ..translation import gettext as _
 from ..helpers import set_logging_level, logged, prune_etree, get_namespace, \
     get_qname, is_defuse_error
 from ..namespaces import NamespaceResourcesMap, NamespaceMapper, NamespaceView
 from ..locations import is_local_url, is_remote_url, url_path_is_file, \
     normalize_url, normalize_locations
-from ..resources import XMLResource
+from ..resources import XMLResource, XML_PARSERS
 from ..converters import XMLSchemaConverter
 from ..xpath import XMLSchemaProxy, ElementPathMixin
 from ..exports import export_schema
@@ -63,16 +64,21 @@ from .xsdbase import check_validation_mode, XsdValidator, XsdComponent, XsdAnnot
 from .notations import XsdNotation
 from .identities import XsdIdentity, XsdKey, XsdKeyref, XsdUnique, \
     Xsd11Key, Xsd11Unique, Xsd11Keyref, IdentityCounter, KeyrefCounter, IdentityMapType
-from .facets import XSD_10_FACETS, XSD_11_FACETS
+from .facets import XSD_10_FACETS, XSD_11_FACETS, XsdPatternFacets, XsdEnumerationFacets
 from .simple_types import XsdSimpleType, XsdList, XsdUnion, XsdAtomicRestriction, \
     Xsd11AtomicRestriction, Xsd11Union
 from .attributes import XsdAttribute, XsdAttributeGroup, Xsd11Attribute
 from .complex_types import XsdComplexType, Xsd11ComplexType
+from .assertions import XsdAssert
 from .groups import XsdGroup, Xsd11Group
 from .elements import XsdElement, Xsd11Element
 from .wildcards import XsdAnyElement, XsdAnyAttribute, Xsd11AnyElement, \
     Xsd11AnyAttribute, XsdDefaultOpenContent
 from .global_maps import XsdGlobals
+from .caching import SchemaCache, TrustedSources, ValidationCache
+from .profiling import ValidationProfiler
+from .parallel import ValidationSummary, FragmentsValidator, \
+    get_validation_summary, iter_validation_summaries
 
 logger = logging.getLogger('xmlschema')
 
@@ -194,6 +200,17 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
     and building. For default is WARNING (30). For INFO level set it with 20, for \
     DEBUG level with 10. The default loglevel is restored after schema building, \
     when exiting the initialization method.
+    :param cache: an optional :class:`SchemaCache` instance or a directory path, for \
+    loading the built schema from a persistent cache, or for storing it into the cache \
+    after the build. Ignored if the argument *global_maps* is provided or if *build* \
+    is `False`.
+    :param trusted_sources: an optional :class:`TrustedSources` registry. Schema \
+    documents registered as already validated are not validated again with the \
+    meta-schema, and documents that pass the validation are added to the registry. \
+    The registry is shared with included and imported schemas.
+    :param xml_parser: the parser used for the XML documents that are validated or \
+    decoded by the schema, can be 'etree' (default) or 'lxml'. Schema documents \
+    are always parsed with *ElementTree*, so the schema can be pickled.
 
     :cvar XSD_VERSION: store the XSD version (1.0 or 1.1).
     :cvar BASE_SCHEMAS: a dictionary from namespace to schema resource for meta-schema bases.
@@ -269,6 +286,9 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
     _annotations: Optional[List[XsdAnnotation]] = None
     _components = None
     _root_elements: Optional[Set[str]] = None
+    _element_chains: Optional[Dict[Tuple[Tuple[str, ...], Optional[str]],
+                                   List[SchemaElementType]]] = None
+    _selected_elements: Optional[Dict[Tuple[Any, ...], Optional[XsdElement]]] = None
     _xpath_node: Optional[SchemaElementNode]
 
     # XSD components classes
@@ -300,6 +320,8 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
     default_open_content = None
     override: Optional['XMLSchemaBase'] = None
     use_xpath3: bool = False
+    trusted_sources: Optional[TrustedSources] = None
+    xml_parser: str = 'etree'
 
     # Store XPath constructors tokens (for schema and its assertions)
     xpath_tokens: Optional[Dict[str, Type[XPathToken]]] = None
@@ -319,7 +341,10 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
                  use_meta: bool = True,
                  use_fallback: bool = True,
                  use_xpath3: bool = False,
-                 loglevel: Optional[Union[str, int]] = None) -> None:
+                 loglevel: Optional[Union[str, int]] = None,
+                 cache: Union[None, str, Path, SchemaCache] = None,
+                 trusted_sources: Optional[TrustedSources] = None,
+                 xml_parser: str = 'etree') -> None:
 
         super(XMLSchemaBase, self).__init__(validation)
         self.lock = threading.Lock()  # Lock for build operations
@@ -415,6 +440,14 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
         else:
             self.converter = self.get_converter(converter)
 
+        if not isinstance(xml_parser, str):
+            msg = _("'xml_parser' argument must be a string")
+            raise XMLSchemaTypeError(msg)
+        elif xml_parser not in XML_PARSERS:
+            msg = _("'xml_parser' argument: {!r} is not an XML parser")
+            raise XMLSchemaValueError(msg.format(xml_parser))
+        self.xml_parser = xml_parser
+
         if self.meta_schema is None:
             self.locations = NamespaceResourcesMap()
 
@@ -447,6 +480,39 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
             if not self.meta_schema.maps.types:
                 self.meta_schema.maps.build()
 
+        cache_key = None
+        if cache is None or global_maps is not None or not build:
+            cache = None
+        else:
+            if not isinstance(cache, SchemaCache):
+                cache = SchemaCache(cache)
+
+            cache_key = cache.get_key(
+                self.__class__,
+                [self.source] + [
+                    x if isinstance(x, XMLResource) else
+                    XMLResource(x, base_url, allow, defuse, timeout) for x in other_sources
+                ],
+                namespace=namespace,
+                base_url=base_url,
+                validation=validation,
+                locations=locations,
+                allow=allow,
+                defuse=defuse,
+                timeout=timeout,
+                uri_mapper=uri_mapper,
+                use_meta=use_meta,
+                use_fallback=use_fallback,
+                use_xpath3=use_xpath3,
+            )
+            if cache.load(self, cache_key):
+                if converter is not None:
+                    self.converter = self.get_converter(converter)
+                self.xml_parser = xml_parser
+                if loglevel is not None:
+                    logger.setLevel(logging.WARNING)  # Restore default logging
+                return
+
         # Create or set the XSD global maps instance
         if isinstance(global_maps, XsdGlobals):
             self.maps = global_maps
@@ -462,6 +528,12 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
         if use_xpath3 and self.XSD_VERSION > '1.0':
             self.use_xpath3 = True
 
+        if trusted_sources is not None:
+            if not isinstance(trusted_sources, TrustedSources):
+                msg = _("'trusted_sources' argument must be a {!r} instance")
+                raise XMLSchemaTypeError(msg.format(TrustedSources))
+            self.trusted_sources = trusted_sources
+
         if any(ns == VC_NAMESPACE for ns in self.namespaces.values()):
             # For XSD 1.1+ apply versioning filter to schema tree. See the paragraph
             # 4.2.2 of XSD 1.1 (Part 1: Structures) definition for details.
@@ -473,8 +545,23 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
 
         # Validate the schema document (transforming validation errors to parse errors)
         if validation != 'skip':
-            for e in self.meta_schema.iter_errors(root, namespaces=self.namespaces):
-                self.parse_error(e.reason or e, elem=e.elem)
+            if trusted_sources is None:
+                for e in self.meta_schema.iter_errors(root, namespaces=self.namespaces):
+                    self.parse_error(e.reason or e, elem=e.elem)
+            else:
+                source_digest = trusted_sources.get_digest(
+                    self.source, self.meta_schema, self.namespaces
+                )
+                if source_digest in trusted_sources:
+                    logger.debug("Skip meta-schema validation of trusted source %r",
+                                 self.url or self.source)
+                else:
+                    errors_count = len(self.errors)
+                    for e in self.meta_schema.iter_errors(root, namespaces=self.namespaces):
+                        self.parse_error(e.reason or e, elem=e.elem)
+
+                    if len(self.errors) == errors_count:
+                        trusted_sources.add(source_digest)
 
         self._parse_inclusions()
         self._parse_imports()
@@ -515,6 +602,8 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
         try:
             if build:
                 self.maps.build()
+                if cache is not None and cache_key is not None and self.maps.built:
+                    cache.store(self, cache_key)
         finally:
             if loglevel is not None:
                 logger.setLevel(logging.WARNING)  # Restore default logging
@@ -523,6 +612,7 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
         state = self.__dict__.copy()
         state.pop('lock', None)
         state.pop('xpath_tokens', None)
+        state.pop('trusted_sources', None)
         return state
 
     def __setstate__(self, state: Dict[str, Any]) -> None:
@@ -1050,6 +1140,37 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
         self._annotations = None
         self._components = None
         self._root_elements = None
+        self._element_chains = None
+        self._selected_elements = None
+
+    def warm_up(self) -> None:
+        """
+        Eagerly builds the lazy structures that are otherwise created at first
+        use: schema XPath nodes and root elements, bound XPath parsers of XSD 1.1
+        assertions, model groups match indexes, compiled pattern facets and
+        enumeration indexes. Useful before forking worker processes or before
+        sharing the schema between threads, so the structures are built once
+        and no lock is acquired on the validation paths.
+        """
+        self.check_validator(self.validation)
+
+        for schema in self.maps.iter_schemas():
+            _ = schema.xpath_node
+            _ = schema.root_elements
+
+        for component in self.maps.iter_components():
+            if isinstance(component, XsdAssert):
+                if component.parser is not None and not component.parser.is_schema_bound():
+                    component._bind_parser()
+            elif isinstance(component, XsdGroup):
+                component._build_match_index()
+            elif isinstance(component, XsdPatternFacets):
+                component._build_regex()
+            elif isinstance(component, XsdEnumerationFacets):
+                component._build_index()
+
+        for namespace in self.maps.namespaces:
+            self.maps.load_namespace(namespace)
 
     @property
     def built(self) -> bool:
@@ -1180,19 +1301,78 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
 
     def get_element(self, tag: str, path: Optional[str] = None,
                     namespaces: Optional[NamespacesType] = None) -> Optional[XsdElement]:
+        if not path:
+            key: Tuple[Any, ...] = (tag,)
+        elif namespaces is None:
+            key = tag, path
+        else:
+            key = (tag, path, *namespaces.items())
+
+        if self._selected_elements is None:
+            self._selected_elements = {}
+        else:
+            try:
+                return self._selected_elements[key]
+            except KeyError:
+                pass
+
+        xsd_element: Any
         if not path:
             xsd_element = self.find(tag)
-            return xsd_element if isinstance(xsd_element, XsdElement) else None
         elif path[-1] == '*':
             xsd_element = self.find(path[:-1] + tag, namespaces)
-            if isinstance(xsd_element, XsdElement):
-                return xsd_element
-
-            obj = self.maps.elements.get(tag)
-            return obj if isinstance(obj, XsdElement) else None
+            if not isinstance(xsd_element, XsdElement):
+                xsd_element = self.maps.elements.get(tag)
         else:
             xsd_element = self.find(path, namespaces)
-            return xsd_element if isinstance(xsd_element, XsdElement) else None
+
+        selected = xsd_element if isinstance(xsd_element, XsdElement) else None
+        self._selected_elements[key] = selected
+        return selected
+
+    def get_element_chain(self, tags: Sequence[str],
+                          namespaces: Optional[NamespacesType] = None) \
+            -> List[SchemaElementType]:
+        """
+        Returns the XSD elements that match a path of XML element tags, starting from
+        a global element of the schema. Returns an empty list if the path doesn't match.
+        The chains are indexed by tag path at the first request. The paths that match
+        more than one particle at some level are resolved with an XPath selection. A tag
+        of a substitution group member is resolved to the member, not to the head.
+
+        :param tags: a sequence of element tags, usually the tags of the ancestors \
+        of an XML element.
+        :param namespaces: an optional mapping from namespace prefix to URI, used \
+        only for the default namespace of unqualified tags.
+        """
+        default_namespace = (self.namespaces if namespaces is None else namespaces).get('')
+        key = tuple(tags), default_namespace
+
+        if self._element_chains is None:
+            self._element_chains = {}
+        else:
+            try:
+                return self._element_chains[key]
+            except KeyError:
+                pass
+
+        chain: List[SchemaElementType] = []
+        children: Iterable[SchemaElementType] = self.elements.values()
+        for tag in key[0]:
+            matching = [e for e in children if e.is_matching(tag, default_namespace)]
+            if len(matching) != 1 or not isinstance(matching[0], XsdElement):
+                # Missing or ambiguous matches: fall back to XPath selection.
+                path = f"{'/'.join(key[0])}/ancestor-or-self::node()"
+                chain = cast(List[SchemaElementType], self.findall(path, namespaces)[1:])
+                break
+
+            # A head element can be matched by a member of its substitution group
+            xsd_element = matching[0].match(tag, default_namespace) or matching[0]
+            chain.append(xsd_element)
+            children = xsd_element
+
+        self._element_chains[key] = chain
+        return chain
 
     def create_bindings(self, *bases: type, **attrs: Any) -> None:
         """
@@ -1296,6 +1476,8 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
                 uri_mapper=self.uri_mapper,
                 build=build,
                 use_xpath3=self.use_xpath3,
+                trusted_sources=self.trusted_sources,
+                xml_parser=self.xml_parser,
             )
 
         if schema is self:
@@ -1454,6 +1636,8 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
             uri_mapper=self.uri_mapper,
             build=build,
             use_xpath3=self.use_xpath3,
+            trusted_sources=self.trusted_sources,
+            xml_parser=self.xml_parser,
         )
         if schema.target_namespace != namespace:
             msg = _('imported schema {0!r} has an unmatched namespace {1!r}')
@@ -1496,6 +1680,8 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
             uri_mapper=self.uri_mapper,
             build=build,
             use_xpath3=self.use_xpath3,
+            trusted_sources=self.trusted_sources,
+            xml_parser=self.xml_parser,
         )
 
     def export(self, target: str,
@@ -1673,7 +1859,11 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
                  extra_validator: Optional[ExtraValidatorType] = None,
                  validation_hook: Optional[ValidationHookType] = None,
                  allow_empty: bool = True,
-                 use_location_hints: bool = False) -> None:
+                 use_location_hints: bool = False,
+                 workers: Optional[int] = None,
+                 validation_cache: Optional[ValidationCache] = None,
+                 profiler: Optional[ValidationProfiler] = None,
+                 fail_fast: bool = False) -> None:
         """
         Validates an XML data against the XSD schema/component instance.
 
@@ -1708,11 +1898,29 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
         :param use_location_hints: for default schema locations hints provided within \
         XML data are ignored in order to avoid the change of schema instance. Set this \
         option to `True` to activate dynamic schema loading using schema location hints.
+        :param workers: an optional number of worker processes for validating a lazy \
+        resource. If it's greater than one, the subtrees at *lazy_depth* level are \
+        validated in parallel by a pool of processes. In this case the optional \
+        callables provided with *extra_validator* and *validation_hook* must be \
+        picklable. Ignored for resources that are not lazy or if a *path* is provided.
+        :param validation_cache: an optional :class:`ValidationCache` instance for \
+        skipping the validation of subtrees that are equal to subtrees already \
+        validated successfully. Not used for parallel validation of fragments or \
+        if *max_depth*, *extra_validator*, *validation_hook* or *use_location_hints* \
+        are provided.
+        :param profiler: an optional :class:`ValidationProfiler` instance for collecting \
+        the number of calls, the times and the errors of the XSD components used for \
+        validation. Not used for parallel validation of fragments.
+        :param fail_fast: if `True` the validation stops at the first error found, \
+        reporting the errors of the content model of an element before validating \
+        its children. In this case the raised error can be different from the first \
+        error yielded by :meth:`iter_errors`, for default the ordering is the same.
         :raises: :exc:`XMLSchemaValidationError` if the XML data instance is invalid.
         """
         for error in self.iter_errors(source, path, schema_path, use_defaults,
                                       namespaces, max_depth, extra_validator,
-                                      validation_hook, allow_empty, use_location_hints):
+                                      validation_hook, allow_empty, use_location_hints,
+                                      workers, validation_cache, profiler, fail_fast):
             raise error
 
     def is_valid(self, source: Union[XMLSourceType, XMLResource],
@@ -1724,14 +1932,21 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
                  extra_validator: Optional[ExtraValidatorType] = None,
                  validation_hook: Optional[ValidationHookType] = None,
                  allow_empty: bool = True,
-                 use_location_hints: bool = False) -> bool:
+                 use_location_hints: bool = False,
+                 workers: Optional[int] = None,
+                 validation_cache: Optional[ValidationCache] = None,
+                 profiler: Optional[ValidationProfiler] = None,
+                 fail_fast: bool = False) -> bool:
         """
         Like :meth:`validate` except that does not raise an exception but returns
         ``True`` if the XML data instance is valid, ``False`` if it is invalid.
+        The result doesn't depend on *fail_fast*, that only lets the validation
+        stop earlier on invalid XML data.
         """
         error = next(self.iter_errors(source, path, schema_path, use_defaults,
                                       namespaces, max_depth, extra_validator,
-                                      validation_hook, allow_empty, use_location_hints), None)
+                                      validation_hook, allow_empty, use_location_hints,
+                                      workers, validation_cache, profiler, fail_fast), None)
         return error is None
 
     def iter_errors(self, source: Union[XMLSourceType, XMLResource],
@@ -1743,7 +1958,11 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
                     extra_validator: Optional[ExtraValidatorType] = None,
                     validation_hook: Optional[ValidationHookType] = None,
                     allow_empty: bool = True,
-                    use_location_hints: bool = False) \
+                    use_location_hints: bool = False,
+                    workers: Optional[int] = None,
+                    validation_cache: Optional[ValidationCache] = None,
+                    profiler: Optional[ValidationProfiler] = None,
+                    fail_fast: bool = False) \
             -> Iterator[XMLSchemaValidationError]:
         """
         Creates an iterator for the errors generated by the validation of an XML data against
@@ -1753,7 +1972,8 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
         if isinstance(source, XMLResource):
             resource: XMLResource = source
         else:
-            resource = XMLResource(source, defuse=self.defuse, timeout=self.timeout)
+            resource = XMLResource(source, defuse=self.defuse, timeout=self.timeout,
+                                   xml_parser=self.xml_parser)
 
         if not schema_path:
             schema_path = resource.get_absolute_path(path)
@@ -1791,6 +2011,37 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
             kwargs['extra_validator'] = extra_validator
         if validation_hook is not None:
             kwargs['validation_hook'] = validation_hook
+        if validation_cache is not None:
+            if not isinstance(validation_cache, ValidationCache):
+                msg = _("'validation_cache' argument must be a ValidationCache instance")
+                raise XMLSchemaTypeError(msg)
+            kwargs['validation_cache'] = validation_cache
+        if profiler is not None:
+            kwargs['profiler'] = profiler
+        if fail_fast:
+            kwargs['fail_fast'] = True
+
+        fragments: Optional[FragmentsValidator] = None
+        if workers is not None:
+            if not isinstance(workers, int) or isinstance(workers, bool):
+                raise XMLSchemaTypeError(_("'workers' argument must be an integer"))
+            elif workers < 1:
+                raise XMLSchemaValueError(_("'workers' argument must be a positive integer"))
+            elif workers > 1 and resource.is_lazy() and not path:
+                fragments = FragmentsValidator(
+                    schema=self,
+                    resource=resource,
+                    workers=workers,
+                    identities=identities,
+                    id_map=kwargs['id_map'],
+                    namespaces=namespaces,
+                    namespace=namespace,
+                    schema_path=schema_path,
+                    **{k: v for k, v in kwargs.items() if k in (
+                        'use_defaults', 'max_depth', 'extra_validator',
+                        'validation_hook', 'fail_fast'
+                    )}
+                )
 
         if path:
             selector = resource.iterfind(path, namespaces, ancestors=ancestors)
@@ -1798,58 +2049,83 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
             selector = resource.iter_depth(mode=4, ancestors=ancestors)
 
         elem: Optional[ElementType] = None
-        for elem in selector:
-            if elem is resource.root:
-                if resource.lazy_depth:
-                    kwargs['level'] = 0
-                    kwargs['identities'] = {}
-                    kwargs['max_depth'] = resource.lazy_depth
-            else:
-                if prev_ancestors != ancestors:
-                    k = 0
-                    for k in range(min(len(ancestors), len(prev_ancestors))):
-                        if ancestors[k] is not prev_ancestors[k]:
-                            break
-
-                    path_ = f"{'/'.join(e.tag for e in ancestors)}/ancestor-or-self::node()"
-                    xsd_ancestors = cast(List[XsdElement],
-                                         schema.findall(path_, converter.namespaces)[1:])
-
-                    # Clear identity constraints counters
-                    for k, e in enumerate(xsd_ancestors[k:], start=k):
-                        for identity in e.identities:
-                            if identity in identities:
-                                identities[identity].reset(ancestors[k])
-                            else:
-                                identities[identity] = identity.get_counter(ancestors[k])
-
-                    prev_ancestors = ancestors[:]
-
-            xsd_element = schema.get_element(elem.tag, schema_path, namespaces)
-            if xsd_element is None:
-                if XSI_TYPE in elem.attrib:
-                    xsd_element = self.create_element(name=elem.tag)
-                elif elem is not resource.root and ancestors:
-                    continue
+        try:
+            for elem in selector:
+                if elem is resource.root:
+                    if fragments is not None:
+                        for error in fragments.finish():
+                            yield error
+                            if fail_fast:
+                                return
+                    if resource.lazy_depth:
+                        kwargs['level'] = 0
+                        kwargs['identities'] = {}
+                        kwargs['max_depth'] = resource.lazy_depth
                 else:
-                    reason = _("{!r} is not an element of the schema").format(elem)
-                    yield schema.validation_error('lax', reason, elem, resource, namespaces)
-                    return
+                    if prev_ancestors != ancestors:
+                        k = 0
+                        for k in range(min(len(ancestors), len(prev_ancestors))):
+                            if ancestors[k] is not prev_ancestors[k]:
+                                break
 
-            try:
-                for result in xsd_element.iter_decode(elem, **kwargs):
-                    if isinstance(result, XMLSchemaValidationError):
-                        yield result
+                        xsd_ancestors = cast(List[XsdElement], schema.get_element_chain(
+                            [e.tag for e in ancestors], converter.namespaces
+                        ))
+
+                        # Clear identity constraints counters
+                        if fragments is not None:
+                            for error in fragments.reset_counters(xsd_ancestors[k:],
+                                                                  ancestors[k:]):
+                                yield error
+                                if fail_fast:
+                                    return
+                        else:
+                            for k, e in enumerate(xsd_ancestors[k:], start=k):
+                                for identity in e.identities:
+                                    if identity in identities:
+                                        identities[identity].reset(ancestors[k])
+                                    else:
+                                        identities[identity] = identity.get_counter(ancestors[k])
+
+                        prev_ancestors = ancestors[:]
+
+                xsd_element = schema.get_element(elem.tag, schema_path, namespaces)
+                if xsd_element is None:
+                    if XSI_TYPE in elem.attrib:
+                        xsd_element = self.create_element(name=elem.tag)
+                    elif elem is not resource.root and ancestors:
+                        continue
                     else:
-                        del result
-            except XMLSchemaStopValidation:
-                pass
-        else:
-            if elem is None and not allow_empty:
-                assert path is not None
-                reason = _("the provided path selects nothing to validate")
-                yield schema.validation_error('lax', reason, None, resource, namespaces)
-                return
+                        reason = _("{!r} is not an element of the schema").format(elem)
+                        yield schema.validation_error('lax', reason, elem, resource, namespaces)
+                        return
+
+                if fragments is not None and elem is not resource.root:
+                    for error in fragments.add(elem, ancestors):
+                        yield error
+                        if fail_fast:
+                            return
+                    continue
+
+                try:
+                    for result in xsd_element.iter_decode(elem, **kwargs):
+                        if isinstance(result, XMLSchemaValidationError):
+                            yield result
+                            if fail_fast:
+                                return
+                        else:
+                            del result
+                except XMLSchemaStopValidation:
+                    pass
+            else:
+                if elem is None and not allow_empty:
+                    assert path is not None
+                    reason = _("the provided path selects nothing to validate")
+                    yield schema.validation_error('lax', reason, None, resource, namespaces)
+                    return
+        finally:
+            if fragments is not None:
+                fragments.shutdown()
 
         if kwargs['identities'] is not identities:
             for identity, counter in kwargs['identities'].items():
@@ -1858,6 +2134,70 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
 
         yield from self._validate_references(validation='lax', **kwargs)
 
+    def validate_many(self, sources: Iterable[Union[XMLSourceType, XMLResource]],
+                      workers: Optional[int] = None,
+                      ordered: bool = True,
+                      chunksize: Optional[int] = None,
+                      lazy: bool = False,
+                      path: Optional[str] = None,
+                      schema_path: Optional[str] = None,
+                      use_defaults: bool = True,
+                      namespaces: Optional[NamespacesType] = None,
+                      max_depth: Optional[int] = None,
+                      allow_empty: bool = True,
+                      use_location_hints: bool = False) -> Iterator[ValidationSummary]:
+        """
+        Validates many XML sources, using a pool of processes for parallel validation.
+        The built schema is pickled and sent once to each worker process. Yields a
+        :class:`ValidationSummary` for each XML source, with the messages of the
+        validation errors.
+
+        :param sources: an iterable of XML sources. With more than one worker the \
+        sources must be picklable, so paths, URLs or XML data strings are preferable.
+        :param workers: the number of worker processes, for default is the number \
+        of CPUs. With one worker the sources are validated by the current process.
+        :param ordered: if `True` the summaries are yielded in the same order of \
+        the sources, otherwise they are yielded as soon as they are available.
+        :param chunksize: the number of sources sent to a worker process in a task, \
+        for default is computed from the number of sources and of workers.
+        :param lazy: the lazy mode for the XML resources created from the sources.
+        :param path: an optional XPath expression for selecting the elements to validate.
+        :param schema_path: an alternative XPath expression to select the XSD element \
+        to use for validation.
+        :param use_defaults: use schema's default values for filling missing data.
+        :param namespaces: is an optional mapping from namespace prefix to URI.
+        :param max_depth: maximum level of validation, for default there is no limit.
+        :param allow_empty: for default providing a path argument empty selections \
+        of XML data are allowed. Provide `False` to generate a validation error.
+        :param use_location_hints: set to `True` to activate dynamic schema loading \
+        using schema location hints provided within XML data.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        elif not isinstance(workers, int) or isinstance(workers, bool):
+            raise XMLSchemaTypeError(_("'workers' argument must be an integer"))
+        elif workers < 1:
+            raise XMLSchemaValueError(_("'workers' argument must be a positive integer"))
+
+        self.check_validator(validation='lax')
+        kwargs: Dict[str, Any] = {
+            'lazy': lazy,
+            'path': path,
+            'schema_path': schema_path,
+            'use_defaults': use_defaults,
+            'namespaces': namespaces,
+            'max_depth': max_depth,
+            'allow_empty': allow_empty,
+            'use_location_hints': use_location_hints,
+        }
+
+        if workers == 1:
+            for source in sources:
+                yield get_validation_summary(self, source, **kwargs)
+        else:
+            yield from iter_validation_summaries(self, sources, workers, ordered,
+                                                 chunksize, **kwargs)
+
     def _validate_references(self, source: XMLResource,
                              validation: str = 'lax',
                              id_map: Optional[Counter[str]] = None,
@@ -1926,6 +2266,7 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
                     value_hook: Optional[ValueHookType] = None,
                     element_hook: Optional[ElementHookType] = None,
                     errors: Optional[List[XMLSchemaValidationError]] = None,
+                    profiler: Optional[ValidationProfiler] = None,
                     **kwargs: Any) -> Iterator[Union[Any, XMLSchemaValidationError]]:
         """
         Creates an iterator for decoding an XML source to a data structure.
@@ -1998,6 +2339,9 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
         instance plus optionally the XSD element and the XSD type, and returns a \
         new `ElementData` instance.
         :param errors: optional internal collector for validation errors.
+        :param profiler: an optional :class:`ValidationProfiler` instance for collecting \
+        the number of calls, the times and the errors of the XSD components used for \
+        decoding.
         :param kwargs: keyword arguments with other options for converters.
         :return: yields a decoded data object, eventually preceded by a sequence of \
         validation or decoding errors.
@@ -2006,7 +2350,8 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
         if isinstance(source, XMLResource):
             resource: XMLResource = source
         else:
-            resource = XMLResource(source, defuse=self.defuse, timeout=self.timeout)
+            resource = XMLResource(source, defuse=self.defuse, timeout=self.timeout,
+                                   xml_parser=self.xml_parser)
 
         if not schema_path and path:
             schema_path = resource.get_absolute_path(path)
@@ -2067,9 +2412,11 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
             kwargs['element_hook'] = element_hook
         if errors is not None:
             kwargs['errors'] = errors
+        if profiler is not None:
+            kwargs['profiler'] = profiler
 
         if path:
-            selector = resource.iterfind(path, namespaces)
+            selector = resource.iter_stream(path, namespaces)
         elif not resource.is_lazy():
             selector = iter((resource.root,))
         else:
@@ -2082,8 +2429,14 @@ class XMLSchemaBase(XsdValidator, ElementPathMixin[Union[SchemaType, XsdElement]
             kwargs['max_depth'] = resource.lazy_depth
             selector = resource.iter_depth(mode=3)
 
+        xsd_elements: Dict[str, Optional[XsdElement]] = {}
         for elem in selector:
-            xsd_element = schema.get_element(elem.tag, schema_path, namespaces)
+            try:
+                xsd_element = xsd_elements[elem.tag]
+            except KeyError:
+                xsd_element = schema.get_element(elem.tag, schema_path, namespaces)
+                xsd_elements[elem.tag] = xsd_element
+
             if xsd_element is None:
                 if XSI_TYPE in elem.attrib:
                     xsd_element = self.create_element(name=elem.tag)
@@ -436,6 +436,10 @@ class XsdSimpleType(XsdType, ValidationMixin[Union[str, bytes], DecodedValueType
 
     def iter_decode(self, obj: Union[str, bytes], validation: str = 'lax',
                     **kwargs: Any) -> IterDecodeType[DecodedValueType]:
+        if 'profiler' in kwargs and kwargs['profiler'].enter(self):
+            yield from kwargs['profiler'].iter_profile(self, obj, validation, kwargs)
+            return
+
         text = self.normalize(obj)
         if self.patterns is not None:
             try:
@@ -565,6 +569,8 @@ class XsdAtomicBuiltin(XsdAtomic):
       - to_python(value): Decoding from XML
       - from_python(value): Encoding to XML
     """
+    _iter_decode_value: Optional[Callable[..., IterDecodeType[DecodedValueType]]] = None
+
     def __init__(self, elem: ElementType,
                  schema: SchemaType,
                  name: str,
@@ -601,6 +607,15 @@ class XsdAtomicBuiltin(XsdAtomic):
         self.to_python = to_python if to_python is not None else python_type
         self.from_python = from_python if from_python is not None else str
 
+        # Bind the additional decoding step of QName, IDREF and ID types at
+        # build time, for avoiding a type name dispatch on every decoded value.
+        if name == XSD_QNAME:
+            self._iter_decode_value = self.__class__._iter_decode_qname
+        elif name == XSD_IDREF:
+            self._iter_decode_value = self.__class__._iter_decode_idref
+        elif name == XSD_ID:
+            self._iter_decode_value = self.__class__._iter_decode_id
+
     def __repr__(self) -> str:
         return '%s(name=%r)' % (self.__class__.__name__, self.prefixed_name)
 
@@ -610,6 +625,10 @@ class XsdAtomicBuiltin(XsdAtomic):
 
     def iter_decode(self, obj: Union[str, bytes], validation: str = 'lax', **kwargs: Any) \
             -> IterDecodeType[DecodedValueType]:
+        if 'profiler' in kwargs and kwargs['profiler'].enter(self):
+            yield from kwargs['profiler'].iter_profile(self, obj, validation, kwargs)
+            return
+
         if isinstance(obj, (str, bytes)):
             obj = self.normalize(obj)
         elif obj is not None and not isinstance(obj, self.instance_types):
@@ -648,43 +667,54 @@ class XsdAtomicBuiltin(XsdAtomic):
             except XMLSchemaValidationError as err:
                 yield err
 
-        if self.name not in {XSD_QNAME, XSD_IDREF, XSD_ID}:
-            pass
-        elif self.name == XSD_QNAME:
-            if ':' in obj:
-                try:
-                    prefix, name = obj.split(':')
-                except ValueError:
-                    pass
-                else:
-                    try:
-                        result = f"{{{kwargs['namespaces'][prefix]}}}{name}"
-                    except (TypeError, KeyError):
-                        try:
-                            if kwargs['source'].namespace != XSD_NAMESPACE:
-                                reason = _("unmapped prefix %r in a QName") % prefix
-                                yield self.validation_error(validation, error=reason, obj=obj)
-                        except KeyError:
-                            pass
+        if self._iter_decode_value is None:
+            yield result
+        else:
+            yield from self._iter_decode_value(self, result, validation, kwargs)
+
+    def _iter_decode_qname(self, obj: str, validation: str, kwargs: Dict[str, Any]) \
+            -> IterDecodeType[DecodedValueType]:
+        if ':' in obj:
+            try:
+                prefix, name = obj.split(':')
+            except ValueError:
+                pass
             else:
                 try:
-                    default_namespace = kwargs['namespaces']['']
+                    obj = f"{{{kwargs['namespaces'][prefix]}}}{name}"
                 except (TypeError, KeyError):
-                    pass
-                else:
-                    if default_namespace:
-                        result = f'{{{default_namespace}}}{obj}'
-
-        elif self.name == XSD_IDREF:
+                    try:
+                        if kwargs['source'].namespace != XSD_NAMESPACE:
+                            reason = _("unmapped prefix %r in a QName") % prefix
+                            yield self.validation_error(validation, error=reason, obj=obj)
+                    except KeyError:
+                        pass
+        else:
             try:
-                id_map = kwargs['id_map']
-            except KeyError:
+                default_namespace = kwargs['namespaces']['']
+            except (TypeError, KeyError):
                 pass
             else:
-                if obj not in id_map:
-                    id_map[obj] = 0
+                if default_namespace:
+                    obj = f'{{{default_namespace}}}{obj}'
+
+        yield obj
+
+    def _iter_decode_idref(self, obj: str, validation: str, kwargs: Dict[str, Any]) \
+            -> IterDecodeType[DecodedValueType]:
+        try:
+            id_map = kwargs['id_map']
+        except KeyError:
+            pass
+        else:
+            if obj not in id_map:
+                id_map[obj] = 0
+
+        yield obj
 
-        elif kwargs.get('level') != 0:
+    def _iter_decode_id(self, obj: str, validation: str, kwargs: Dict[str, Any]) \
+            -> IterDecodeType[DecodedValueType]:
+        if kwargs.get('level') != 0:
             try:
                 id_map = kwargs['id_map']
             except KeyError:
@@ -711,7 +741,7 @@ class XsdAtomicBuiltin(XsdAtomic):
                         reason = _("duplicated xs:ID value {!r}").format(obj)
                         yield self.validation_error(validation, error=reason, obj=obj)
 
-        yield result
+        yield obj
 
     def iter_encode(self, obj: Any, validation: str = 'lax', **kwargs: Any) \
             -> IterEncodeType[EncodedValueType]:
@@ -927,6 +957,10 @@ class XsdList(XsdSimpleType):
                     validation: str = 'lax', **kwargs: Any) \
             -> IterDecodeType[Union[XMLSchemaValidationError,
                               List[Optional[AtomicValueType]]]]:
+        if 'profiler' in kwargs and kwargs['profiler'].enter(self):
+            yield from kwargs['profiler'].iter_profile(self, obj, validation, kwargs)
+            return
+
         items = []
         for chunk in self.normalize(obj).split():
             for result in self.base_type.iter_decode(chunk, validation, **kwargs):
@@ -1089,6 +1123,11 @@ class XsdUnion(XsdSimpleType):
     def iter_decode(self, obj: AtomicValueType, validation: str = 'lax',
                     patterns: Optional[XsdPatternFacets] = None,
                     **kwargs: Any) -> IterDecodeType[DecodedValueType]:
+        if 'profiler' in kwargs and kwargs['profiler'].enter(self):
+            yield from kwargs['profiler'].iter_profile(
+                self, obj, validation, dict(kwargs, patterns=patterns)
+            )
+            return
 
         # Try decoding the whole text (or validate the decoded atomic value)
         for member_type in self.member_types:
@@ -1371,6 +1410,10 @@ class XsdAtomicRestriction(XsdAtomic):
 
     def iter_decode(self, obj: AtomicValueType, validation: str = 'lax', **kwargs: Any) \
             -> IterDecodeType[DecodedValueType]:
+        if 'profiler' in kwargs and kwargs['profiler'].enter(self):
+            yield from kwargs['profiler'].iter_profile(self, obj, validation, kwargs)
+            return
+
         if isinstance(obj, (str, bytes)):
             obj = self.normalize(obj)
 